@@ -2,9 +2,23 @@
 SNS Automation - SNSアカウント構築・運用マニュアル自動化システム
 """
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 __author__ = "SNS Automation Team"
 
-from sns_automation.utils.config import load_config
+if TYPE_CHECKING:
+    from sns_automation.utils.config import load_config
+
+
+def __getattr__(name: str) -> Any:
+    """load_config は初回アクセス時にインポートする（CLI起動を軽くするため）"""
+    if name == "load_config":
+        from sns_automation.utils.config import load_config
+
+        globals()[name] = load_config
+        return load_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["load_config", "__version__"]
@@ -9,22 +9,98 @@ Chapter 1: 戦略設計の自動化
 - プロフィール文の作成
 """
 
-import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 
 import click
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
 
-from sns_automation.utils import ClaudeAPI, SheetsAPI, load_config, load_prompt, StateManager
+from sns_automation.utils import (
+    ClaudeAPI,
+    SheetsAPI,
+    GenCache,
+    load_config,
+    load_prompt,
+    StateManager,
+)
+from sns_automation.utils.claude_api import iter_stream_lines
 from sns_automation.utils.config import get_spreadsheet_id, get_sheet_name
+from sns_automation.utils.json_io import write_json
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# 生成するコンセプトの数
+NUM_CONCEPTS = 20
+
+# コンセプト行: "案1：...", "案1:...", "1. ...", "1) ..."
+_CONCEPT_RE = re.compile(r"(?:案\d{1,2}[：:]|\d{1,2}[.)])\s*(.*)")
+
+# Pain行: "1. ...", "1) ..."
+_PAIN_RE = re.compile(r"\d{1,2}[.)]\s+(.+)")
+
+# Step 4〜6 で共有するペルソナの前置き。全ステップで同じ位置・同じ文面にすることで
+# Anthropic のプロンプトキャッシュが共通プレフィックスとして再利用する
+PERSONA_CONTEXT_TEMPLATE = (
+    "以下は本プロジェクトで設計中のSNSアカウントのコンセプトとターゲットペルソナです。\n"
+    "以降の指示はすべてこのペルソナを前提に回答してください。\n\n"
+    "【コンセプト】\n{concept}\n\n"
+    "【ペルソナ】\n{persona}"
+)
+
+# 共有前置きに移したペルソナの代わりに、ユーザープロンプトへ埋め込む参照文
+PERSONA_REFERENCE = "（冒頭の【ペルソナ】を参照）"
+
+# chapter1_result.json / 状態として保存するキー
+RESULT_JSON_KEYS = (
+    "user_input",
+    "concepts",
+    "selected_concept",
+    "persona",
+    "pains",
+    "usp_future",
+    "profiles",
+)
+
+
+class PainIndexList(click.ParamType):
+    """「1,5,12」形式の番号リストを検証・変換するclick用の型"""
+
+    name = "pain_index_list"
+
+    _FORMAT_RE = re.compile(r"\s*\d+\s*(?:,\s*\d+\s*)*")
+
+    def __init__(self, max_n: int, count: int = 3):
+        """
+        初期化
+
+        Args:
+            max_n: 選択可能な最大番号
+            count: 選択すべき個数
+        """
+        self.max_n = max_n
+        self.count = count
+
+    def convert(self, value: Any, param: Any, ctx: Any) -> List[int]:
+        """入力文字列を番号リストに変換（不正な場合は再入力を促す）"""
+        if isinstance(value, list):
+            return value
+
+        if not self._FORMAT_RE.fullmatch(value):
+            self.fail("正しい形式で入力してください（例: 1,5,12）", param, ctx)
+
+        indices = [int(i) for i in value.split(",")]
+        if len(indices) != self.count:
+            self.fail(f"ちょうど{self.count}つ選択してください。", param, ctx)
+        if any(i < 1 or i > self.max_n for i in indices):
+            self.fail(f"1〜{self.max_n}の範囲で選択してください。", param, ctx)
+
+        return indices
+
 
 class StrategyAutomation:
     """Chapter 1: 戦略設計の自動化クラス"""
@@ -41,8 +117,71 @@ class StrategyAutomation:
         self.claude = ClaudeAPI(config)
         self.sheets = SheetsAPI(config)
         self.state_manager = StateManager(project_name)
+        self.gen_cache = GenCache()
         self.project_name = project_name
 
+    def _generate_cached(
+        self,
+        template_id: str,
+        prompt_data: Dict[str, Any],
+        temperature: float,
+        max_tokens: int,
+        refresh: bool = False,
+        on_line: Optional[Callable[[str], None]] = None,
+        shared_context: Optional[str] = None,
+    ) -> str:
+        """
+        生成キャッシュを経由してテキストを生成
+
+        同じプロンプトの初回生成はキャッシュから返し、
+        再生成（refresh=True）の場合はClaude APIを呼んでキャッシュを更新する。
+        on_line を指定した場合はストリーミングで生成し、1行届くごとに呼び出す。
+
+        Args:
+            template_id: テンプレートID
+            prompt_data: load_prompt() の返り値
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            refresh: キャッシュを使わずに再生成するか
+            on_line: 1行ごとに呼び出すコールバック
+            shared_context: ステップ間で共通の前置き（ペルソナなど）
+
+        Returns:
+            生成されたテキスト
+        """
+        system_prompt = prompt_data.get("system")
+        cache_system_key = "\n\n".join(text for text in (shared_context, system_prompt) if text)
+
+        if not refresh:
+            cached = self.gen_cache.get(template_id, prompt_data["user"], cache_system_key)
+            if cached is not None:
+                console.print("[dim]前回の生成結果をキャッシュから読み込みました[/dim]")
+                if on_line is not None:
+                    for line in cached.split("\n"):
+                        on_line(line)
+                return cached
+
+        kwargs = {
+            "prompt": prompt_data["user"],
+            "system_prompt": system_prompt,
+            "temperature": prompt_data.get("temperature", temperature),
+            "max_tokens": prompt_data.get("max_tokens", max_tokens),
+            "cache_system": True,
+            "shared_context": shared_context,
+        }
+
+        if on_line is None:
+            response = self.claude.generate_text(**kwargs)
+        else:
+            lines = []
+            for line in iter_stream_lines(self.claude.generate_text_stream(**kwargs)):
+                lines.append(line)
+                on_line(line)
+            response = "\n".join(lines)
+
+        self.gen_cache.set(template_id, prompt_data["user"], response, cache_system_key)
+        return response
+
     def collect_user_input(self) -> Dict[str, str]:
         """
         ユーザーから基本情報を収集する
@@ -77,25 +216,21 @@ class StrategyAutomation:
         }
 
         console.print("\n[bold green]入力内容:[/bold green]")
-        table = Table(show_header=False)
-        table.add_column("項目", style="bold")
-        table.add_column("内容")
-        if role.strip():
-            table.add_row("役割・肩書き", role)
-        else:
-            table.add_row("役割・肩書き", "[dim]（未設定）[/dim]")
-        table.add_row("サービス・商品", service)
-        table.add_row("ターゲット層", target)
-        console.print(table)
+        console.print(Panel(
+            f"[bold]役割・肩書き[/bold]    {user_input['role'] or '[dim]（未設定）[/dim]'}\n"
+            f"[bold]サービス・商品[/bold]  {service}\n"
+            f"[bold]ターゲット層[/bold]    {target}"
+        ))
 
         return user_input
 
-    def generate_concepts(self, user_input: Dict[str, str]) -> List[str]:
+    def generate_concepts(self, user_input: Dict[str, str], refresh: bool = False) -> List[str]:
         """
         勝ち筋コンセプト20案を生成
 
         Args:
             user_input: ユーザー入力
+            refresh: キャッシュを使わずに再生成するか
 
         Returns:
             コンセプトリスト
@@ -108,51 +243,35 @@ class StrategyAutomation:
             variables=user_input,
         )
 
-        console.print("[dim]Claude APIでコンセプトを生成中...[/dim]")
-        response = self.claude.generate_text(
-            prompt=prompt_data["user"],
-            system_prompt=prompt_data.get("system"),
-            temperature=prompt_data.get("temperature", 0.9),
-            max_tokens=prompt_data.get("max_tokens", 3000),
+        # 生成されたコンセプトを1行届くごとに表示する
+        concepts: List[str] = []
+        seen = set()
+
+        def on_line(line: str) -> None:
+            if len(concepts) >= NUM_CONCEPTS:
+                return
+            concept = self._parse_concept_line(line)
+            if concept and concept not in seen:
+                seen.add(concept)
+                concepts.append(concept)
+                console.print(f"  {len(concepts)}. {concept}")
+
+        console.print("[dim]Claude APIでコンセプトを生成中...[/dim]\n")
+        response = self._generate_cached(
+            "chapter1/concept_ideas",
+            prompt_data,
+            temperature=0.9,
+            max_tokens=3000,
+            refresh=refresh,
+            on_line=on_line,
         )
 
-        # レスポンスを行ごとに分割してコンセプトを抽出
-        # 対応フォーマット: "案1：...", "1. ...", "1) ..."
-        concepts = []
-        for line in response.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-
-            # マニュアル形式「案1：」「案2：」をチェック
-            for i in range(1, 21):
-                if line.startswith(f"案{i}：") or line.startswith(f"案{i}:"):
-                    # コロンの後ろを取得
-                    if "：" in line:
-                        concept = line.split("：", 1)[1].strip()
-                    else:
-                        concept = line.split(":", 1)[1].strip()
-                    concepts.append(concept)
-                    break
-
-            # 一般的な番号付きリスト「1. 」「1) 」もサポート
-            if len(concepts) < 21:  # まだ見つかっていない場合
-                for i in range(1, 21):
-                    prefixes = [f"{i}.", f"{i})"]
-                    for prefix in prefixes:
-                        if line.startswith(prefix):
-                            concept = line[len(prefix):].strip()
-                            if concept and concept not in concepts:
-                                concepts.append(concept)
-                            break
-
-        # それでも足りなければ、応答全体から非空行を取得
-        if len(concepts) == 0:
-            concepts = [line.strip() for line in response.strip().split("\n") if line.strip()]
+        # 番号付きの行が見つからなかった場合は全体をパースし直して表示
+        if not concepts:
+            concepts = self._parse_concepts(response)
+            console.print("\n".join(f"  {i}. {concept}" for i, concept in enumerate(concepts, 1)))
 
-        console.print(f"\n[bold green]{len(concepts)}個のコンセプトを生成しました:[/bold green]\n")
-        for i, concept in enumerate(concepts, 1):
-            console.print(f"  {i}. {concept}")
+        console.print(f"\n[bold green]{len(concepts)}個のコンセプトを生成しました[/bold green]")
 
         return concepts
 
@@ -184,6 +303,7 @@ class StrategyAutomation:
             system_prompt=prompt_data.get("system"),
             temperature=prompt_data.get("temperature", 0.7),
             max_tokens=prompt_data.get("max_tokens", 4000),
+            cache_system=True,
         )
 
         persona = {
@@ -212,7 +332,7 @@ class StrategyAutomation:
             chapter="chapter1",
             prompt_name="pain_extraction",
             variables={
-                "persona": persona["raw_text"],
+                "persona": PERSONA_REFERENCE,
                 "concept": persona["concept"],
             },
         )
@@ -223,27 +343,15 @@ class StrategyAutomation:
             system_prompt=prompt_data.get("system"),
             temperature=prompt_data.get("temperature", 0.8),
             max_tokens=prompt_data.get("max_tokens", 3000),
+            cache_system=True,
+            shared_context=self._persona_context(persona),
         )
 
-        # レスポンスからPainを抽出
-        pains = []
-        for line in response.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            for i in range(1, 21):
-                for prefix in [f"{i}. ", f"{i}) "]:
-                    if line.startswith(prefix):
-                        pain = line[len(prefix):].strip()
-                        pains.append(pain)
-                        break
-
-        if len(pains) == 0:
-            pains = [line.strip() for line in response.strip().split("\n") if line.strip()]
+        pains = self._parse_pains(response)
 
         console.print(f"\n[bold green]{len(pains)}個のPainを抽出しました:[/bold green]\n")
-        for i, pain in enumerate(pains, 1):
-            console.print(f"  {i}. {pain}")
+        # 1回の描画で出力する（行ごとの print はロック取得と書き込みが20回発生する）
+        console.print("\n".join(f"  {i}. {pain}" for i, pain in enumerate(pains, 1)))
 
         return pains
 
@@ -262,13 +370,13 @@ class StrategyAutomation:
         """
         console.print(Panel("Step 5: ターゲットの常識を破壊する & 最高の感情を引き出す", style="bold cyan"))
 
-        pains_text = "\n".join(f"{i}. {p}" for i, p in enumerate(pains, 1))
+        pains_text = self._format_numbered(pains)
 
         prompt_data = load_prompt(
             chapter="chapter1",
             prompt_name="usp_future",
             variables={
-                "persona": persona["raw_text"],
+                "persona": PERSONA_REFERENCE,
                 "pains": pains_text,
                 "concept": persona["concept"],
             },
@@ -280,6 +388,8 @@ class StrategyAutomation:
             system_prompt=prompt_data.get("system"),
             temperature=prompt_data.get("temperature", 0.7),
             max_tokens=prompt_data.get("max_tokens", 3000),
+            cache_system=True,
+            shared_context=self._persona_context(persona),
         )
 
         usp_future = {
@@ -310,73 +420,45 @@ class StrategyAutomation:
 
         # 20個の独り言から3つを選択
         console.print("\n[bold yellow]20個の独り言から、プロフィール文に使用する「最も心が痛む独り言」ベスト3を選択してください:[/bold yellow]\n")
-        for i, pain in enumerate(pains, 1):
-            console.print(f"{i:2d}. {pain}")
+        console.print("\n".join(f"{i:2d}. {pain}" for i, pain in enumerate(pains, 1)))
 
         console.print("\n[dim]※番号を3つ選択してください（カンマ区切り、例: 1,5,12）[/dim]")
-        while True:
-            selected_indices = click.prompt("番号を入力", type=str)
-            try:
-                indices = [int(i.strip()) for i in selected_indices.split(",")]
-                if len(indices) != 3:
-                    console.print("[red]ちょうど3つ選択してください。[/red]")
-                    continue
-                if any(i < 1 or i > len(pains) for i in indices):
-                    console.print(f"[red]1〜{len(pains)}の範囲で選択してください。[/red]")
-                    continue
-                selected_pains = [pains[i-1] for i in indices]
-                break
-            except ValueError:
-                console.print("[red]正しい形式で入力してください（例: 1,5,12）[/red]")
+        indices = click.prompt("番号を入力", type=PainIndexList(max_n=len(pains)))
+        selected_pains = [pains[i - 1] for i in indices]
 
         # 選択した3つをテキストに変換
-        pains_text = "\n".join(f"{i}. {p}" for i, p in enumerate(selected_pains, 1))
+        pains_text = self._format_numbered(selected_pains)
 
         console.print(f"\n[green]選択した3つの独り言:[/green]")
         console.print(pains_text)
 
-        # 再生成ループ
-        while True:
-            prompt_data = load_prompt(
-                chapter="chapter1",
-                prompt_name="profile_creation",
-                variables={
-                    "persona": persona["raw_text"],
-                    "pains": pains_text,
-                    "usp_future": usp_future["raw_text"],
-                    "concept": persona["concept"],
-                },
-            )
+        # プロンプトは再生成しても変わらないため、ループの外で1回だけ組み立てる
+        prompt_data = load_prompt(
+            chapter="chapter1",
+            prompt_name="profile_creation",
+            variables={
+                "persona": PERSONA_REFERENCE,
+                "pains": pains_text,
+                "usp_future": usp_future["raw_text"],
+                "concept": persona["concept"],
+            },
+        )
+        shared_context = self._persona_context(persona)
 
+        # 再生成ループ（2回目以降はキャッシュを使わずに新しい案を生成）
+        refresh = False
+        while True:
             console.print("\n[dim]Claude APIでプロフィール文を生成中...[/dim]")
-            response = self.claude.generate_text(
-                prompt=prompt_data["user"],
-                system_prompt=prompt_data.get("system"),
-                temperature=prompt_data.get("temperature", 0.8),
-                max_tokens=prompt_data.get("max_tokens", 2000),
+            response = self._generate_cached(
+                "chapter1/profile_creation",
+                prompt_data,
+                temperature=0.8,
+                max_tokens=2000,
+                refresh=refresh,
+                shared_context=shared_context,
             )
 
-            # レスポンスからプロフィール案を抽出（```で囲まれた部分）
-            profiles = []
-            in_code_block = False
-            current_profile = []
-            for line in response.split("\n"):
-                if line.strip().startswith("```") and not in_code_block:
-                    in_code_block = True
-                    current_profile = []
-                    continue
-                if line.strip().startswith("```") and in_code_block:
-                    in_code_block = False
-                    if current_profile:
-                        profiles.append("\n".join(current_profile).strip())
-                    current_profile = []
-                    continue
-                if in_code_block:
-                    current_profile.append(line)
-
-            # コードブロックが見つからなかった場合、全体を1つのプロフィールとして扱う
-            if len(profiles) == 0:
-                profiles = [response.strip()]
+            profiles = self._parse_profiles(response)
 
             console.print(f"\n[bold green]{len(profiles)}案のプロフィール文を生成しました:[/bold green]\n")
             for i, profile in enumerate(profiles, 1):
@@ -387,12 +469,13 @@ class StrategyAutomation:
             console.print("  [1] この3案から選択する")
             console.print("  [2] 再度作成（新しい3案を生成）")
 
-            action = click.prompt("番号を入力", type=int, default=1)
+            action = click.prompt("番号を入力", type=click.IntRange(1, 2), default=1)
 
             if action == 1:
                 break
             else:
                 console.print("\n[cyan]新しいプロフィール文を生成します...[/cyan]\n")
+                refresh = True
                 continue
 
         # 3案から1つを選択
@@ -401,17 +484,134 @@ class StrategyAutomation:
         console.print("  [2] B案：提言・扇動型")
         console.print("  [3] C案：権威・解決型")
 
-        while True:
-            selected_index = click.prompt("番号を入力", type=int, default=1)
-            if 1 <= selected_index <= len(profiles):
-                break
-            console.print(f"[red]1〜{len(profiles)}の範囲で選択してください。[/red]")
+        selected_index = click.prompt(
+            "番号を入力", type=click.IntRange(1, len(profiles)), default=1
+        )
 
         selected_profile = profiles[selected_index - 1]
         console.print(f"\n[green]案{selected_index}を選択しました。最終確認リストに進みます...[/green]")
 
         return profiles, selected_profile
 
+    @staticmethod
+    def _persona_context(persona: Dict[str, Any]) -> str:
+        """
+        Step 4〜6 で共有するペルソナの前置きテキストを組み立てる
+
+        Args:
+            persona: ペルソナ情報
+
+        Returns:
+            システムプロンプト先頭に置く前置きテキスト
+        """
+        return PERSONA_CONTEXT_TEMPLATE.format(
+            concept=persona["concept"], persona=persona["raw_text"]
+        )
+
+    @staticmethod
+    def _format_numbered(items: List[str]) -> str:
+        """
+        リストを「1. xxx」形式の番号付きテキストに変換
+
+        Args:
+            items: 項目リスト
+
+        Returns:
+            改行区切りの番号付きテキスト
+        """
+        return "\n".join([f"{i}. {item}" for i, item in enumerate(items, 1)])
+
+    @staticmethod
+    def _parse_concept_line(line: str) -> Optional[str]:
+        """
+        1行からコンセプトを抽出
+
+        Args:
+            line: レスポンスの1行
+
+        Returns:
+            コンセプト（コンセプト行でない場合はNone）
+        """
+        match = _CONCEPT_RE.match(line.strip())
+        if match:
+            return match.group(1).strip()
+        return None
+
+    @staticmethod
+    def _parse_concepts(response: str) -> List[str]:
+        """
+        レスポンスからコンセプトを抽出
+
+        Args:
+            response: APIレスポンステキスト
+
+        Returns:
+            コンセプトリスト
+        """
+        concepts = []
+        seen = set()
+        for line in response.splitlines():
+            concept = StrategyAutomation._parse_concept_line(line)
+            if concept and concept not in seen:
+                seen.add(concept)
+                concepts.append(concept)
+                if len(concepts) >= NUM_CONCEPTS:
+                    break
+
+        # それでも足りなければ、応答全体から非空行を取得
+        if len(concepts) == 0:
+            concepts = [line.strip() for line in response.strip().split("\n") if line.strip()]
+
+        return concepts
+
+    @staticmethod
+    def _parse_pains(response: str) -> List[str]:
+        """
+        レスポンスからPainを抽出
+
+        Args:
+            response: APIレスポンステキスト
+
+        Returns:
+            Painリスト
+        """
+        pains = []
+        for line in response.splitlines():
+            match = _PAIN_RE.match(line.strip())
+            if match:
+                pains.append(match.group(1).strip())
+
+        if len(pains) == 0:
+            pains = [line.strip() for line in response.strip().split("\n") if line.strip()]
+
+        return pains
+
+    @staticmethod
+    def _parse_profiles(response: str) -> List[str]:
+        """
+        レスポンスからプロフィール案を抽出（```で囲まれた部分）
+
+        Args:
+            response: APIレスポンステキスト
+
+        Returns:
+            プロフィール文リスト
+        """
+        # ``` で分割すると奇数番目の要素がコードブロックの中身になる
+        # 各ブロックの1行目は開始フェンスの残り（言語タグ等）なので除外する
+        profiles = []
+        for segment in response.split("```")[1::2]:
+            _, newline, body = segment.partition("\n")
+            profile = (body if newline else segment).strip()
+            if profile:
+                profiles.append(profile)
+
+        # コードブロックが見つからなかった場合、全体を1つのプロフィールとして扱う
+        if len(profiles) == 0:
+            profiles = [response.strip()]
+
+        return profiles
+
     def final_check(self, selected_profile: str) -> str:
         """
         最終確認リストでチェック
@@ -438,6 +638,7 @@ class StrategyAutomation:
             system_prompt=prompt_data.get("system"),
             temperature=prompt_data.get("temperature", 0.5),
             max_tokens=prompt_data.get("max_tokens", 2000),
+            cache_system=True,
         )
 
         console.print(f"\n[bold green]最終確認リストの結果:[/bold green]\n")
@@ -457,57 +658,59 @@ class StrategyAutomation:
         spreadsheet_id = get_spreadsheet_id()
         sheet_name = get_sheet_name("strategy")
 
-        rows = []
-
-        # ヘッダー行
-        rows.append(["項目", "内容"])
-
-        # 基本情報
         user_input = data.get("user_input", {})
-        rows.append(["役割", user_input.get("role", "")])
-        rows.append(["サービス", user_input.get("service", "")])
-        rows.append(["ターゲット", user_input.get("target", "")])
-        rows.append(["", ""])
-
-        # 選択されたコンセプト
-        rows.append(["選択コンセプト", data.get("selected_concept", "")])
-        rows.append(["", ""])
-
-        # コンセプト20案
-        rows.append(["--- コンセプト20案 ---", ""])
-        for i, concept in enumerate(data.get("concepts", []), 1):
-            rows.append([f"コンセプト{i}", concept])
-        rows.append(["", ""])
-
-        # ペルソナ
-        rows.append(["--- ペルソナ ---", ""])
         persona = data.get("persona", {})
-        rows.append(["ペルソナ詳細", persona.get("raw_text", "")])
-        rows.append(["", ""])
-
-        # Pain
-        rows.append(["--- 脳内独り言（Pain） ---", ""])
-        for i, pain in enumerate(data.get("pains", []), 1):
-            rows.append([f"Pain{i}", pain])
-        rows.append(["", ""])
-
-        # USP & Future
-        rows.append(["--- USP & Future ---", ""])
         usp_future = data.get("usp_future", {})
-        rows.append(["USP & Future", usp_future.get("raw_text", "")])
-        rows.append(["", ""])
-
-        # プロフィール文
-        rows.append(["--- プロフィール文 ---", ""])
-        for i, profile in enumerate(data.get("profiles", []), 1):
-            rows.append([f"プロフィール案{i}", profile])
-
-        self.sheets.write_range(
-            spreadsheet_id=spreadsheet_id,
-            sheet_name=sheet_name,
-            start_cell="A1",
-            values=rows,
+
+        rows = [
+            # ヘッダー行
+            ["項目", "内容"],
+            # 基本情報
+            ["役割", user_input.get("role", "")],
+            ["サービス", user_input.get("service", "")],
+            ["ターゲット", user_input.get("target", "")],
+            ["", ""],
+            # 選択されたコンセプト
+            ["選択コンセプト", data.get("selected_concept", "")],
+            ["", ""],
+            # コンセプト20案
+            ["--- コンセプト20案 ---", ""],
+        ]
+        rows.extend(
+            [f"コンセプト{i}", concept]
+            for i, concept in enumerate(data.get("concepts", []), 1)
         )
+        rows.extend([
+            ["", ""],
+            # ペルソナ
+            ["--- ペルソナ ---", ""],
+            ["ペルソナ詳細", persona.get("raw_text", "")],
+            ["", ""],
+            # Pain
+            ["--- 脳内独り言（Pain） ---", ""],
+        ])
+        rows.extend([f"Pain{i}", pain] for i, pain in enumerate(data.get("pains", []), 1))
+        rows.extend([
+            ["", ""],
+            # USP & Future
+            ["--- USP & Future ---", ""],
+            ["USP & Future", usp_future.get("raw_text", "")],
+            ["", ""],
+            # プロフィール文
+            ["--- プロフィール文 ---", ""],
+        ])
+        rows.extend(
+            [f"プロフィール案{i}", profile]
+            for i, profile in enumerate(data.get("profiles", []), 1)
+        )
+
+        with self.sheets.begin_batch():
+            self.sheets.write_range(
+                spreadsheet_id=spreadsheet_id,
+                sheet_name=sheet_name,
+                start_cell="A1",
+                values=rows,
+            )
 
         console.print(f"[bold green]Google Sheetsに保存しました（シート: {sheet_name}）[/bold green]")
 
@@ -528,19 +731,16 @@ class StrategyAutomation:
         user_input = self.collect_user_input()
 
         # Step 2: コンセプト20案の生成（再生成ループ）
+        refresh = False
         while True:
-            concepts = self.generate_concepts(user_input)
+            concepts = self.generate_concepts(user_input, refresh=refresh)
 
             # 選択 or 再生成の確認
             console.print("\n[bold yellow]次のアクションを選んでください:[/bold yellow]")
             console.print("  [1] この20案から選択する")
             console.print("  [2] 再度作成（新しい20案を生成）")
 
-            while True:
-                action = click.prompt("番号を入力", type=int, default=1)
-                if action in [1, 2]:
-                    break
-                console.print("[red]1 または 2 を入力してください[/red]")
+            action = click.prompt("番号を入力", type=click.IntRange(1, 2), default=1)
 
             if action == 1:
                 # 選択に進む
@@ -548,15 +748,14 @@ class StrategyAutomation:
             else:
                 # 再生成
                 console.print("\n[cyan]新しいコンセプト案を生成します...[/cyan]\n")
+                refresh = True
                 continue
 
         # Step 3: コンセプトの選択とペルソナ定義
         console.print("\n[bold yellow]上記のコンセプトから1つ選んでください:[/bold yellow]")
-        while True:
-            choice = click.prompt("番号を入力（1-20）", type=int)
-            if 1 <= choice <= len(concepts):
-                break
-            console.print(f"[red]1から{len(concepts)}の範囲で入力してください[/red]")
+        choice = click.prompt(
+            f"番号を入力（1-{len(concepts)}）", type=click.IntRange(1, len(concepts))
+        )
 
         selected_concept = concepts[choice - 1]
         console.print(f"\n[bold green]選択: {selected_concept}[/bold green]\n")
@@ -572,9 +771,6 @@ class StrategyAutomation:
         # Step 6: プロフィール文作成
         profiles, selected_profile = self.create_profiles(persona, usp_future, pains)
 
-        # Step 7: 最終確認リスト
-        final_check_result = self.final_check(selected_profile)
-
         # 全データをまとめる
         data = {
             "user_input": user_input,
@@ -585,68 +781,284 @@ class StrategyAutomation:
             "usp_future": usp_future,
             "profiles": profiles,
             "selected_profile": selected_profile,
-            "final_check_result": final_check_result,
         }
 
-        # Step 8: Google Sheetsへの保存
-        try:
-            self.save_to_sheet(data)
-        except Exception as e:
-            console.print(f"[bold red]Google Sheetsへの保存に失敗しました: {e}[/bold red]")
-            console.print("[yellow]JSONファイルへの保存は続行します。[/yellow]")
+        # Step 7 と Step 8 は互いに依存しないため、
+        # Google Sheetsへの保存をバックグラウンドで実行しつつ最終確認を行う
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Step 8: Google Sheetsへの保存
+            sheet_future = executor.submit(self.save_to_sheet, dict(data))
+
+            # Step 7: 最終確認リスト
+            final_check_result = self.final_check(selected_profile)
+            data["final_check_result"] = final_check_result
+
+            try:
+                sheet_future.result()
+            except Exception as e:
+                console.print(f"[bold red]Google Sheetsへの保存に失敗しました: {e}[/bold red]")
+                console.print("[yellow]JSONファイルへの保存は続行します。[/yellow]")
 
         # JSONファイルへの保存
         output_dir = Path(self.config.get("paths", {}).get("output", "./output"))
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / "chapter1_result.json"
 
-        # persona と usp_future のraw_textを含むデータをJSON化
-        json_data = {
-            "user_input": user_input,
-            "concepts": concepts,
-            "selected_concept": selected_concept,
-            "persona": {
-                "concept": persona["concept"],
-                "raw_text": persona["raw_text"],
-            },
-            "pains": pains,
-            "usp_future": {
-                "concept": usp_future["concept"],
-                "raw_text": usp_future["raw_text"],
-            },
-            "profiles": profiles,
-        }
+        # data を唯一のデータ源とし、保存対象のキーだけを参照で取り出す
+        json_data = {key: data[key] for key in RESULT_JSON_KEYS}
+
+        # JSONファイルと状態（中断・再開機能）の保存はバックグラウンドで行い、
+        # 完了メッセージを先に表示する（with を抜ける前に必ず保存の完了を待つ）
+        with ThreadPoolExecutor(max_workers=2) as io_pool:
+            io_futures = [
+                io_pool.submit(write_json, output_path, json_data),
+                io_pool.submit(
+                    self.state_manager.save_state,
+                    chapter=1,
+                    step="completed",
+                    data=json_data,
+                    metadata={
+                        "project_name": self.project_name,
+                        "target": user_input.get("target", ""),
+                        "concept": selected_concept,
+                    },
+                ),
+            ]
+
+            # 完了メッセージ
+            console.print(Panel(
+                "[bold green]Chapter 1: 戦略設計が完了しました！[/bold green]\n\n"
+                f"コンセプト: {selected_concept}\n"
+                f"Pain: {len(pains)}個\n"
+                f"プロフィール案: {len(profiles)}案\n"
+                f"\n保存先: {output_path}\n"
+                f"[dim]プロジェクト: {self.project_name}[/dim]",
+                title="完了",
+                border_style="bold green",
+            ))
+
+            for future in io_futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    console.print(f"[bold red]結果の保存に失敗しました: {e}[/bold red]")
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        return data
+
+    @staticmethod
+    def _validate_batch_inputs(inputs: List[Dict[str, Any]]) -> None:
+        """
+        run_batch の入力を検証する
 
-        console.print(f"\n[bold green]結果をJSONファイルに保存しました: {output_path}[/bold green]")
+        Args:
+            inputs: プロジェクトごとの入力リスト
 
-        # 状態を保存（中断・再開機能）
-        self.state_manager.save_state(
-            chapter=1,
-            step="completed",
-            data=json_data,
-            metadata={
-                "project_name": self.project_name,
-                "target": user_input.get("target", ""),
-                "concept": selected_concept,
+        Raises:
+            ValueError: 必須項目（target）がない、または番号が1以上の整数でない場合
+        """
+        for i, item in enumerate(inputs, 1):
+            if not isinstance(item, dict):
+                raise ValueError(f"入力 {i} 件目がオブジェクトではありません")
+            if not item.get("target"):
+                raise ValueError(f"入力 {i} 件目に必須項目 target がありません")
+
+            # 番号は省略可（省略時は先頭）。リスト内の番号は省略できない
+            indices = {
+                field: item[field]
+                for field in ("concept_index", "profile_index")
+                if item.get(field) is not None
             }
+            pain_indices = item.get("pain_indices")
+            if pain_indices is not None:
+                if not isinstance(pain_indices, list):
+                    raise ValueError(f"入力 {i} 件目の pain_indices はリストで指定してください")
+                indices.update({f"pain_indices[{j}]": v for j, v in enumerate(pain_indices)})
+
+            for field, value in indices.items():
+                # bool は int のサブクラスのため除外する
+                if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                    raise ValueError(
+                        f"入力 {i} 件目の {field} は1以上の整数で指定してください: {value!r}"
+                    )
+
+    @classmethod
+    def run_batch(
+        cls, config: Dict[str, Any], inputs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        複数プロジェクトの戦略設計を非対話で一括実行
+
+        各ステップのClaude呼び出しを全プロジェクト分まとめて
+        Message Batches API に送信する。対話的な選択は入力値
+        （未指定時は先頭の案）で代替する。
+
+        Args:
+            config: 設定辞書
+            inputs: プロジェクトごとの入力リスト。各要素は
+                {"project_name", "role", "target", "concept_index",
+                 "pain_indices", "profile_index"} 形式（target以外は任意）
+
+        Returns:
+            プロジェクトごとの生成データのリスト
+
+        Raises:
+            ValueError: 入力に必須項目がない・番号が不正な場合、または番号が生成された案の範囲外の場合
+        """
+        # API を呼び出す前に全件を検証する
+        cls._validate_batch_inputs(inputs)
+
+        automation = cls(config)
+        jobs: List[Dict[str, Any]] = []
+        for i, item in enumerate(inputs):
+            jobs.append({
+                "project_name": item.get("project_name") or f"batch_{i + 1}",
+                "options": item,
+                "user_input": {
+                    "role": item.get("role", ""),
+                    "service": item.get("service", "転職支援"),
+                    "target": item["target"],
+                },
+            })
+
+        def run_step(
+            step: str, prompt_name: str, build_variables, temperature, max_tokens,
+            with_persona: bool = False,
+        ):
+            """全プロジェクト分の1ステップをバッチ送信し、応答を各ジョブに格納する"""
+            console.print(f"[dim]バッチ送信中: {step}（{len(jobs)}件）[/dim]")
+            requests = []
+            for i, job in enumerate(jobs):
+                prompt_data = load_prompt(
+                    chapter="chapter1",
+                    prompt_name=prompt_name,
+                    variables=build_variables(job),
+                )
+                requests.append({
+                    # custom_id は英数字・_・- のみ許可されるため番号で識別する
+                    "custom_id": f"p{i:03d}_{step}",
+                    "prompt": prompt_data["user"],
+                    "system_prompt": prompt_data.get("system"),
+                    "temperature": prompt_data.get("temperature", temperature),
+                    "max_tokens": prompt_data.get("max_tokens", max_tokens),
+                    "cache_system": True,
+                    "shared_context": (
+                        cls._persona_context(job["persona"]) if with_persona else None
+                    ),
+                })
+
+            results = automation.claude.generate_message_batch(requests)
+            for i, job in enumerate(jobs):
+                job[step] = results.get(f"p{i:03d}_{step}", "")
+
+        def pick(job: Dict[str, Any], items: List[Any], index: Optional[int], field: str) -> Any:
+            """1始まりの番号で要素を選択（未指定時は先頭。範囲外は ValueError）"""
+            if index is None:
+                return items[0] if items else ""
+            if not 1 <= index <= len(items):
+                raise ValueError(
+                    f"{job['project_name']}: {field} の番号 {index} が範囲外です"
+                    f"（1-{len(items)}）"
+                )
+            return items[index - 1]
+
+        # Step 2: コンセプト
+        run_step("concepts", "concept_ideas", lambda job: job["user_input"], 0.9, 3000)
+        for job in jobs:
+            job["concepts"] = cls._parse_concepts(job["concepts"])
+            job["selected_concept"] = pick(
+                job, job["concepts"], job["options"].get("concept_index"), "concept_index"
+            )
+
+        # Step 3: ペルソナ
+        run_step(
+            "persona", "persona_definition",
+            lambda job: {"concept": job["selected_concept"], **job["user_input"]},
+            0.7, 4000,
+        )
+        for job in jobs:
+            job["persona"] = {"concept": job["selected_concept"], "raw_text": job["persona"]}
+
+        # Step 4: Pain
+        run_step(
+            "pains", "pain_extraction",
+            lambda job: {
+                "persona": PERSONA_REFERENCE,
+                "concept": job["selected_concept"],
+            },
+            0.8, 3000, with_persona=True,
+        )
+        for job in jobs:
+            job["pains"] = cls._parse_pains(job["pains"])
+
+        # Step 5: USP & Future
+        run_step(
+            "usp_future", "usp_future",
+            lambda job: {
+                "persona": PERSONA_REFERENCE,
+                "pains": cls._format_numbered(job["pains"]),
+                "concept": job["selected_concept"],
+            },
+            0.7, 3000, with_persona=True,
         )
+        for job in jobs:
+            job["usp_future"] = {"concept": job["selected_concept"], "raw_text": job["usp_future"]}
+
+        # Step 6: プロフィール文（独り言は指定がなければ先頭3つ）
+        for job in jobs:
+            indices = job["options"].get("pain_indices") or range(1, min(3, len(job["pains"])) + 1)
+            selected_pains = [pick(job, job["pains"], i, "pain_indices") for i in indices]
+            job["selected_pains_text"] = cls._format_numbered(selected_pains)
+        run_step(
+            "profiles", "profile_creation",
+            lambda job: {
+                "persona": PERSONA_REFERENCE,
+                "pains": job["selected_pains_text"],
+                "usp_future": job["usp_future"]["raw_text"],
+                "concept": job["selected_concept"],
+            },
+            0.8, 2000, with_persona=True,
+        )
+        for job in jobs:
+            job["profiles"] = cls._parse_profiles(job["profiles"])
+            job["selected_profile"] = pick(
+                job, job["profiles"], job["options"].get("profile_index"), "profile_index"
+            )
 
-        # 完了メッセージ
-        console.print(Panel(
-            "[bold green]Chapter 1: 戦略設計が完了しました！[/bold green]\n\n"
-            f"コンセプト: {selected_concept}\n"
-            f"Pain: {len(pains)}個\n"
-            f"プロフィール案: {len(profiles)}案\n"
-            f"\n保存先: {output_path}\n"
-            f"[dim]プロジェクト: {self.project_name}[/dim]",
-            title="完了",
-            border_style="bold green",
-        ))
+        # Step 7: 最終確認リスト
+        run_step(
+            "final_check_result", "final_checklist",
+            lambda job: {"selected_profile": job["selected_profile"]},
+            0.5, 2000,
+        )
 
-        return data
+        # 結果をプロジェクトごとの状態として保存
+        results: List[Dict[str, Any]] = []
+        for job in jobs:
+            data = {
+                "user_input": job["user_input"],
+                "concepts": job["concepts"],
+                "selected_concept": job["selected_concept"],
+                "persona": job["persona"],
+                "pains": job["pains"],
+                "usp_future": job["usp_future"],
+                "profiles": job["profiles"],
+                "selected_profile": job["selected_profile"],
+                "final_check_result": job["final_check_result"],
+            }
+            StateManager(job["project_name"]).save_state(
+                chapter=1,
+                step="completed",
+                data={key: data[key] for key in RESULT_JSON_KEYS},
+                metadata={
+                    "project_name": job["project_name"],
+                    "target": job["user_input"].get("target", ""),
+                    "concept": job["selected_concept"],
+                },
+            )
+            results.append(data)
+
+        console.print(f"[bold green]{len(results)}件のプロジェクトの戦略設計が完了しました[/bold green]")
+        return results
 
 
 def main():
@@ -8,22 +8,35 @@ Chapter 2: 競合分析の自動化
 - 横断分析（鉄則抽出）
 """
 
-import json
+import hashlib
 import logging
-from typing import Dict, List, Any
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+import anthropic
 from rich.console import Console
 from rich.progress import Progress
 
 from sns_automation.utils import (
     ClaudeAPI,
     SheetsAPI,
+    GenCache,
     load_config,
     extract_frames,
+    extract_frames_bytes,
+    extract_frames_multi,
     batch_extract,
+    list_video_files,
     load_prompt,
 )
+from sns_automation.utils.image_processing import PYAV_AVAILABLE
+from sns_automation.utils.json_io import read_json, write_json
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -34,10 +47,41 @@ CHAPTER1_RESULT_PATH = Path("output/chapter1_result.json")
 # 競合分析シート名
 ANALYSIS_SHEET_NAME = "競合分析"
 
-# スプレッドシートの列マッピング（D〜H列 = 競合1〜5）
-COMPETITOR_COLUMNS = ["D", "E", "F", "G", "H"]
+# スプレッドシートの列マッピング（D〜H列 = 競合1〜5、I列 = 鉄則）
+# write_to_sheet は D〜I 列を1つの範囲として書き込むため、列は連続している必要がある
+COMPETITOR_COLUMNS = ("D", "E", "F", "G", "H")
 RULES_COLUMN = "I"
 
+# 書き込み範囲の左上セル（行数だけが実行ごとに変わる）
+ANALYSIS_RANGE_START = f"{ANALYSIS_SHEET_NAME}!{COMPETITOR_COLUMNS[0]}1"
+
+# 1動画あたりの静止画抽出数のデフォルト
+DEFAULT_FRAMES_PER_VIDEO = 5
+
+# 鉄則の行: テーブル行（| 1 | 鉄則 | ... |）または "1. 鉄則" 形式
+_RULE_RE = re.compile(
+    r"^[ \t]*(?:\|[ \t]*\d+[ \t]*\|[ \t]*([^|\n]*?)[ \t]*\||\d{1,3}\.[ \t]*(.*?)[ \t]*$)",
+    re.MULTILINE,
+)
+
+# 1社あたり同時に分析する動画数のデフォルト
+DEFAULT_VIDEO_WORKERS = 4
+
+# 同時に分析する競合数のデフォルト
+DEFAULT_COMPETITOR_WORKERS = 2
+
+# 動画の同一性判定に読む先頭・末尾のバイト数（全体をハッシュすると大きな動画で遅いため）
+VIDEO_FINGERPRINT_BYTES = 1 << 20
+
+# 横断分析を分割する単位（社数）のデフォルト
+DEFAULT_CROSS_SHARD_SIZE = 3
+
+# 同時に実行するフレーム抽出（ffmpeg プロセス）数のデフォルト
+DEFAULT_EXTRACT_WORKERS = 2
+
+# 全スレッド合計での Claude Vision 同時呼び出し数の上限のデフォルト
+DEFAULT_MAX_CLAUDE_CALLS = 4
+
 
 class AnalysisAutomation:
     """Chapter 2: 競合分析の自動化クラス"""
@@ -54,14 +98,42 @@ class AnalysisAutomation:
         self.sheets = SheetsAPI(config)
         self.spreadsheet_id = config["google_sheets"]["default_spreadsheet_id"]
         self.scoring_criteria: str = ""
+        self._ch1_result: Optional[Dict[str, Any]] = None
+        # 再実行時に分析済みの動画をスキップするための生成キャッシュ
+        self.gen_cache = GenCache() if config.get("cache", {}).get("enabled", True) else None
+        # デバッグ時のみ抽出したフレームをファイルに保存する
+        self.save_frames = config.get("debug", {}).get("save_frames", False)
+        # 動画分析を Message Batches API でまとめて送信するか（低コストだが完了まで時間がかかる）
+        analysis_config = config.get("analysis", {})
+        self.frames_per_video = analysis_config.get(
+            "frames_per_video", DEFAULT_FRAMES_PER_VIDEO
+        )
+        self.use_batch_api = analysis_config.get("use_batch_api", False)
+        # 横断分析を分割する単位（この社数を超えると分割して並列に分析する）
+        self.cross_shard_size = analysis_config.get(
+            "cross_shard_size", DEFAULT_CROSS_SHARD_SIZE
+        )
+        concurrency = config.get("concurrency", {})
+        self.video_workers = concurrency.get("video_workers", DEFAULT_VIDEO_WORKERS)
+        self.competitor_workers = concurrency.get(
+            "competitor_workers", DEFAULT_COMPETITOR_WORKERS
+        )
+        self.extract_workers = concurrency.get("extract_workers", DEFAULT_EXTRACT_WORKERS)
+        # 競合・動画の2段の並列を合わせてもレート制限を超えないよう、呼び出し数を制限する
+        self._claude_slots = threading.BoundedSemaphore(
+            concurrency.get("max_claude_calls", DEFAULT_MAX_CLAUDE_CALLS)
+        )
 
     def _load_chapter1_result(self) -> Dict[str, Any]:
         """
-        Chapter 1 の結果を読み込む
+        Chapter 1 の結果を読み込む（2回目以降は読み込み済みの結果を返す）
 
         Returns:
             Chapter 1 の結果辞書
         """
+        if self._ch1_result is not None:
+            return self._ch1_result
+
         output_path = self.config.get("paths", {}).get(
             "chapter1_result", str(CHAPTER1_RESULT_PATH)
         )
@@ -72,58 +144,332 @@ class AnalysisAutomation:
                 "Chapter 1 の結果ファイルが見つかりません: %s. デフォルト値を使用します。",
                 result_path,
             )
-            return {"concept": "未設定", "persona": "未設定"}
+            self._ch1_result = {"concept": "未設定", "persona": "未設定"}
+        else:
+            self._ch1_result = read_json(result_path)
 
-        with open(result_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return self._ch1_result
 
-    def analyze_video(self, video_path: Path) -> Dict[str, Any]:
+    def _extract_all_frames(
+        self, video_files: List[Path]
+    ) -> Optional[List[Dict[str, Any]]]:
         """
-        動画を分析する
+        1社分の全動画のフレームを ffmpeg 1回でまとめて抽出する
+
+        Args:
+            video_files: 動画ファイルパスのリスト
+
+        Returns:
+            動画ごとの {"frame_paths", "frame_bytes"} のリスト
+            （一括抽出しない・失敗した場合は None。動画ごとの抽出にフォールバックする）
+        """
+        if not self.save_frames and PYAV_AVAILABLE:
+            # PyAV はプロセスを起動せずに抽出できるため、動画ごとの抽出で十分
+            return None
+
+        try:
+            if self.save_frames:
+                output_dirs = [f.parent / "frames" / f.stem for f in video_files]
+                all_paths = extract_frames_multi(video_files, output_dirs, num_frames=self.frames_per_video)
+                return [
+                    {"frame_paths": paths, "frame_bytes": None} for paths in all_paths
+                ]
+
+            # 保存不要な場合は一時ディレクトリに書き出し、バイト列として読み込む
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                output_dirs = [Path(tmp_dir) / str(i) for i in range(len(video_files))]
+                all_paths = extract_frames_multi(
+                    video_files, output_dirs, num_frames=self.frames_per_video, image_format="jpg"
+                )
+                return [
+                    {"frame_paths": None, "frame_bytes": [p.read_bytes() for p in paths]}
+                    for paths in all_paths
+                ]
+        except Exception as e:
+            logger.warning("フレームの一括抽出に失敗したため、動画ごとに抽出します: %s", e)
+            return None
+
+    def _prefetch_frames(
+        self, video_dir: Path, scoring_criteria: Optional[str] = None
+    ) -> Tuple[List[Path], Optional[List[Optional[Dict[str, Any]]]]]:
+        """
+        競合1社分の動画一覧を取得し、未分析の動画のフレームを抽出する（先読み用）
+
+        Args:
+            video_dir: 動画ディレクトリ
+            scoring_criteria: 確定済みの採点基準（指定時は分析済みの動画を抽出対象から除く。
+                省略時は分析プロンプトが未確定のため全動画を抽出する）
+
+        Returns:
+            (動画ファイルパスのリスト, 動画ごとの抽出済みフレーム) のタプル
+            （フレームは抽出しなかった動画が None。一括抽出しない・失敗した場合はリスト自体が None）
+        """
+        video_files = list_video_files(video_dir)
+        if not video_files:
+            return video_files, None
+
+        targets = list(range(len(video_files)))
+        if scoring_criteria is not None and self.gen_cache is not None:
+            targets = [
+                i for i, video_file in enumerate(video_files)
+                if self._cached_analysis(
+                    video_file, self._video_prompt(video_file, scoring_criteria)
+                )[1] is None
+            ]
+        if not targets:
+            return video_files, None
+
+        extracted = self._extract_all_frames([video_files[i] for i in targets])
+        if extracted is None:
+            return video_files, None
+        frames: List[Optional[Dict[str, Any]]] = [None] * len(video_files)
+        for i, video_frames in zip(targets, extracted):
+            frames[i] = video_frames
+        return video_files, frames
+
+    def _extract_frames(
+        self, video_path: Path, frames: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        動画のフレームを抽出する
 
         Args:
             video_path: 動画ファイルパス
+            frames: 抽出済みのフレーム（{"frame_paths", "frame_bytes"}。省略時はここで抽出）
 
         Returns:
-            分析結果辞書
+            {"frame_paths", "frame_bytes", "frame_count"} 形式の辞書
         """
-        console.print(f"  [cyan]動画を分析中: {video_path.name}[/cyan]")
+        # 動画からフレームを抽出（通常はディスクを経由せずメモリ上で受け渡す）
+        if frames is not None and (frames["frame_paths"] or frames["frame_bytes"]):
+            frame_paths = frames["frame_paths"]
+            frame_bytes = frames["frame_bytes"]
+            frame_count = len(frame_paths or frame_bytes)
+        elif self.save_frames:
+            frames_dir = video_path.parent / "frames" / video_path.stem
+            frame_paths = extract_frames(video_path, frames_dir, num_frames=self.frames_per_video)
+            frame_bytes = None
+            frame_count = len(frame_paths)
+        else:
+            frame_paths = None
+            frame_bytes = extract_frames_bytes(video_path, num_frames=self.frames_per_video)
+            frame_count = len(frame_bytes)
+
+        logger.info("%d 枚のフレームを抽出しました: %s", frame_count, video_path.name)
 
-        # 動画からフレームを抽出
-        frames_dir = video_path.parent / "frames" / video_path.stem
-        frame_paths = extract_frames(video_path, frames_dir, num_frames=5)
+        return {
+            "frame_paths": frame_paths,
+            "frame_bytes": frame_bytes,
+            "frame_count": frame_count,
+        }
+
+    def _video_prompt(
+        self, video_path: Path, scoring_criteria: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        動画分析のプロンプトを組み立てる（フレームの抽出は不要）
 
-        logger.info("%d 枚のフレームを抽出しました: %s", len(frame_paths), video_path.name)
+        Args:
+            video_path: 動画ファイルパス
+            scoring_criteria: 採点基準（省略時は self.scoring_criteria）
 
-        # プロンプトテンプレートを読み込み
-        prompt_data = load_prompt(
+        Returns:
+            プロンプトデータ
+        """
+        if scoring_criteria is None:
+            scoring_criteria = self.scoring_criteria
+        return load_prompt(
             "chapter2",
             "image_analysis",
             variables={
                 "competitor_name": video_path.parent.name,
                 "video_number": video_path.stem,
-                "scoring_criteria": self.scoring_criteria,
+                "scoring_criteria": scoring_criteria,
             },
         )
 
-        # Claude Vision API で画像分析
-        analysis_text = self.claude.generate_with_images(
-            prompt=prompt_data["user"],
-            image_paths=frame_paths,
-            system_prompt=prompt_data.get("system"),
-            temperature=prompt_data.get("temperature", 0.3),
-            max_tokens=prompt_data.get("max_tokens", 5000),
+    @staticmethod
+    def _video_fingerprint(video_path: Path) -> str:
+        """
+        動画の同一性を判定するフィンガープリントを計算
+
+        ファイルサイズと先頭・末尾 VIDEO_FINGERPRINT_BYTES バイトのハッシュを使う。
+
+        Args:
+            video_path: 動画ファイルパス
+
+        Returns:
+            16進ハッシュ文字列
+        """
+        size = video_path.stat().st_size
+        digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+        with open(video_path, "rb") as f:
+            digest.update(f.read(VIDEO_FINGERPRINT_BYTES))
+            if size > VIDEO_FINGERPRINT_BYTES:
+                f.seek(max(size - VIDEO_FINGERPRINT_BYTES, VIDEO_FINGERPRINT_BYTES))
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def _analysis_cache_prompt(self, video_path: Path, prompt_data: Dict[str, Any]) -> str:
+        """
+        動画分析のキャッシュキーに使うプロンプト文字列を組み立てる
+
+        Args:
+            video_path: 動画ファイルパス
+            prompt_data: 分析プロンプト
+
+        Returns:
+            動画のフィンガープリント・抽出フレーム数・プロンプトを連結した文字列
+        """
+        return (
+            f"{self._video_fingerprint(video_path)}\n"
+            f"frames={self.frames_per_video}\n"
+            f"{prompt_data['user']}"
         )
 
+    def _cached_analysis(
+        self, video_path: Path, prompt_data: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        分析済みの動画をキャッシュから探す（フレームの抽出は不要）
+
+        Args:
+            video_path: 動画ファイルパス
+            prompt_data: 分析プロンプト
+
+        Returns:
+            (キャッシュキーのプロンプト, キャッシュ済みの分析結果) のタプル
+            （キャッシュ無効時は両方 None、未分析の場合は分析結果が None）
+        """
+        if self.gen_cache is None:
+            return None, None
+        cache_prompt = self._analysis_cache_prompt(video_path, prompt_data)
+        return cache_prompt, self.gen_cache.get(
+            "chapter2/image_analysis", cache_prompt, prompt_data.get("system")
+        )
+
+    def analyze_video(
+        self, video_path: Path, frames: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        動画を分析する
+
+        Args:
+            video_path: 動画ファイルパス
+            frames: 抽出済みのフレーム（省略時はここで抽出）
+
+        Returns:
+            分析結果辞書
+        """
+        console.print(f"  [cyan]動画を分析中: {video_path.name}[/cyan]")
+
+        prompt_data = self._video_prompt(video_path)
+
+        # 同じ動画・同じプロンプト・同じフレーム数で分析済みなら、フレームを抽出せずにキャッシュを返す
+        # （抽出しないため、フレーム数は設定値を記録する）
+        cache_prompt, analysis_text = self._cached_analysis(video_path, prompt_data)
+        frame_count = self.frames_per_video
+
+        # Claude Vision API で画像分析
+        if analysis_text is None:
+            video = self._extract_frames(video_path, frames)
+            frame_count = video["frame_count"]
+            with self._claude_slots:
+                analysis_text = self.claude.generate_with_images(
+                    prompt=prompt_data["user"],
+                    image_paths=video["frame_paths"],
+                    system_prompt=prompt_data.get("system"),
+                    temperature=prompt_data.get("temperature", 0.3),
+                    max_tokens=prompt_data.get("max_tokens", 5000),
+                    image_bytes=video["frame_bytes"],
+                )
+            if self.gen_cache is not None:
+                self.gen_cache.set(
+                    "chapter2/image_analysis", cache_prompt, analysis_text,
+                    prompt_data.get("system"),
+                )
+
         return {
             "video_name": video_path.name,
             "video_path": str(video_path),
-            "frame_count": len(frame_paths),
+            "frame_count": frame_count,
             "analysis": analysis_text,
         }
 
+    def analyze_videos_batch(
+        self,
+        video_files: List[Path],
+        frames: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        複数の動画を Message Batches API でまとめて分析する
+
+        Args:
+            video_files: 動画ファイルパスのリスト
+            frames: 動画ごとの抽出済みフレーム（省略時は動画ごとに抽出）
+
+        Returns:
+            分析結果辞書のリスト（video_files と同じ順序。失敗した動画の analysis は空文字）
+        """
+        console.print(f"  [cyan]{len(video_files)} 本の動画をバッチで分析中...[/cyan]")
+
+        if frames is None:
+            frames = [None] * len(video_files)
+        prompts = [self._video_prompt(video_file) for video_file in video_files]
+
+        # 分析済みの動画はキャッシュから取り、残りだけフレームを抽出してバッチに含める
+        results: Dict[str, str] = {}
+        cache_prompts: List[Optional[str]] = []
+        frame_counts = [self.frames_per_video] * len(video_files)
+        tasks = []
+        for i, (video_file, prompt_data, video_frames) in enumerate(
+            zip(video_files, prompts, frames)
+        ):
+            # custom_id は英数字・_・- のみ許可されるため番号で識別する
+            custom_id = f"v{i:03d}"
+            cache_prompt, hit = self._cached_analysis(video_file, prompt_data)
+            cache_prompts.append(cache_prompt)
+            if hit is not None:
+                results[custom_id] = hit
+                continue
+
+            video = self._extract_frames(video_file, video_frames)
+            frame_counts[i] = video["frame_count"]
+            tasks.append({
+                "custom_id": custom_id,
+                "prompt": prompt_data["user"],
+                "image_paths": video["frame_paths"],
+                "image_bytes": video["frame_bytes"],
+                "system_prompt": prompt_data.get("system"),
+                "temperature": prompt_data.get("temperature", 0.3),
+                "max_tokens": prompt_data.get("max_tokens", 5000),
+            })
+
+        batch_results = self.claude.generate_batched_with_images(tasks) if tasks else {}
+        if self.gen_cache is not None:
+            for custom_id, text in batch_results.items():
+                i = int(custom_id[1:])
+                self.gen_cache.set(
+                    "chapter2/image_analysis", cache_prompts[i], text, prompts[i].get("system")
+                )
+        results.update(batch_results)
+
+        return [
+            {
+                "video_name": video_file.name,
+                "video_path": str(video_file),
+                "frame_count": frame_counts[i],
+                "analysis": results.get(f"v{i:03d}", ""),
+            }
+            for i, video_file in enumerate(video_files)
+        ]
+
     def analyze_competitor(
-        self, video_dir: Path, competitor_name: str
+        self,
+        video_dir: Path,
+        competitor_name: str,
+        progress: Optional[Progress] = None,
+        frames_future: Optional[Future] = None,
     ) -> Dict[str, Any]:
         """
         競合1社を分析する
@@ -131,19 +477,20 @@ class AnalysisAutomation:
         Args:
             video_dir: 動画ディレクトリ
             competitor_name: 競合名
+            progress: 進捗表示（複数競合を並列分析する場合に共有する。省略時は新規作成）
+            frames_future: _prefetch_frames の実行結果（省略時はここで抽出）
 
         Returns:
             分析結果辞書
         """
         console.print(f"\n[bold green]競合分析: {competitor_name}[/bold green]")
 
-        # video_dir 内の動画ファイルを取得
-        video_extensions = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".flv", ".wmv"}
-        video_files = sorted(
-            f
-            for f in video_dir.iterdir()
-            if f.is_file() and f.suffix.lower() in video_extensions
-        )
+        # video_dir 内の動画ファイルと、そのフレームを取得
+        # （ffmpeg の起動を1社につき1回にするため、全動画のフレームをまとめて抽出する）
+        if frames_future is not None:
+            video_files, frames = frames_future.result()
+        else:
+            video_files, frames = self._prefetch_frames(video_dir, self.scoring_criteria)
 
         if not video_files:
             logger.warning("動画ファイルが見つかりません: %s", video_dir)
@@ -154,49 +501,76 @@ class AnalysisAutomation:
             }
 
         console.print(f"  {len(video_files)} 本の動画を検出しました")
+        if frames is None:
+            frames = [None] * len(video_files)
+
+        if self.use_batch_api:
+            try:
+                return {
+                    "competitor_name": competitor_name,
+                    "video_count": len(video_files),
+                    "analyses": self.analyze_videos_batch(video_files, frames),
+                }
+            except anthropic.APIError as e:
+                logger.warning("バッチAPIが利用できないため、動画ごとに分析します: %s", e)
 
-        analyses = []
-        with Progress() as progress:
+        # Claude Vision の呼び出し待ちを重ねるため、動画ごとに並列で分析する
+        # （完了順に受け取り、結果は元の動画順に並べる）
+        results: List[Optional[Dict[str, Any]]] = [None] * len(video_files)
+        with nullcontext(progress) if progress is not None else Progress() as progress:
             task = progress.add_task(
                 f"  {competitor_name} の動画を分析中...",
                 total=len(video_files),
             )
-            for video_file in video_files:
-                result = self.analyze_video(video_file)
-                analyses.append(result)
-                progress.update(task, advance=1)
+            with ThreadPoolExecutor(max_workers=self.video_workers) as executor:
+                futures = {
+                    executor.submit(self.analyze_video, video_file, frames[i]): i
+                    for i, video_file in enumerate(video_files)
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    progress.update(task, advance=1)
 
+        # future.result() は失敗時に例外を送出するため、ここでは全要素が埋まっている
+        analyses = [analysis for analysis in results if analysis is not None]
         return {
             "competitor_name": competitor_name,
             "video_count": len(video_files),
             "analyses": analyses,
         }
 
-    def cross_analysis(self, all_analyses: List[Dict[str, Any]]) -> List[str]:
+    @staticmethod
+    def _format_analyses(analyses: List[Dict[str, Any]]) -> str:
         """
-        横断分析（鉄則抽出）
+        競合ごとの分析結果を横断分析用のテキストにまとめる
 
         Args:
-            all_analyses: 全競合の分析結果
+            analyses: 競合ごとの分析結果
 
         Returns:
-            鉄則リスト
+            Markdown形式のテキスト
         """
-        console.print("\n[bold yellow]横断分析（鉄則抽出）を実行中...[/bold yellow]")
+        # （+= の繰り返しは毎回文字列全体をコピーするため、断片を集めて最後に1回で結合する）
+        parts: List[str] = []
+        for competitor_data in analyses:
+            parts.append(f"\n## 競合: {competitor_data['competitor_name']}\n")
+            for video_analysis in competitor_data.get("analyses", []):
+                parts.append(f"\n### {video_analysis['video_name']}\n")
+                parts.append(video_analysis["analysis"])
+                parts.append("\n")
+        return "".join(parts)
 
-        # Chapter 1 の結果を読み込む
-        ch1_result = self._load_chapter1_result()
+    def _generate_cross_analysis(self, analyses_text: str, ch1_result: Dict[str, Any]) -> str:
+        """
+        横断分析プロンプトでClaude APIを呼び出す
 
-        # 全分析結果をテキストにまとめる
-        analyses_text = ""
-        for competitor_data in all_analyses:
-            name = competitor_data["competitor_name"]
-            analyses_text += f"\n## 競合: {name}\n"
-            for video_analysis in competitor_data.get("analyses", []):
-                analyses_text += f"\n### {video_analysis['video_name']}\n"
-                analyses_text += video_analysis["analysis"] + "\n"
+        Args:
+            analyses_text: 分析結果（または部分分析の結果）のテキスト
+            ch1_result: Chapter 1 の結果辞書
 
-        # プロンプトテンプレートを読み込み
+        Returns:
+            横断分析の結果テキスト
+        """
         prompt_data = load_prompt(
             "chapter2",
             "cross_analysis",
@@ -207,30 +581,57 @@ class AnalysisAutomation:
             },
         )
 
-        # Claude API で横断分析
-        cross_result = self.claude.generate_text(
+        return self.claude.generate_text(
             prompt=prompt_data["user"],
             system_prompt=prompt_data.get("system"),
             temperature=prompt_data.get("temperature", 0.5),
             max_tokens=prompt_data.get("max_tokens", 6000),
         )
 
+    def cross_analysis(self, all_analyses: List[Dict[str, Any]]) -> List[str]:
+        """
+        横断分析（鉄則抽出）
+
+        Args:
+            all_analyses: 全競合の分析結果
+
+        Returns:
+            鉄則リスト
+        """
+        console.print("\n[bold yellow]横断分析（鉄則抽出）を実行中...[/bold yellow]")
+
+        # Chapter 1 の結果を読み込む
+        ch1_result = self._load_chapter1_result()
+
+        # 競合数が多い場合は分割して並列に部分分析し（map）、結果を統合する（reduce）
+        shards = [
+            all_analyses[i:i + self.cross_shard_size]
+            for i in range(0, len(all_analyses), self.cross_shard_size)
+        ]
+        if len(shards) > 1:
+            console.print(f"  [dim]{len(shards)} グループに分けて分析します[/dim]")
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                partials = list(executor.map(
+                    lambda shard: self._generate_cross_analysis(
+                        self._format_analyses(shard), ch1_result
+                    ),
+                    shards,
+                ))
+            merged_text = "".join(
+                f"\n## 部分分析 {i}\n{partial}\n" for i, partial in enumerate(partials, 1)
+            )
+            cross_result = self._generate_cross_analysis(merged_text, ch1_result)
+        else:
+            cross_result = self._generate_cross_analysis(
+                self._format_analyses(all_analyses), ch1_result
+            )
+
         # 鉄則をリストとして抽出（テーブル行やナンバリングされた項目をパース）
-        rules = []
-        for line in cross_result.split("\n"):
-            line = line.strip()
-            # テーブル行（| 1 | 鉄則 | ... |）またはナンバリング行を検出
-            if line.startswith("|") and not line.startswith("|---") and not line.startswith("| #"):
-                parts = [p.strip() for p in line.split("|")]
-                # 最初と最後の空要素を除外、番号列の次が鉄則
-                parts = [p for p in parts if p]
-                if len(parts) >= 2 and parts[0].isdigit():
-                    rules.append(parts[1])
-            elif line and line[0].isdigit() and "." in line[:4]:
-                # "1. 鉄則" 形式
-                rule_text = line.split(".", 1)[1].strip()
-                if rule_text:
-                    rules.append(rule_text)
+        rules = [
+            rule
+            for match in _RULE_RE.finditer(cross_result)
+            if (rule := match.group(1) or match.group(2))
+        ]
 
         # パースで鉄則が抽出できなかった場合、全文を1要素として返す
         if not rules:
@@ -252,7 +653,8 @@ class AnalysisAutomation:
         """
         console.print("\n[bold blue]スプレッドシートに書き込み中...[/bold blue]")
 
-        batch_data = []
+        # D〜I列を1つの範囲として書き込むため、列ごとの値を先に組み立てる
+        columns: List[List[str]] = [[] for _ in range(len(COMPETITOR_COLUMNS) + 1)]
 
         # 各競合の分析結果を列（D〜H列）に記入
         for i, competitor_data in enumerate(analyses):
@@ -263,41 +665,38 @@ class AnalysisAutomation:
                 )
                 break
 
-            col = COMPETITOR_COLUMNS[i]
-            name = competitor_data["competitor_name"]
-
             # ヘッダー行（1行目）に競合名
-            values = [[name]]
+            values = columns[i]
+            values.append(competitor_data["competitor_name"])
 
             # 各動画の分析結果を行に追加
             for video_analysis in competitor_data.get("analyses", []):
-                values.append([video_analysis["video_name"]])
-                # 分析テキストを適切な長さに分割
-                analysis_text = video_analysis["analysis"]
-                values.append([analysis_text])
+                values.append(video_analysis["video_name"])
+                values.append(video_analysis["analysis"])
 
-            batch_data.append(
+        # 鉄則をI列に記入
+        rules_values = columns[-1]
+        rules_values.append("鉄則一覧")
+        rules_values.extend(f"{j}. {rule}" for j, rule in enumerate(rules, 1))
+
+        # 行ごとの2次元配列に変換（値のないセルは None にすると既存の内容を上書きしない）
+        max_rows = max(len(values) for values in columns)
+        grid = [
+            [values[row] if row < len(values) else None for values in columns]
+            for row in range(max_rows)
+        ]
+
+        # 1つの範囲として一括書き込み
+        self.sheets.batch_update(
+            self.spreadsheet_id,
+            [
                 {
-                    "range": f"{ANALYSIS_SHEET_NAME}!{col}1",
-                    "values": values,
+                    "range": f"{ANALYSIS_RANGE_START}:{RULES_COLUMN}{max_rows}",
+                    "values": grid,
                 }
-            )
-
-        # 鉄則をI列に記入
-        rules_values = [["鉄則一覧"]]
-        for j, rule in enumerate(rules, 1):
-            rules_values.append([f"{j}. {rule}"])
-
-        batch_data.append(
-            {
-                "range": f"{ANALYSIS_SHEET_NAME}!{RULES_COLUMN}1",
-                "values": rules_values,
-            }
+            ],
         )
 
-        # バッチ更新で一括書き込み
-        self.sheets.batch_update(self.spreadsheet_id, batch_data)
-
         console.print(
             f"  [green]{len(analyses)} 社の分析結果と{len(rules)}個の鉄則を書き込みました[/green]"
         )
@@ -319,7 +718,28 @@ class AnalysisAutomation:
         ch1_result = self._load_chapter1_result()
         console.print("[dim]Chapter 1 の結果を読み込みました[/dim]")
 
-        # 1. 採点基準を生成
+        # 1. 競合ディレクトリを検出（video_dir 直下のサブディレクトリ = 各競合）
+        with os.scandir(video_dir) as entries:
+            competitor_dirs = [
+                video_dir / name
+                for name in sorted(
+                    entry.name
+                    for entry in entries
+                    if entry.is_dir() and not entry.name.startswith(".")
+                )
+            ]
+
+        if not competitor_dirs:
+            # サブディレクトリがない場合、video_dir 自体を1つの競合として扱う
+            console.print(
+                "[yellow]サブディレクトリが見つかりません。"
+                "ディレクトリ全体を1つの競合として分析します。[/yellow]"
+            )
+            competitor_dirs = [video_dir]
+
+        console.print(f"\n{len(competitor_dirs)} 社の競合を検出しました")
+
+        # 2. 採点基準を生成
         console.print("\n[bold yellow]採点基準を生成中...[/bold yellow]")
         scoring_prompt = load_prompt(
             "chapter2",
@@ -329,35 +749,50 @@ class AnalysisAutomation:
                 "persona": ch1_result.get("persona", "未設定"),
             },
         )
-        self.scoring_criteria = self.claude.generate_text(
-            prompt=scoring_prompt["user"],
-            system_prompt=scoring_prompt.get("system"),
-            temperature=scoring_prompt.get("temperature", 0.5),
-            max_tokens=scoring_prompt.get("max_tokens", 5000),
-        )
-        console.print("  [green]採点基準を生成しました[/green]")
-
-        # 2. 競合ディレクトリを検出（video_dir 直下のサブディレクトリ = 各競合）
-        competitor_dirs = sorted(
-            d for d in video_dir.iterdir() if d.is_dir() and not d.name.startswith(".")
-        )
-
-        if not competitor_dirs:
-            # サブディレクトリがない場合、video_dir 自体を1つの競合として扱う
-            console.print(
-                "[yellow]サブディレクトリが見つかりません。"
-                "ディレクトリ全体を1つの競合として分析します。[/yellow]"
+        # 採点基準は動画分析のプロンプトに含まれるため、キャッシュして再実行時も同じものを使う
+        # （毎回生成し直すと動画分析のキャッシュが一切ヒットしなくなる）
+        scoring_criteria = None
+        if self.gen_cache is not None:
+            scoring_criteria = self.gen_cache.get(
+                "chapter2/scoring_criteria", scoring_prompt["user"], scoring_prompt.get("system")
             )
-            competitor_dirs = [video_dir]
 
-        console.print(f"\n{len(competitor_dirs)} 社の競合を検出しました")
+        # フレーム抽出（ffmpeg の CPU 処理）は採点基準の生成（API の待ち時間）と並行して先に始めておく
+        # （採点基準がキャッシュ済みなら分析プロンプトが確定しているため、分析済みの動画は抽出しない）
+        extract_executor = ThreadPoolExecutor(max_workers=self.extract_workers)
+        frames_futures = [
+            extract_executor.submit(self._prefetch_frames, d, scoring_criteria)
+            for d in competitor_dirs
+        ]
+        extract_executor.shutdown(wait=False)
+
+        if scoring_criteria is None:
+            scoring_criteria = self.claude.generate_text(
+                prompt=scoring_prompt["user"],
+                system_prompt=scoring_prompt.get("system"),
+                temperature=scoring_prompt.get("temperature", 0.5),
+                max_tokens=scoring_prompt.get("max_tokens", 5000),
+            )
+            if self.gen_cache is not None:
+                self.gen_cache.set(
+                    "chapter2/scoring_criteria",
+                    scoring_prompt["user"],
+                    scoring_criteria,
+                    scoring_prompt.get("system"),
+                )
+        self.scoring_criteria = scoring_criteria
+        console.print("  [green]採点基準を生成しました[/green]")
 
-        # 3. 各競合の動画を分析
-        all_analyses: List[Dict[str, Any]] = []
-        for competitor_dir in competitor_dirs:
-            competitor_name = competitor_dir.name
-            result = self.analyze_competitor(competitor_dir, competitor_name)
-            all_analyses.append(result)
+        # 3. 各競合の動画を並列に分析（進捗表示は1つを共有する）
+        with Progress() as progress:
+            with ThreadPoolExecutor(max_workers=self.competitor_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self.analyze_competitor, d, d.name, progress, frames_future
+                    )
+                    for d, frames_future in zip(competitor_dirs, frames_futures)
+                ]
+                all_analyses: List[Dict[str, Any]] = [f.result() for f in futures]
 
         # 4. 横断分析（鉄則抽出）
         rules = self.cross_analysis(all_analyses)
@@ -378,8 +813,7 @@ class AnalysisAutomation:
             "rules": rules,
         }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(output_path, result)
 
         console.print(f"\n[dim]結果を保存しました: {output_path}[/dim]")
         console.print(
@@ -7,11 +7,14 @@ Chapter 3: コンテンツ量産の自動化
 - 音声生成（ElevenLabs）
 """
 
-import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
+import anthropic
 import click
 from rich.console import Console
 from rich.progress import Progress
@@ -22,6 +25,7 @@ from sns_automation.utils import (
     ClaudeAPI,
     SheetsAPI,
     ElevenLabsAPI,
+    GenCache,
     load_config,
     load_prompt,
     ScriptLinter,
@@ -31,10 +35,79 @@ from sns_automation.utils import (
     error_helpers,
 )
 from sns_automation.utils.config import get_spreadsheet_id, get_sheet_name
+from sns_automation.utils.json_io import read_json, write_json
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# 同時に生成する台本数のデフォルト
+DEFAULT_SCRIPT_WORKERS = 4
+
+# 同時に生成する音声数のデフォルト（ElevenLabsの同時リクエスト上限に合わせる）
+DEFAULT_AUDIO_WORKERS = 4
+
+# 企画生成・台本生成で共有するペルソナとPainの前置き
+# （システムプロンプトの先頭に置き、プロンプトキャッシュで再利用する）
+PERSONA_CONTEXT_TEMPLATE = (
+    "以下は本プロジェクトのターゲットペルソナと、その脳内独り言（Pain）です。\n"
+    "以降の指示はすべてこのペルソナとPainを前提に回答してください。\n\n"
+    "【ペルソナ】\n{persona}\n\n"
+    "【Pain（悩み・不安・フラストレーション）】\n{pains}"
+)
+
+PERSONA_REFERENCE = "（冒頭の【ペルソナ】を参照）"
+PAINS_REFERENCE = "（冒頭の【Pain】を参照）"
+
+# 1回の企画生成で得る企画数（idea_generation プロンプトの指定と合わせる）
+IDEAS_PER_ROUND = 20
+
+# テーブル形式でない応答から「1. タイトル」「1) タイトル」形式の企画を拾う
+_NUMBERED_IDEA_RE = re.compile(r"^(\d{1,2})[.)](.*)$")
+
+# 企画テーブル・台本テーブルで読み飛ばす行（区切り行・ヘッダー行）の先頭
+_IDEA_TABLE_SKIP_PREFIXES = ("|---|", "| No |")
+_SCRIPT_TABLE_SKIP_PREFIXES = ("|---", "| 時間")
+
+# ナレーション全文セクションの見出しとコードブロックの区切り
+NARRATION_HEADING = "ナレーション全文"
+CODE_FENCE = "```"
+
+
+class IdeaSelection(click.ParamType):
+    """「1,3,5」形式の企画番号、または「all」を検証・変換するclick用の型"""
+
+    name = "idea_selection"
+
+    _FORMAT_RE = re.compile(r"\s*\d+\s*(?:,\s*\d+\s*)*")
+
+    def __init__(self, max_n: int):
+        """
+        初期化
+
+        Args:
+            max_n: 選択可能な最大番号
+        """
+        self.max_n = max_n
+
+    def convert(self, value: Any, param: Any, ctx: Any) -> List[int]:
+        """入力文字列を0始まりのインデックスリストに変換（不正な場合は再入力を促す）"""
+        if isinstance(value, list):
+            return value
+
+        value = value.strip()
+        if value.lower() == "all":
+            return list(range(self.max_n))
+
+        if not self._FORMAT_RE.fullmatch(value):
+            self.fail("数字をカンマ区切りで入力してください（例: 1,3,5）", param, ctx)
+
+        numbers = [int(n) for n in value.split(",")]
+        out_of_range = [n for n in numbers if n < 1 or n > self.max_n]
+        if out_of_range:
+            self.fail(f"番号 {out_of_range[0]} は範囲外です（1-{self.max_n}）", param, ctx)
+
+        return [n - 1 for n in numbers]
+
 
 class ContentAutomation:
     """Chapter 3: コンテンツ量産の自動化クラス"""
@@ -71,6 +144,25 @@ class ContentAutomation:
 
         self.state_manager = StateManager(project_name)
         self.project_name = project_name
+        concurrency = (config or {}).get("concurrency", {})
+        self.script_workers = concurrency.get("script_workers", DEFAULT_SCRIPT_WORKERS)
+        self.audio_workers = concurrency.get("audio_workers", DEFAULT_AUDIO_WORKERS)
+        # 台本の初稿を Message Batches API でまとめて生成する（自動改善は通常API）
+        self.use_batch_api = (config or {}).get("content", {}).get("use_batch_api", False)
+        # 出力ディレクトリ（Chapter 1/2 の結果読み込み・Chapter 3 の保存先）
+        self.output_dir = Path((config or {}).get("paths", {}).get("output", "./output"))
+        self.audio_dir = self.output_dir / "audio"
+        # 直近に組み立てたペルソナとPainの前置き（戦略データ, 前置きテキスト）
+        self._persona_context_memo: Optional[Tuple[Dict[str, Any], str]] = None
+        # 結果JSONを人が読みやすいようにインデントして保存するか（デバッグ用）
+        self.pretty_json = (config or {}).get("debug", {}).get("pretty_json", False)
+        # 再実行時に同じ企画・台本の生成を省略するための生成キャッシュ
+        # （Streamlit環境ではローカルに保存しない）
+        self.gen_cache = (
+            GenCache()
+            if config is not None and config.get("cache", {}).get("enabled", True)
+            else None
+        )
 
     def _load_chapter_result(self, chapter: int) -> Dict[str, Any]:
         """
@@ -85,8 +177,7 @@ class ContentAutomation:
         Raises:
             FileNotFoundError: 結果ファイルが見つからない場合
         """
-        output_dir = Path(self.config.get("paths", {}).get("output", "./output"))
-        result_path = output_dir / f"chapter{chapter}_result.json"
+        result_path = self.output_dir / f"chapter{chapter}_result.json"
 
         if not result_path.exists():
             raise FileNotFoundError(
@@ -94,8 +185,7 @@ class ContentAutomation:
                 f"先に Chapter {chapter} を実行してください。"
             )
 
-        with open(result_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(result_path)
 
     def generate_ideas(
         self, strategy_data: Dict[str, Any]
@@ -111,42 +201,59 @@ class ContentAutomation:
         """
         console.print(Panel("Step 1: 企画の生成", style="bold cyan"))
 
-        # Chapter 1 のデータを整形
-        persona = strategy_data.get("persona", {})
-        if isinstance(persona, dict):
-            persona_text = persona.get("raw_text", "未設定")
-        else:
-            persona_text = str(persona)
+        # ペルソナとPainはラウンド間で共通のため、キャッシュされる前置きに入れる
+        persona_context = self._persona_context(strategy_data)
 
-        pains_list = strategy_data.get("pains", [])
-        pains = "\n".join(f"{i}. {p}" for i, p in enumerate(pains_list, 1))
+        # プロンプトはラウンド間で変わらないため一度だけ展開する
+        prompt_data = load_prompt(
+            chapter="chapter3",
+            prompt_name="idea_generation",
+            variables={
+                "persona": PERSONA_REFERENCE,
+                "pains": PAINS_REFERENCE,
+            },
+        )
+        cache_system_key = self._cache_system_key(prompt_data, persona_context)
+        analyzer = IdeaAnalyzer()
 
         all_ideas = []  # 累積企画リスト
+        # 傾向分析用に all_ideas と同じ順のタイトル・要約を保持する
+        titles: List[str] = []
+        summaries: List[str] = []
         round_num = 1   # 生成ラウンド番号
+        refresh = False  # 作り直し時はキャッシュを使わない
 
         while True:
             # 現在のラウンドの開始番号
-            start_no = (round_num - 1) * 20 + 1
-            end_no = round_num * 20
+            start_no = (round_num - 1) * IDEAS_PER_ROUND + 1
+            end_no = round_num * IDEAS_PER_ROUND
 
             console.print(f"\n[bold yellow]企画 {start_no}-{end_no} を生成中...[/bold yellow]")
 
-            prompt_data = load_prompt(
-                chapter="chapter3",
-                prompt_name="idea_generation",
-                variables={
-                    "persona": persona_text,
-                    "pains": pains,
-                },
-            )
-
-            console.print("[dim]Claude APIで企画を生成中...[/dim]")
-            response = self.claude.generate_text(
-                prompt=prompt_data["user"],
-                system_prompt=prompt_data.get("system"),
-                temperature=prompt_data.get("temperature", 0.9),
-                max_tokens=prompt_data.get("max_tokens", 8000),
-            )
+            # 初回ラウンドのみキャッシュを使う（追加生成は毎回新しい企画が必要）
+            use_cache = self.gen_cache is not None and round_num == 1
+            response = None
+            if use_cache and not refresh:
+                response = self.gen_cache.get(
+                    "chapter3/idea_generation", prompt_data["user"], cache_system_key
+                )
+                if response is not None:
+                    console.print("[dim]前回の生成結果をキャッシュから読み込みました[/dim]")
+
+            if response is None:
+                console.print("[dim]Claude APIで企画を生成中...[/dim]")
+                response = self.claude.generate_text(
+                    prompt=prompt_data["user"],
+                    system_prompt=prompt_data.get("system"),
+                    temperature=prompt_data.get("temperature", 0.9),
+                    max_tokens=prompt_data.get("max_tokens", 8000),
+                    cache_system=True,
+                    shared_context=persona_context,
+                )
+                if use_cache:
+                    self.gen_cache.set(
+                        "chapter3/idea_generation", prompt_data["user"], response, cache_system_key
+                    )
 
             # レスポンスをパースして企画リストを構築
             new_ideas = self._parse_ideas(response)
@@ -157,16 +264,23 @@ class ContentAutomation:
 
             # 累積リストに追加
             all_ideas.extend(new_ideas)
+            titles.extend(idea.get("title", "") for idea in new_ideas)
+            summaries.extend(idea.get("summary", "") for idea in new_ideas)
+            total = len(all_ideas)
 
-            # 全ての企画を表示（累積）
-            console.print(f"\n[bold green]合計 {len(all_ideas)}本の企画を生成しました:[/bold green]\n")
+            # 今回のラウンドで生成した企画のみ表示する
+            # （前のラウンドの企画は表示済みのため、累積の一覧は描画し直さない）
+            console.print(f"\n[bold green]合計 {total}本の企画を生成しました:[/bold green]\n")
 
-            table = Table(title=f"企画一覧（合計{len(all_ideas)}投稿分）", show_lines=True)
+            table = Table(
+                title=f"企画一覧（No.{start_no}〜{start_no + len(new_ideas) - 1} / 合計{total}投稿分）",
+                show_lines=True,
+            )
             table.add_column("No", style="bold cyan", width=4, justify="center")
             table.add_column("企画タイトル（フック）", style="yellow", width=40)
             table.add_column("狙い・内容の要約", style="green", width=50)
 
-            for idea in all_ideas:
+            for idea in new_ideas:
                 table.add_row(
                     idea.get("no", ""),
                     idea.get("title", ""),
@@ -176,8 +290,7 @@ class ContentAutomation:
             console.print(table)
 
             # 企画の傾向分析
-            analyzer = IdeaAnalyzer()
-            analysis = analyzer.analyze_ideas(all_ideas)
+            analysis = analyzer.analyze_arrays(titles, summaries)
             analyzer.show_analysis_report(analysis)
 
             # バランスが悪い場合は作り直しを提案
@@ -191,11 +304,14 @@ class ContentAutomation:
                 if regenerate_choice == 2:
                     console.print("\n[cyan]新しい企画を生成します...[/cyan]\n")
                     all_ideas = []  # リセット
+                    titles = []
+                    summaries = []
+                    refresh = True
                     continue
 
             # 次のアクションを確認
             console.print("\n[bold yellow]次のアクションを選んでください:[/bold yellow]")
-            console.print(f"  [1] この{len(all_ideas)}案から選択する")
+            console.print(f"  [1] この{total}案から選択する")
             console.print(f"  [2] 追加で20個生成（{end_no + 1}-{end_no + 20}を生成）")
 
             action = click.prompt("番号を入力", type=int, default=1)
@@ -209,7 +325,9 @@ class ContentAutomation:
 
         return all_ideas
 
-    def _parse_ideas(self, response: str) -> List[Dict[str, Any]]:
+    def _parse_ideas(
+        self, response: str, expected_count: Optional[int] = IDEAS_PER_ROUND
+    ) -> List[Dict[str, Any]]:
         """
         Claude APIのレスポンスから企画情報をパースする
 
@@ -220,83 +338,86 @@ class ContentAutomation:
 
         Args:
             response: APIレスポンステキスト
+            expected_count: 想定する企画数（テーブルからこの数だけ取れたら、
+                表の後ろに続く解説文は読まずに終了する。None で全行を読む）
 
         Returns:
             企画リスト
         """
         ideas: List[Dict[str, Any]] = []
+        # テーブルが見つからなかった場合に使う番号付きリストの企画（同じ走査で集める）
+        listed_ideas: List[Dict[str, Any]] = []
 
-        for line in response.split("\n"):
+        for line in response.splitlines():
             line = line.strip()
 
             # 空行またはヘッダー行・区切り行をスキップ
-            if not line or line.startswith("|---|") or line.startswith("| No |"):
+            if not line or line.startswith(_IDEA_TABLE_SKIP_PREFIXES):
                 continue
 
             # テーブル行をパース（| No | タイトル | 要約 |）
-            if line.startswith("|") and line.endswith("|"):
+            if line.startswith("|"):
+                if not line.endswith("|"):
+                    continue
                 parts = [p.strip() for p in line.split("|")[1:-1]]  # 先頭と末尾の空文字を除外
 
-                if len(parts) >= 3:
-                    try:
-                        no = parts[0].strip()
-                        # 番号が整数であることを確認（ヘッダー行を除外）
-                        int(no)
-
-                        title = parts[1].strip()
-                        summary = parts[2].strip()
-
-                        # 例示（（例：...）を除外）
-                        if title.startswith("（例："):
-                            continue
-
-                        ideas.append({
-                            "no": no,
-                            "title": title,
-                            "summary": summary,
-                            "raw_text": line,
-                        })
-                    except ValueError:
-                        # 番号でない行はスキップ
-                        continue
+                # 番号が整数であることを確認（ヘッダー行を除外）
+                if len(parts) < 3 or not parts[0].lstrip("+-").isdigit():
+                    continue
+
+                title = parts[1]
+                # 例示（（例：...）を除外）
+                if title.startswith("（例："):
+                    continue
+
+                ideas.append({
+                    "no": parts[0],
+                    "title": title,
+                    "summary": parts[2],
+                    "raw_text": line,
+                })
+                if expected_count is not None and len(ideas) >= expected_count:
+                    break
+                continue
+
+            # テーブルが見つかっていれば番号付きリストは不要
+            if ideas:
+                continue
+
+            # "1. タイトル" または "1) タイトル" の形式をパース
+            match = _NUMBERED_IDEA_RE.match(line)
+            if match and 1 <= int(match.group(1)) <= IDEAS_PER_ROUND:
+                listed_ideas.append({
+                    "no": str(int(match.group(1))),
+                    "title": match.group(2).strip(),
+                    "summary": "",
+                    "raw_text": line,
+                })
 
         # パースで取れなかった場合、番号付きリストとしてフォールバック
         if not ideas:
             logger.warning("テーブルパースに失敗。フォールバックパースを実行します。")
-            for line in response.split("\n"):
-                line = line.strip()
-                if not line:
-                    continue
-
-                # "1. タイトル" または "1) タイトル" の形式をパース
-                for i in range(1, 21):
-                    for prefix in [f"{i}.", f"{i})"]:
-                        if line.startswith(prefix):
-                            title = line[len(prefix):].strip()
-                            ideas.append({
-                                "no": str(i),
-                                "title": title,
-                                "summary": "",
-                                "raw_text": line,
-                            })
-                            break
+            ideas = listed_ideas
 
         return ideas
 
-    def generate_script(
-        self, idea: Dict[str, Any], strategy_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    def _persona_context(self, strategy_data: Dict[str, Any]) -> str:
         """
-        台本を生成（自動改善ループ付き）
+        企画生成・台本生成で共有するペルソナとPainの前置きテキストを組み立てる
+
+        同じ戦略データに対しては最初に組み立てたテキストを使い回す
+        （台本ごとに組み立て直さず、プロンプトキャッシュの前置きも常に同一になる）。
 
         Args:
-            idea: 企画情報
             strategy_data: Chapter 1の戦略データ
 
         Returns:
-            台本辞書
+            システムプロンプト先頭に置く前置きテキスト
         """
-        # Chapter 1のデータを整形
+        memo = self._persona_context_memo
+        if memo is not None and memo[0] is strategy_data:
+            return memo[1]
+
         persona = strategy_data.get("persona", {})
         if isinstance(persona, dict):
             persona_text = persona.get("raw_text", "未設定")
@@ -306,35 +427,131 @@ class ContentAutomation:
         pains_list = strategy_data.get("pains", [])
         pains = "\n".join(f"{i}. {p}" for i, p in enumerate(pains_list, 1))
 
-        # 企画情報を整形
-        idea_title = idea.get("title", "")
-        idea_summary = idea.get("summary", "")
+        context = PERSONA_CONTEXT_TEMPLATE.format(persona=persona_text, pains=pains)
+        self._persona_context_memo = (strategy_data, context)
+        return context
 
-        prompt_data = load_prompt(
+    @staticmethod
+    def _cache_system_key(prompt_data: Dict[str, Any], persona_context: str) -> str:
+        """
+        生成キャッシュのキーに使うシステム側テキストを組み立てる
+
+        Args:
+            prompt_data: load_prompt() の返り値
+            persona_context: ペルソナとPainの前置き
+
+        Returns:
+            前置きとシステムプロンプトを連結したテキスト
+        """
+        return "\n\n".join(
+            text for text in (persona_context, prompt_data.get("system")) if text
+        )
+
+    def _script_prompt(
+        self, idea: Dict[str, Any], strategy_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        台本生成用のプロンプトを作成
+
+        Args:
+            idea: 企画情報
+            strategy_data: Chapter 1の戦略データ
+
+        Returns:
+            load_prompt が返すプロンプト辞書
+            （ペルソナとPainは _persona_context の前置きを参照させる）
+        """
+        return load_prompt(
             chapter="chapter3",
             prompt_name="script_generation",
             variables={
-                "persona": persona_text,
-                "pains": pains,
-                "idea_title": idea_title,
-                "idea_summary": idea_summary,
+                "persona": PERSONA_REFERENCE,
+                "pains": PAINS_REFERENCE,
+                "idea_title": idea.get("title", ""),
+                "idea_summary": idea.get("summary", ""),
             },
         )
 
+    def generate_script(
+        self,
+        idea: Dict[str, Any],
+        strategy_data: Dict[str, Any],
+        draft: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        台本を生成（自動改善ループ付き）
+
+        Args:
+            idea: 企画情報
+            strategy_data: Chapter 1の戦略データ
+            draft: 生成済みの初稿（バッチ生成時。指定時は1回目の生成を省略する）
+
+        Returns:
+            台本辞書
+        """
+        script, _ = self._generate_script_with_lint(idea, strategy_data, draft)
+        return script
+
+    def _generate_script_with_lint(
+        self,
+        idea: Dict[str, Any],
+        strategy_data: Dict[str, Any],
+        draft: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        台本を生成し、最終稿の品質チェック結果と合わせて返す
+
+        Args:
+            idea: 企画情報
+            strategy_data: Chapter 1の戦略データ
+            draft: 生成済みの初稿（バッチ生成時。指定時は1回目の生成を省略する）
+
+        Returns:
+            (台本辞書, 最終稿の品質チェック結果) のタプル
+            （品質チェック結果は run() での表示用で、台本辞書には含めない）
+        """
+        idea_title = idea.get("title", "")
+        prompt_data = self._script_prompt(idea, strategy_data)
+        persona_context = self._persona_context(strategy_data)
+
+        # 同じ企画の台本が生成済みなら、自動改善後の最終稿を初稿として使う
+        # （修正プロンプトは毎回内容が変わるためキャッシュしない）
+        cache_prompt = prompt_data["user"]
+        cache_system_key = self._cache_system_key(prompt_data, persona_context)
+        if draft is None and self.gen_cache is not None:
+            draft = self.gen_cache.get("chapter3/script_generation", cache_prompt, cache_system_key)
+
         linter = ScriptLinter()
         max_attempts = 3
         attempt = 0
+        # 自動改善は会話の続きとして依頼する（元の台本はアシスタント応答として渡し、
+        # 前回までの会話をプロンプトキャッシュで再利用する）
+        messages: List[Dict[str, str]] = [{"role": "user", "content": prompt_data["user"]}]
 
         while attempt < max_attempts:
             attempt += 1
 
             # 台本を生成
-            response = self.claude.generate_text(
-                prompt=prompt_data["user"],
-                system_prompt=prompt_data.get("system"),
-                temperature=prompt_data.get("temperature", 0.7),
-                max_tokens=prompt_data.get("max_tokens", 5000),
-            )
+            if attempt == 1 and draft is not None:
+                response = draft
+            elif attempt == 1:
+                response = self.claude.generate_text(
+                    prompt=prompt_data["user"],
+                    system_prompt=prompt_data.get("system"),
+                    temperature=prompt_data.get("temperature", 0.7),
+                    max_tokens=prompt_data.get("max_tokens", 5000),
+                    cache_system=True,
+                    shared_context=persona_context,
+                )
+            else:
+                response = self.claude.generate_conversation(
+                    messages=messages,
+                    system_prompt=prompt_data.get("system"),
+                    temperature=prompt_data.get("temperature", 0.7),
+                    max_tokens=prompt_data.get("max_tokens", 5000),
+                    cache_system=True,
+                    shared_context=persona_context,
+                )
 
             # ナレーション全文を抽出
             narration = self._extract_narration(response)
@@ -348,35 +565,39 @@ class ContentAutomation:
             # エラーがなければ完了
             if lint_result["error_count"] == 0:
                 if attempt > 1:
-                    console.print(f"  [green]✅ 自動改善完了（試行{attempt}回目）[/green]")
+                    console.print(f"  [green]✅ 自動改善完了（{idea_title}・試行{attempt}回目）[/green]")
                 break
 
             # 最大試行回数に達した場合は警告して終了
             if attempt >= max_attempts:
-                console.print(f"  [yellow]⚠️  最大試行回数（{max_attempts}回）に達しました[/yellow]")
+                console.print(f"  [yellow]⚠️  最大試行回数（{max_attempts}回）に達しました: {idea_title}[/yellow]")
                 console.print(f"  [yellow]   エラー: {lint_result['error_count']}件、警告: {lint_result['warning_count']}件[/yellow]")
                 break
 
             # エラーがある場合は修正を試みる
-            console.print(f"  [yellow]🔄 品質エラー検出（試行{attempt}回目）: {lint_result['error_count']}件[/yellow]")
+            console.print(f"  [yellow]🔄 品質エラー検出（{idea_title}・試行{attempt}回目）: {lint_result['error_count']}件[/yellow]")
             console.print(f"  [dim]   自動修正を試みます...[/dim]")
 
             # エラーメッセージを収集
             error_messages = []
             for error in lint_result["errors"][:3]:  # 最初の3件のみ
-                error_messages.append(f"- [{error['context']}] {error['message']}")
+                error_messages.append(f"- [{error.context}] {error.message}")
 
-            # 修正プロンプトを作成
+            # 修正プロンプトを作成（台本本文は直前のアシスタント応答として会話に含まれる）
             fix_prompt = (
-                f"以下の台本に品質エラーがあります。修正してください。\n\n"
+                f"上記の台本に品質エラーがあります。修正した台本を全文出力してください。\n\n"
                 f"【エラー内容】\n" + "\n".join(error_messages) + "\n\n"
-                f"【元の台本】\n{response}\n\n"
-                f"【修正後の台本】\n"
                 f"※元のフォーマット（Midjourneyプロンプト、台本表、ナレーション全文）を維持してください。"
             )
 
             # 修正版を生成
-            prompt_data["user"] = fix_prompt
+            messages.append({"role": "assistant", "content": response})
+            messages.append({"role": "user", "content": fix_prompt})
+
+        # 品質チェックに合格した台本だけをキャッシュする
+        # （不合格の台本を初稿に使うと、再実行時も同じエラーから自動改善をやり直すことになる）
+        if self.gen_cache is not None and lint_result["passed"]:
+            self.gen_cache.set("chapter3/script_generation", cache_prompt, response, cache_system_key)
 
         script = {
             "idea_title": idea_title,
@@ -386,10 +607,54 @@ class ContentAutomation:
                 "error_count": lint_result["error_count"],
                 "warning_count": lint_result["warning_count"],
                 "attempts": attempt,
-            }
+            },
         }
 
-        return script
+        return script, lint_result
+
+    def generate_script_drafts(
+        self, ideas: List[Dict[str, Any]], strategy_data: Dict[str, Any]
+    ) -> List[Optional[str]]:
+        """
+        Message Batches API で台本の初稿をまとめて生成
+
+        通常の呼び出しより低コストだが、結果が返るまで数分かかることがある。
+
+        Args:
+            ideas: 企画情報のリスト
+            strategy_data: Chapter 1の戦略データ
+
+        Returns:
+            企画順の初稿リスト（生成に失敗した企画は None）
+        """
+        persona_context = self._persona_context(strategy_data)
+        drafts: List[Optional[str]] = [None] * len(ideas)
+        requests = []
+        for i, idea in enumerate(ideas):
+            prompt_data = self._script_prompt(idea, strategy_data)
+            # 生成済みの台本はバッチに含めない
+            if self.gen_cache is not None:
+                drafts[i] = self.gen_cache.get(
+                    "chapter3/script_generation",
+                    prompt_data["user"],
+                    self._cache_system_key(prompt_data, persona_context),
+                )
+                if drafts[i] is not None:
+                    continue
+            requests.append({
+                "custom_id": f"idea_{i:03d}",
+                "prompt": prompt_data["user"],
+                "system_prompt": prompt_data.get("system"),
+                "temperature": prompt_data.get("temperature", 0.7),
+                "max_tokens": prompt_data.get("max_tokens", 5000),
+                "cache_system": True,
+                "shared_context": persona_context,
+            })
+
+        results = self.claude.generate_message_batch(requests) if requests else {}
+        for custom_id, text in results.items():
+            drafts[int(custom_id[len("idea_"):])] = text
+        return drafts
 
     def _extract_narration(self, script_text: str) -> str:
         """
@@ -402,41 +667,40 @@ class ContentAutomation:
             ナレーション全文
         """
         narration_lines: List[str] = []
+        # ナレーション全文セクションがない場合に使うテーブルのナレーション列（同じ走査で集める）
+        table_narrations: List[str] = []
         in_narration_section = False
         in_code_block = False
 
-        for line in script_text.split("\n"):
+        for line in script_text.splitlines():
             stripped = line.strip()
+            first = stripped[:1]
 
-            # 「ナレーション全文」セクションの検出
-            if "ナレーション全文" in stripped and stripped.startswith("#"):
+            if first == "|":
+                if not stripped.startswith(_SCRIPT_TABLE_SKIP_PREFIXES):
+                    parts = [p for p in (p.strip() for p in stripped.split("|")) if p]
+                    if len(parts) >= 2:
+                        table_narrations.append(parts[1])
+            elif first == "#" and NARRATION_HEADING in stripped:
+                # 「ナレーション全文」セクションの検出
                 in_narration_section = True
                 continue
 
             if in_narration_section:
-                if stripped.startswith("```") and not in_code_block:
-                    in_code_block = True
-                    continue
-                if stripped.startswith("```") and in_code_block:
-                    in_code_block = False
-                    in_narration_section = False
+                # コードブロックの開始・終了（終了したらセクションも終わり）
+                if stripped.startswith(CODE_FENCE):
+                    if in_code_block:
+                        in_narration_section = False
+                    in_code_block = not in_code_block
                     continue
                 if in_code_block:
                     narration_lines.append(line)
 
         narration = "\n".join(narration_lines).strip()
 
-        # ナレーション全文セクションが見つからない場合、テーブルからナレーション列を抽出
+        # ナレーション全文セクションが見つからない場合、テーブルのナレーション列を使う
         if not narration:
-            for line in script_text.split("\n"):
-                line = line.strip()
-                if line.startswith("|") and not line.startswith("|---") and not line.startswith("| 時間"):
-                    parts = [p.strip() for p in line.split("|")]
-                    parts = [p for p in parts if p]
-                    if len(parts) >= 2:
-                        narration_lines.append(parts[1])
-
-            narration = " ".join(narration_lines).strip()
+            narration = " ".join(table_narrations).strip()
 
         return narration
 
@@ -578,41 +842,12 @@ class ContentAutomation:
             console.print("[bold red]企画の生成に失敗しました。[/bold red]")
             return {}
 
-        # 企画タイトル表に書き込み
-        try:
-            self.write_ideas_to_sheet(ideas)
-        except Exception as e:
-            console.print(f"[bold red]企画タイトル表への書き込みに失敗しました: {e}[/bold red]")
-            console.print("[yellow]処理は続行します。[/yellow]")
-
         # Step 2: ユーザーに採用する企画を選択させる
         console.print(Panel("Step 2: 企画の選択", style="bold cyan"))
         console.print("[bold yellow]採用する企画の番号をカンマ区切りで入力してください[/bold yellow]")
         console.print(f"（例: 1,3,5,10 / 全て選択する場合は all）\n")
 
-        while True:
-            selection = click.prompt("企画番号を入力")
-            selection = selection.strip()
-
-            if selection.lower() == "all":
-                selected_indices = list(range(len(ideas)))
-                break
-
-            try:
-                selected_indices = []
-                for part in selection.split(","):
-                    idx = int(part.strip()) - 1
-                    if 0 <= idx < len(ideas):
-                        selected_indices.append(idx)
-                    else:
-                        console.print(f"[red]番号 {idx + 1} は範囲外です（1-{len(ideas)}）[/red]")
-                        selected_indices = []
-                        break
-
-                if selected_indices:
-                    break
-            except ValueError:
-                console.print("[red]数字をカンマ区切りで入力してください（例: 1,3,5）[/red]")
+        selected_indices = click.prompt("企画番号を入力", type=IdeaSelection(max_n=len(ideas)))
 
         selected_ideas = [ideas[i] for i in selected_indices]
         console.print(f"\n[bold green]{len(selected_ideas)}本の企画を選択しました:[/bold green]")
@@ -622,24 +857,35 @@ class ContentAutomation:
         # Step 3: 選択された企画から台本を生成
         console.print(Panel("Step 3: 台本の生成", style="bold cyan"))
 
-        scripts: List[Dict[str, Any]] = []
-        linter = ScriptLinter()
+        # 初稿はバッチでまとめて生成し、自動改善のみ通常APIで行う
+        drafts: List[Optional[str]] = [None] * len(selected_ideas)
+        if self.use_batch_api:
+            try:
+                with console.status("台本の初稿をバッチ生成中（数分かかることがあります）..."):
+                    drafts = self.generate_script_drafts(selected_ideas, strategy_data)
+            except anthropic.APIError as e:
+                logger.warning("バッチAPIが利用できないため、台本ごとに生成します: %s", e)
+
+        # 台本ごとのClaude呼び出しは独立しているため並列に生成する
+        # （結果は完了順に受け取り、選択した企画の順に並べる）
+        results: List[Optional[Dict[str, Any]]] = [None] * len(selected_ideas)
         total_errors = 0
         total_warnings = 0
 
-        with Progress() as progress:
+        with Progress() as progress, ThreadPoolExecutor(
+            max_workers=max(1, min(self.script_workers, len(selected_ideas)))
+        ) as executor:
             task = progress.add_task(
                 "台本を生成中...",
                 total=len(selected_ideas),
             )
-            for idea in selected_ideas:
-                script = self.generate_script(idea, strategy_data)
-
-                # 品質チェック
-                lint_result = linter.check_script(
-                    script_text=script.get("full_script", ""),
-                    narration=script.get("narration", ""),
-                )
+            futures = {
+                executor.submit(self._generate_script_with_lint, idea, strategy_data, draft): i
+                for i, (idea, draft) in enumerate(zip(selected_ideas, drafts))
+            }
+            for future in as_completed(futures):
+                # 品質チェック（台本生成時に最終稿に対して実行済みの結果を使う）
+                script, lint_result = future.result()
 
                 # エラー・警告をカウント
                 total_errors += lint_result["error_count"]
@@ -649,16 +895,19 @@ class ContentAutomation:
                 if lint_result["error_count"] > 0:
                     console.print(f"\n[bold red]⚠️  台本にエラーがあります: {script.get('idea_title', '')}[/bold red]")
                     for error in lint_result["errors"]:
-                        console.print(f"  ❌ [{error['context']}] {error['message']}")
-                        console.print(f"     💡 {error['suggestion']}")
+                        console.print(f"  ❌ [{error.context}] {error.message}")
+                        console.print(f"     💡 {error.suggestion}")
                 elif lint_result["warning_count"] > 0:
                     console.print(f"\n[bold yellow]⚠️  台本に警告があります: {script.get('idea_title', '')}[/bold yellow]")
                     for warning in lint_result["warnings"][:2]:  # 最初の2件のみ表示
-                        console.print(f"  ⚠️  [{warning['context']}] {warning['message']}")
+                        console.print(f"  ⚠️  [{warning.context}] {warning.message}")
 
-                scripts.append(script)
+                results[futures[future]] = script
                 progress.update(task, advance=1)
 
+        # future.result() は失敗時に例外を送出するため、ここでは全要素が埋まっている
+        scripts = [script for script in results if script is not None]
+
         console.print(f"\n[bold green]{len(scripts)}本の台本を生成しました[/bold green]")
         if total_errors > 0:
             console.print(f"[bold red]品質チェック: {total_errors}件のエラー、{total_warnings}件の警告[/bold red]")
@@ -680,43 +929,58 @@ class ContentAutomation:
 
         # Step 4: 音声の生成
         console.print(Panel("Step 4: 音声の生成（ElevenLabs）", style="bold cyan"))
-        output_dir = Path(self.config.get("paths", {}).get("output", "./output"))
-        audio_dir = output_dir / "audio"
+        audio_dir = self.audio_dir
         audio_dir.mkdir(parents=True, exist_ok=True)
 
-        audio_paths: List[str] = []
-        with Progress() as progress:
+        # 音声生成はHTTPの待ち時間が大半のため並列に実行する
+        # （結果は完了順に受け取り、台本の順に並べる）
+        audio_paths: List[str] = [""] * len(scripts)
+        with Progress() as progress, ThreadPoolExecutor(
+            max_workers=max(1, min(self.audio_workers, len(scripts)))
+        ) as executor:
             task = progress.add_task(
                 "音声を生成中...",
                 total=len(scripts),
             )
-            for i, script in enumerate(scripts):
+            futures = {
+                executor.submit(
+                    self.generate_audio_from_script,
+                    script,
+                    audio_dir / f"script_{i + 1:03d}.mp3",
+                ): i
+                for i, script in enumerate(scripts)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
                 audio_filename = f"script_{i + 1:03d}.mp3"
-                audio_path = audio_dir / audio_filename
 
                 try:
-                    generated_path = self.generate_audio_from_script(script, audio_path)
-                    audio_paths.append(str(generated_path))
+                    audio_paths[i] = str(future.result())
                     console.print(f"  [green]音声生成完了: {audio_filename}[/green]")
                 except Exception as e:
-                    logger.error("音声生成に失敗 (企画: %s): %s", script.get("idea_title", ""), e)
+                    logger.error("音声生成に失敗 (企画: %s): %s", scripts[i].get("idea_title", ""), e)
                     console.print(f"  [red]音声生成失敗: {audio_filename} - {e}[/red]")
-                    audio_paths.append("")
 
                 progress.update(task, advance=1)
 
         console.print(f"[bold green]{sum(1 for p in audio_paths if p)}本の音声を生成しました[/bold green]")
 
-        # Step 5: 台本表に書き込み
+        # Step 5: 企画タイトル表・台本表に書き込み（1回のバッチ更新で送信）
         try:
-            self.write_scripts_to_sheet(scripts)
+            with self.sheets.begin_batch() if self.sheets is not None else nullcontext():
+                self.write_ideas_to_sheet(ideas)
+                self.write_scripts_to_sheet(scripts)
         except Exception as e:
-            console.print(f"[bold red]台本表への書き込みに失敗しました: {e}[/bold red]")
+            console.print(f"[bold red]スプレッドシートへの書き込みに失敗しました: {e}[/bold red]")
             console.print("[yellow]JSONファイルへの保存は続行します。[/yellow]")
 
         # Step 6: 結果をJSONファイルに保存
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / "chapter3_result.json"
+        output_path = self.output_dir / "chapter3_result.json"
+
+        # _rules フィールドを除去（保存時に不要）
+        # 選択した企画は除去済みの企画リストから取り直す
+        ideas = [{k: v for k, v in idea.items() if k != "_rules"} for idea in ideas]
+        selected_ideas = [ideas[i] for i in selected_indices]
 
         result = {
             "ideas": ideas,
@@ -726,14 +990,7 @@ class ContentAutomation:
             "audio_paths": audio_paths,
         }
 
-        # _rules フィールドを除去（保存時に不要）
-        for idea in result["ideas"]:
-            idea.pop("_rules", None)
-        for idea in result["selected_ideas"]:
-            idea.pop("_rules", None)
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(output_path, result, indent=self.pretty_json)
 
         console.print(f"\n[bold green]結果をJSONファイルに保存しました: {output_path}[/bold green]")
 
@@ -4,31 +4,56 @@ SNS Automation CLI
 コマンドラインインターフェース
 """
 
+import functools
+import os
+import shutil
+from typing import Optional
+
 import click
 from pathlib import Path
 
 
 @click.group()
 @click.version_option(version="0.1.0")
-def main():
+@click.option(
+    "--no-config-cache",
+    is_flag=True,
+    help="config.yaml のパース結果のキャッシュを使わずに毎回読み込む",
+)
+def main(no_config_cache: bool):
     """SNS Automation - SNSアカウント構築・運用マニュアル自動化システム"""
-    pass
+    if no_config_cache:
+        # utils.config をここでインポートしないよう、環境変数で伝える
+        os.environ["SNS_AUTOMATION_NO_CONFIG_CACHE"] = "1"
 
 
-@main.command()
-def init():
-    """設定ファイルを初期化"""
-    import shutil
+@functools.lru_cache(maxsize=None)
+def _find_config_example() -> Optional[Path]:
+    """
+    config.yaml.example を探す（カレントディレクトリ → パッケージディレクトリ）
 
+    Returns:
+        見つかったパス（どちらにも無い場合はNone）
+    """
     config_example = Path("config.yaml.example")
-    config_target = Path("config.yaml")
+    if config_example.exists():
+        return config_example
+
+    # パッケージディレクトリから探す
+    package_dir = Path(__file__).parent.parent.parent
+    config_example = package_dir / "config.yaml.example"
+    if config_example.exists():
+        return config_example
+
+    return None
 
-    if not config_example.exists():
-        # パッケージディレクトリから探す
-        package_dir = Path(__file__).parent.parent.parent
-        config_example = package_dir / "config.yaml.example"
 
-    if not config_example.exists():
+def _init_config_file() -> None:
+    """config.yaml.example をカレントディレクトリの config.yaml にコピー"""
+    config_example = _find_config_example()
+    config_target = Path("config.yaml")
+
+    if config_example is None:
         click.echo("config.yaml.example が見つかりません", err=True)
         raise click.Abort()
 
@@ -44,6 +69,12 @@ def init():
     click.echo("2. Google Sheets API の認証情報を配置してください")
 
 
+@main.command()
+def init():
+    """設定ファイルを初期化"""
+    _init_config_file()
+
+
 @main.group()
 def strategy():
     """Chapter 1: 戦略設計"""
@@ -66,6 +97,29 @@ def create(project: str):
         raise click.Abort()
 
 
+@strategy.command()
+@click.argument("inputs_file", type=click.Path(exists=True, dir_okay=False))
+def batch(inputs_file: str):
+    """
+    複数プロジェクトの戦略設計を一括実行（Message Batches API）
+
+    INPUTS_FILE: プロジェクトごとの入力を並べたJSONファイル
+    """
+    from sns_automation.chapter1_strategy import StrategyAutomation
+    from sns_automation.utils import load_config
+    import json
+
+    try:
+        with open(inputs_file, "r", encoding="utf-8") as f:
+            inputs = json.load(f)
+        config = load_config()
+        results = StrategyAutomation.run_batch(config, inputs)
+        click.echo(f"Chapter 1: {len(results)}件の戦略設計が完了しました")
+    except Exception as e:
+        click.echo(f"エラー: {e}", err=True)
+        raise click.Abort()
+
+
 @main.command()
 @click.argument("video_dir", type=click.Path(exists=True, file_okay=False, dir_okay=True))
 def analyze(video_dir: str):
@@ -114,15 +168,14 @@ def lint(result_file: str):
     RESULT_FILE: chapter3_result.jsonのパス（デフォルト: output/chapter3_result.json）
     """
     from sns_automation.utils import lint_script_file, ScriptLinter
+    from sns_automation.utils.json_io import read_json
     from pathlib import Path
-    import json
 
     try:
         result_path = Path(result_file)
 
         # JSONファイルを読み込み
-        with open(result_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(result_path)
 
         linter = ScriptLinter()
         total_errors = 0
@@ -143,7 +196,7 @@ def lint(result_file: str):
             if result["error_count"] > 0:
                 click.echo(f"   ❌ エラー: {result['error_count']}件")
                 for error in result["errors"]:
-                    click.echo(f"      - [{error['context']}] {error['message']}")
+                    click.echo(f"      - [{error.context}] {error.message}")
             elif result["warning_count"] > 0:
                 click.echo(f"   ⚠️  警告: {result['warning_count']}件")
             else:
@@ -183,30 +236,29 @@ def config():
 @config.command("init")
 def init_config():
     """設定ファイルを初期化"""
-    import shutil
+    _init_config_file()
 
-    config_example = Path("config.yaml.example")
-    config_target = Path("config.yaml")
 
-    if not config_example.exists():
-        # パッケージディレクトリから探す
-        package_dir = Path(__file__).parent.parent.parent
-        config_example = package_dir / "config.yaml.example"
+def _mask_api_keys(config: dict) -> dict:
+    """
+    API Keyを隠した設定を作成（キャッシュされた設定辞書は変更しない）
 
-    if not config_example.exists():
-        click.echo("config.yaml.example が見つかりません", err=True)
-        raise click.Abort()
+    Args:
+        config: 設定辞書
 
-    if config_target.exists():
-        if not click.confirm(f"{config_target} は既に存在します。上書きしますか？"):
-            click.echo("キャンセルしました")
-            return
+    Returns:
+        api_keys の値を末尾4文字以外伏せた新しい設定辞書
+    """
+    if "api_keys" not in config:
+        return config
 
-    shutil.copy(config_example, config_target)
-    click.echo(f"設定ファイルを作成しました: {config_target}")
-    click.echo("\n次のステップ:")
-    click.echo("1. config.yaml を編集してAPI Keyを設定してください")
-    click.echo("2. Google Sheets API の認証情報を配置してください")
+    return {
+        **config,
+        "api_keys": {
+            key: "***" + value[-4:] if value else value
+            for key, value in config["api_keys"].items()
+        },
+    }
 
 
 @config.command()
@@ -215,15 +267,8 @@ def show():
     from sns_automation.utils import load_config
     try:
         config = load_config()
-        # API Keyを隠して表示
-        safe_config = config.copy()
-        if "api_keys" in safe_config:
-            for key in safe_config["api_keys"]:
-                if safe_config["api_keys"][key]:
-                    safe_config["api_keys"][key] = "***" + safe_config["api_keys"][key][-4:]
-
-        import json
-        click.echo(json.dumps(safe_config, indent=2, ensure_ascii=False))
+        from sns_automation.utils.json_io import dumps_json
+        click.echo(dumps_json(_mask_api_keys(config)).decode("utf-8"))
     except FileNotFoundError as e:
         click.echo(f"設定ファイルが見つかりません: {e}", err=True)
         click.echo("まず 'sns-automation config init' を実行してください")
@@ -231,7 +276,13 @@ def show():
 
 @main.command()
 @click.option("--port", "-p", default=8501, help="ポート番号（デフォルト: 8501）")
-def web(port: int):
+@click.option(
+    "--in-process",
+    "in_process",
+    is_flag=True,
+    help="同じプロセス内で起動する（Streamlit の非公開APIを使うため試験的）",
+)
+def web(port: int, in_process: bool):
     """Web UIを起動"""
     import subprocess
     import sys
@@ -247,6 +298,17 @@ def web(port: int):
     click.echo(f"🚀 Web UIを起動中... (http://localhost:{port})")
     click.echo("Ctrl+C で終了します\n")
 
+    if in_process:
+        # 同じプロセス内でStreamlitサーバーを起動する（Pythonをもう1つ立ち上げない）
+        # bootstrap は Streamlit の非公開APIで、引数名もバージョンにより異なるため既定では使わない
+        from streamlit.web import bootstrap
+
+        flag_options = {"server_port": port, "server_headless": True}
+        bootstrap.load_config_options(flag_options=flag_options)
+        bootstrap.run(str(app_path), False, [], flag_options)
+        click.echo("\nWeb UIを終了しました")
+        return
+
     try:
         # Streamlitを起動
         subprocess.run(
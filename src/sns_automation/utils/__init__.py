@@ -1,32 +1,100 @@
 """
 Utility modules for SNS Automation
+
+各属性は初回アクセス時にインポートする（PEP 562）。
+anthropic / Google API クライアント等の重い依存を、
+実際に使うまで読み込まないようにするため。
 """
 
-from sns_automation.utils.config import load_config, get_config
-from sns_automation.utils.claude_api import ClaudeAPI
-from sns_automation.utils.sheets_api import SheetsAPI
-from sns_automation.utils.elevenlabs_api import ElevenLabsAPI
-from sns_automation.utils.image_processing import extract_frames, batch_extract
-from sns_automation.utils.prompt_loader import PromptLoader, get_prompt_loader, load_prompt
-from sns_automation.utils.linter import ScriptLinter, lint_script, lint_script_file
-from sns_automation.utils.state_manager import StateManager, get_state_manager
-from sns_automation.utils.progress_manager import ProgressManager
-from sns_automation.utils.idea_analyzer import IdeaAnalyzer
-from sns_automation.utils.script_previewer import ScriptPreviewer
-from sns_automation.utils import error_helpers
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from sns_automation.utils.config import load_config, get_config
+    from sns_automation.utils.claude_api import ClaudeAPI
+    from sns_automation.utils.gen_cache import GenCache
+    from sns_automation.utils.sheets_api import SheetsAPI
+    from sns_automation.utils.elevenlabs_api import ElevenLabsAPI
+    from sns_automation.utils.image_processing import (
+        extract_frames,
+        extract_frames_bytes,
+        extract_frames_multi,
+        extract_frames_pyav,
+        batch_extract,
+        list_video_files,
+    )
+    from sns_automation.utils.prompt_loader import PromptLoader, get_prompt_loader, load_prompt
+    from sns_automation.utils.linter import ScriptLinter, Violation, lint_script, lint_script_file
+    from sns_automation.utils.state_manager import StateManager, get_state_manager
+    from sns_automation.utils.progress_manager import ProgressManager
+    from sns_automation.utils.idea_analyzer import IdeaAnalyzer
+    from sns_automation.utils.script_previewer import ScriptPreviewer
+    from sns_automation.utils import error_helpers
+
+# 属性名 → 定義元モジュール
+_LAZY_ATTRS = {
+    "load_config": "sns_automation.utils.config",
+    "get_config": "sns_automation.utils.config",
+    "ClaudeAPI": "sns_automation.utils.claude_api",
+    "GenCache": "sns_automation.utils.gen_cache",
+    "SheetsAPI": "sns_automation.utils.sheets_api",
+    "ElevenLabsAPI": "sns_automation.utils.elevenlabs_api",
+    "extract_frames": "sns_automation.utils.image_processing",
+    "extract_frames_bytes": "sns_automation.utils.image_processing",
+    "extract_frames_multi": "sns_automation.utils.image_processing",
+    "extract_frames_pyav": "sns_automation.utils.image_processing",
+    "batch_extract": "sns_automation.utils.image_processing",
+    "list_video_files": "sns_automation.utils.image_processing",
+    "PromptLoader": "sns_automation.utils.prompt_loader",
+    "get_prompt_loader": "sns_automation.utils.prompt_loader",
+    "load_prompt": "sns_automation.utils.prompt_loader",
+    "ScriptLinter": "sns_automation.utils.linter",
+    "Violation": "sns_automation.utils.linter",
+    "lint_script": "sns_automation.utils.linter",
+    "lint_script_file": "sns_automation.utils.linter",
+    "StateManager": "sns_automation.utils.state_manager",
+    "get_state_manager": "sns_automation.utils.state_manager",
+    "ProgressManager": "sns_automation.utils.progress_manager",
+    "IdeaAnalyzer": "sns_automation.utils.idea_analyzer",
+    "ScriptPreviewer": "sns_automation.utils.script_previewer",
+}
+
+# サブモジュールとして公開するもの
+_LAZY_SUBMODULES = {"error_helpers"}
+
+
+def __getattr__(name: str) -> Any:
+    """属性へのアクセス時に定義元モジュールをインポートする"""
+    if name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # 2回目以降は通常の属性として参照させる
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "load_config",
     "get_config",
     "ClaudeAPI",
+    "GenCache",
     "SheetsAPI",
     "ElevenLabsAPI",
     "extract_frames",
+    "extract_frames_bytes",
+    "extract_frames_multi",
+    "extract_frames_pyav",
     "batch_extract",
+    "list_video_files",
     "PromptLoader",
     "get_prompt_loader",
     "load_prompt",
     "ScriptLinter",
+    "Violation",
     "lint_script",
     "lint_script_file",
     "StateManager",
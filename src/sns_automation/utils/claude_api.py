@@ -3,18 +3,178 @@ Claude API wrapper
 """
 
 import base64
+import binascii
+import importlib.util
 import logging
-import mimetypes
+import mmap
+import os
+import random
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Tuple, TypeVar
 from pathlib import Path
 
 import anthropic
+import httpx
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 DEFAULT_MODEL = "claude-opus-4-6"
 
+# モデルのコンテキストウィンドウ（入力 + 出力トークン）
+CONTEXT_WINDOW_TOKENS = 200_000
+
+# 1文字あたりのトークン数の上限目安（日本語を含めても概ねこれ以下）
+MAX_TOKENS_PER_CHAR = 2
+
+# batch_generate で同時に送信するリクエスト数のデフォルト
+DEFAULT_BATCH_WORKERS = 6
+
+# batch_generate で Message Batches API を使う最小件数（少ない場合は待ち時間の方が大きい）
+MESSAGE_BATCH_MIN_PROMPTS = 5
+
+# Files API を使うための beta フラグ
+FILES_API_BETA = "files-api-2025-04-14"
+
+# base64エンコード済みの画像ファイルを保持する件数（1280px JPEG で1件あたり数百KB）
+IMAGE_CACHE_SIZE = 128
+
+# これ以上のサイズの画像ファイルは mmap 経由でエンコードする（小さいファイルは通常の読み込みの方が速い）
+MMAP_MIN_IMAGE_SIZE = 64 * 1024
+
+# リトライ待ち時間の上限（秒）
+MAX_RETRY_WAIT = 30.0
+
+# 画像ファイル先頭のマジックナンバー → MIMEタイプ（Claude Vision が対応する形式のみ）
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+# batch_generate のワーカースレッドで、トークン使用量を1件ずつログに出さず集計するための領域
+_usage_local = threading.local()
+
+# 全 ClaudeAPI インスタンスで共有するHTTPクライアント（接続プールを使い回す）
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    """
+    共有HTTPクライアントを取得（初回のみ作成）
+
+    h2 パッケージがインストールされていればHTTP/2を有効にし、
+    1本の接続で複数リクエストを多重化する。
+
+    Returns:
+        httpx.Client
+    """
+    global _http_client
+
+    with _http_client_lock:
+        if _http_client is None:
+            # batch_generate と Chapter 2 の並列分析が同時に走っても接続待ちにならない本数
+            _http_client = anthropic.DefaultHttpxClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            )
+        return _http_client
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> anthropic.Anthropic:
+    """
+    API Keyごとの Anthropic クライアントを取得（初回のみ作成）
+
+    Args:
+        api_key: Claude API Key
+
+    Returns:
+        共有HTTPクライアントを使う anthropic.Anthropic
+    """
+    return anthropic.Anthropic(api_key=api_key, http_client=_get_http_client())
+
+
+def _sniff_image_media_type(path: str) -> str:
+    """
+    画像ファイルの先頭16バイトからMIMEタイプを判定
+
+    拡張子ではなく中身で判定し、未対応の形式はbase64化やアップロードの前に弾く。
+
+    Args:
+        path: 画像ファイルのパス
+
+    Returns:
+        MIMEタイプ（image/png, image/jpeg, image/gif, image/webp）
+
+    Raises:
+        ValueError: 対応していない画像形式の場合
+    """
+    with open(path, "rb") as f:
+        header = f.read(16)
+
+    for signature, media_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return media_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+
+    raise ValueError(f"対応していない画像形式です（PNG/JPEG/GIF/WebPのみ）: {path}")
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _encode_image_file(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    """
+    画像ファイルを読み込んでbase64エンコード（同じファイルは再エンコードしない）
+
+    更新時刻とサイズをキーに含めるため、ファイルが書き換えられた場合のみ読み直される。
+
+    Args:
+        path: 画像ファイルのパス
+        mtime_ns: ファイルの更新時刻（ナノ秒）
+        size: ファイルサイズ（バイト）
+
+    Returns:
+        (MIMEタイプ, base64文字列)
+
+    Raises:
+        ValueError: 対応していない画像形式の場合
+    """
+    media_type = _sniff_image_media_type(path)
+    if size < MMAP_MIN_IMAGE_SIZE:
+        return media_type, base64.b64encode(Path(path).read_bytes()).decode("ascii")
+
+    # ファイル全体のbytesコピーを作らず、ページキャッシュから直接エンコードする
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return media_type, binascii.b2a_base64(mm, newline=False).decode("ascii")
+
+
+def iter_stream_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    ストリーミングのテキスト断片を行単位にまとめて返す
+
+    Args:
+        chunks: テキスト断片のイテラブル
+
+    Yields:
+        改行で区切られた1行（改行文字は含まない）。末尾の未完了行も最後に返す
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            yield line
+    if buffer:
+        yield buffer
+
 
 class ClaudeAPI:
     """Claude APIのラッパークラス"""
@@ -31,11 +191,22 @@ class ClaudeAPI:
             from .config import get_api_key
             api_key = get_api_key("claude")
             self.model = DEFAULT_MODEL
+            self.batch_workers = DEFAULT_BATCH_WORKERS
+            self.use_files_api = False
         else:
             api_key = config["api_keys"]["claude"]
             self.model = config.get("claude", {}).get("model", DEFAULT_MODEL)
+            self.batch_workers = config.get("concurrency", {}).get(
+                "batch_workers", DEFAULT_BATCH_WORKERS
+            )
+            # 画像ファイルを Files API で一度だけアップロードし、file_id で参照する
+            self.use_files_api = config.get("claude", {}).get("use_files_api", False)
 
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # アップロード済み画像の file_id（(パス, 更新時刻, サイズ) → file_id）
+        self._file_ids: Dict[Tuple[str, int, int], str] = {}
+        self._file_ids_lock = threading.Lock()
+
+        self.client = _get_client(api_key)
 
     def generate_text(
         self,
@@ -43,6 +214,8 @@ class ClaudeAPI:
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4000,
+        cache_system: bool = False,
+        shared_context: Optional[str] = None,
     ) -> str:
         """
         テキストを生成
@@ -52,29 +225,113 @@ class ClaudeAPI:
             system_prompt: システムプロンプト
             temperature: 温度パラメータ
             max_tokens: 最大トークン数
+            cache_system: システムプロンプトをプロンプトキャッシュの対象にするか
+            shared_context: 複数ステップで共通の前置きテキスト（常にキャッシュ対象）
 
         Returns:
             生成されたテキスト
         """
-        kwargs: Dict[str, Any] = {
-            "model": self.model,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-        if system_prompt:
-            kwargs["system"] = system_prompt
+        kwargs = self._build_text_kwargs(
+            prompt, system_prompt, temperature, max_tokens, cache_system, shared_context
+        )
+
+        response = self._call_api(kwargs)
+        return response.content[0].text
+
+    def generate_conversation(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        cache_system: bool = False,
+        shared_context: Optional[str] = None,
+    ) -> str:
+        """
+        複数ターンの会話の続きを生成
+
+        直前のアシスタント応答までをプロンプトキャッシュの対象にするため、
+        同じ会話に追記して再度呼び出した場合は前回までの部分がキャッシュヒットする。
+
+        Args:
+            messages: {"role": "user" | "assistant", "content": テキスト} のリスト（最後は user）
+            system_prompt: システムプロンプト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            cache_system: システムプロンプトをプロンプトキャッシュの対象にするか
+            shared_context: 複数ステップで共通の前置きテキスト（常にキャッシュ対象）
+
+        Returns:
+            生成されたテキスト
+        """
+        kwargs = self._build_text_kwargs(
+            "\n\n".join(message["content"] for message in messages),
+            system_prompt,
+            temperature,
+            max_tokens,
+            cache_system,
+            shared_context,
+        )
+        kwargs["messages"] = self._build_conversation(messages)
 
         response = self._call_api(kwargs)
         return response.content[0].text
 
+    def generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        cache_system: bool = False,
+        shared_context: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        テキストをストリーミングで生成
+
+        生成が完了するのを待たずに、届いた順にテキスト断片を返す。
+
+        Args:
+            prompt: プロンプト
+            system_prompt: システムプロンプト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            cache_system: システムプロンプトをプロンプトキャッシュの対象にするか
+            shared_context: 複数ステップで共通の前置きテキスト（常にキャッシュ対象）
+
+        Yields:
+            生成されたテキスト断片
+        """
+        kwargs = self._build_text_kwargs(
+            prompt, system_prompt, temperature, max_tokens, cache_system, shared_context
+        )
+
+        with ExitStack() as stack:
+            # ストリームの開始（リクエスト送信）は通常の呼び出しと同じ条件でリトライする
+            stream = self._with_retry(
+                lambda: stack.enter_context(self.client.messages.stream(**kwargs))
+            )
+            try:
+                for text in stream.text_stream:
+                    yield text
+            finally:
+                # 途中で中断・失敗した場合も、それまでに受け取った分の使用量を記録する
+                try:
+                    usage = stream.current_message_snapshot.usage
+                except AssertionError:
+                    # 最初のイベントを受け取る前に終わった場合はスナップショットがない
+                    usage = None
+                if usage is not None:
+                    self._log_usage(usage)
+
     def generate_with_images(
         self,
         prompt: str,
-        image_paths: List[Path],
+        image_paths: Optional[List[Path]] = None,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4000,
+        image_bytes: Optional[List[bytes]] = None,
     ) -> str:
         """
         画像付きでテキストを生成
@@ -85,26 +342,91 @@ class ClaudeAPI:
             system_prompt: システムプロンプト
             temperature: 温度パラメータ
             max_tokens: 最大トークン数
+            image_bytes: JPEG画像のバイト列のリスト（image_paths の後に追加される）
 
         Returns:
             生成されたテキスト
         """
+        kwargs = self._build_image_kwargs(
+            prompt, image_paths, image_bytes, system_prompt, temperature, max_tokens,
+            use_files=self.use_files_api,
+        )
+
+        response = self._call_api(kwargs)
+        return response.content[0].text
+
+    def _upload_image(self, image_path: Path) -> str:
+        """
+        画像ファイルを Files API にアップロード（同じファイルは再アップロードしない）
+
+        Args:
+            image_path: 画像ファイルのパス
+
+        Returns:
+            アップロードしたファイルの file_id
+        """
+        stat = os.stat(image_path)
+        key = (str(image_path), stat.st_mtime_ns, stat.st_size)
+        with self._file_ids_lock:
+            file_id = self._file_ids.get(key)
+        if file_id is not None:
+            return file_id
+
+        image_path = Path(image_path)
+        media_type = _sniff_image_media_type(str(image_path))
+        uploaded = self.client.beta.files.upload(
+            file=(image_path.name, image_path.read_bytes(), media_type),
+        )
+        logger.info("画像をアップロードしました: %s (%s)", image_path.name, uploaded.id)
+
+        with self._file_ids_lock:
+            self._file_ids[key] = uploaded.id
+        return uploaded.id
+
+    def _build_image_kwargs(
+        self,
+        prompt: str,
+        image_paths: Optional[List[Path]],
+        image_bytes: Optional[List[bytes]],
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        use_files: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        画像付き生成用の messages.create 引数を組み立てる
+
+        Args:
+            prompt: プロンプト
+            image_paths: 画像ファイルパスのリスト
+            image_bytes: JPEG画像のバイト列のリスト
+            system_prompt: システムプロンプト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            use_files: 画像ファイルを Files API 経由（file_id 参照）で渡すか
+
+        Returns:
+            messages.create に渡す引数
+        """
         content: List[Dict[str, Any]] = []
 
-        for image_path in image_paths:
-            image_path = Path(image_path)
-            media_type = mimetypes.guess_type(str(image_path))[0] or "image/jpeg"
-            with open(image_path, "rb") as f:
-                image_data = base64.standard_b64encode(f.read()).decode("utf-8")
-            content.append(
-                {
+        for image_path in image_paths or []:
+            if use_files:
+                content.append({
                     "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": media_type,
-                        "data": image_data,
-                    },
-                }
+                    "source": {"type": "file", "file_id": self._upload_image(image_path)},
+                })
+                continue
+
+            stat = os.stat(image_path)
+            media_type, encoded = _encode_image_file(
+                str(image_path), stat.st_mtime_ns, stat.st_size
+            )
+            content.append(self._image_block(encoded, media_type))
+
+        for data in image_bytes or []:
+            content.append(
+                self._image_block(base64.b64encode(data).decode("ascii"), "image/jpeg")
             )
 
         content.append({"type": "text", "text": prompt})
@@ -117,9 +439,9 @@ class ClaudeAPI:
         }
         if system_prompt:
             kwargs["system"] = system_prompt
-
-        response = self._call_api(kwargs)
-        return response.content[0].text
+        if use_files and image_paths:
+            kwargs["betas"] = [FILES_API_BETA]
+        return kwargs
 
     def batch_generate(
         self,
@@ -127,64 +449,471 @@ class ClaudeAPI:
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4000,
+        use_message_batch: bool = False,
     ) -> List[str]:
         """
         バッチでテキストを生成
 
+        各プロンプトは独立しているため、通信待ちを重ねるよう並列に送信する
+        （レート制限に当たった場合は _call_api のリトライで待機する）。
+
+        use_message_batch を指定し、プロンプトが MESSAGE_BATCH_MIN_PROMPTS 件以上ある場合は
+        Message Batches API でまとめて送信する（低コストだが完了まで数分以上かかる）。
+        バッチで失敗したプロンプトのみ通常の呼び出しで生成し直す。
+
         Args:
             prompts: プロンプトのリスト
             system_prompt: システムプロンプト
             temperature: 温度パラメータ
             max_tokens: 最大トークン数
+            use_message_batch: Message Batches API を使うか
+
+        Returns:
+            生成されたテキストのリスト（prompts と同じ順）
+        """
+        if not prompts:
+            return []
+
+        results: List[Optional[str]] = [None] * len(prompts)
+        if use_message_batch and len(prompts) >= MESSAGE_BATCH_MIN_PROMPTS:
+            batch_results = self.generate_message_batch([
+                {
+                    "custom_id": str(i),
+                    "prompt": prompt,
+                    "system_prompt": system_prompt,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                }
+                for i, prompt in enumerate(prompts)
+            ])
+            for custom_id, text in batch_results.items():
+                results[int(custom_id)] = text
+
+        pending = [i for i, text in enumerate(results) if text is None]
+        if not pending:
+            return results
+
+        # [input_tokens, output_tokens]（全ワーカーで共有し、最後に1行だけログに出す）
+        usage_totals = [0, 0]
+        usage_lock = threading.Lock()
+
+        def generate(index: int, prompt: str) -> str:
+            logger.info("バッチ生成 %d/%d", index + 1, len(prompts))
+            _usage_local.totals = (usage_totals, usage_lock)
+            try:
+                return self.generate_text(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            finally:
+                _usage_local.totals = None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.batch_workers, len(pending)))) as executor:
+            texts = executor.map(generate, pending, [prompts[i] for i in pending])
+            for i, text in zip(pending, texts):
+                results[i] = text
+
+        logger.info(
+            "トークン使用量（バッチ %d件）- input: %d, output: %d",
+            len(pending),
+            usage_totals[0],
+            usage_totals[1],
+        )
+        return results
+
+    def generate_message_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+    ) -> Dict[str, str]:
+        """
+        Message Batches API でまとめてテキストを生成
+
+        リアルタイム性が不要な一括処理向け。通常の呼び出しより低コストで、
+        通常のレート制限枠とは別に処理される。
+
+        Args:
+            requests: リクエストのリスト。各要素は
+                {"custom_id", "prompt", "system_prompt", "temperature", "max_tokens",
+                 "cache_system", "shared_context"} 形式（custom_id と prompt 以外は任意）
+            poll_interval: 処理状況を確認する初回の間隔（秒）
+            max_poll_interval: 確認間隔の上限（秒）
 
         Returns:
-            生成されたテキストのリスト
+            {custom_id: 生成されたテキスト} の辞書（失敗したリクエストは含まない）
         """
-        results: List[str] = []
-        for i, prompt in enumerate(prompts):
-            logger.info("バッチ生成 %d/%d", i + 1, len(prompts))
-            text = self.generate_text(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
+        batch_requests = []
+        for request in requests:
+            params = self._build_text_kwargs(
+                request["prompt"],
+                request.get("system_prompt"),
+                request.get("temperature", 0.7),
+                request.get("max_tokens", 4000),
+                request.get("cache_system", False),
+                request.get("shared_context"),
             )
-            results.append(text)
+            batch_requests.append({"custom_id": request["custom_id"], "params": params})
+
+        return self._run_message_batch(batch_requests, poll_interval, max_poll_interval)
+
+    def generate_batched_with_images(
+        self,
+        tasks: List[Dict[str, Any]],
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+    ) -> Dict[str, str]:
+        """
+        Message Batches API で画像付きテキストをまとめて生成
+
+        Args:
+            tasks: リクエストのリスト。各要素は
+                {"custom_id", "prompt", "image_paths", "image_bytes", "system_prompt",
+                 "temperature", "max_tokens"} 形式（custom_id と prompt 以外は任意）
+            poll_interval: 処理状況を確認する初回の間隔（秒）
+            max_poll_interval: 確認間隔の上限（秒）
+
+        Returns:
+            {custom_id: 生成されたテキスト} の辞書（失敗したリクエストは含まない）
+        """
+        batch_requests = []
+        for task in tasks:
+            params = self._build_image_kwargs(
+                task["prompt"],
+                task.get("image_paths"),
+                task.get("image_bytes"),
+                task.get("system_prompt"),
+                task.get("temperature", 0.7),
+                task.get("max_tokens", 4000),
+            )
+            batch_requests.append({"custom_id": task["custom_id"], "params": params})
+
+        return self._run_message_batch(batch_requests, poll_interval, max_poll_interval)
+
+    def _run_message_batch(
+        self,
+        batch_requests: List[Dict[str, Any]],
+        poll_interval: float,
+        max_poll_interval: float,
+    ) -> Dict[str, str]:
+        """
+        バッチを送信し、処理完了まで待って結果を取得する
+
+        Args:
+            batch_requests: {"custom_id", "params"} 形式のリクエストのリスト
+            poll_interval: 処理状況を確認する初回の間隔（秒）
+            max_poll_interval: 確認間隔の上限（秒）
+
+        Returns:
+            {custom_id: 生成されたテキスト} の辞書（失敗したリクエストは含まない）
+        """
+        batch = self.client.messages.batches.create(requests=batch_requests)
+        logger.info("バッチを送信しました: %s (%d件)", batch.id, len(batch_requests))
+
+        wait = poll_interval
+        while batch.processing_status != "ended":
+            time.sleep(wait)
+            wait = min(wait * 2, max_poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+            logger.info("バッチ処理中: %s (%s)", batch.id, batch.processing_status)
+
+        results: Dict[str, str] = {}
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                logger.error("バッチ内のリクエストが失敗しました: %s (%s)", entry.custom_id, entry.result.type)
+
+        logger.info("バッチ処理完了: %d/%d 件成功", len(results), len(batch_requests))
         return results
 
+    def _build_text_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        cache_system: bool,
+        shared_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        テキスト生成用の messages.create 引数を組み立てる
+
+        Args:
+            prompt: プロンプト
+            system_prompt: システムプロンプト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            cache_system: システムプロンプトをキャッシュ対象にするか
+            shared_context: 複数ステップで共通の前置きテキスト
+
+        Returns:
+            messages.create に渡す引数
+        """
+        full_system = "\n\n".join(text for text in (shared_context, system_prompt) if text)
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": self._fit_max_tokens(prompt, full_system or None, max_tokens),
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if full_system:
+            kwargs["system"] = self._build_system(system_prompt, cache_system, shared_context)
+        return kwargs
+
+    def count_tokens(self, prompt: str, system_prompt: Optional[str] = None) -> int:
+        """
+        プロンプトの入力トークン数を数える（生成は行わない）
+
+        Args:
+            prompt: プロンプト
+            system_prompt: システムプロンプト
+
+        Returns:
+            入力トークン数
+        """
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            kwargs["system"] = system_prompt
+        return self.client.messages.count_tokens(**kwargs).input_tokens
+
+    def _fit_max_tokens(
+        self, prompt: str, system_prompt: Optional[str], max_tokens: int
+    ) -> int:
+        """
+        コンテキストウィンドウに収まるよう max_tokens を調整する
+
+        文字数から見て確実に収まる場合はAPIを呼ばずにそのまま返す。
+        収まらない可能性がある場合のみ count_tokens で正確に数え、
+        入力だけで上限を超える場合は課金される生成の前にエラーにする。
+
+        Args:
+            prompt: プロンプト
+            system_prompt: システムプロンプト
+            max_tokens: 指定された最大出力トークン数
+
+        Returns:
+            調整後の最大出力トークン数
+
+        Raises:
+            ValueError: 入力がコンテキストウィンドウを超える場合
+        """
+        char_count = len(prompt) + len(system_prompt or "")
+        if char_count * MAX_TOKENS_PER_CHAR + max_tokens <= CONTEXT_WINDOW_TOKENS:
+            return max_tokens
+
+        input_tokens = self.count_tokens(prompt, system_prompt)
+        remaining = CONTEXT_WINDOW_TOKENS - input_tokens
+        if remaining <= 0:
+            raise ValueError(
+                f"プロンプトが長すぎます（入力 {input_tokens} トークン / 上限 {CONTEXT_WINDOW_TOKENS}）"
+            )
+
+        if remaining < max_tokens:
+            logger.warning(
+                "入力が長いため max_tokens を %d から %d に縮小します", max_tokens, remaining
+            )
+            return remaining
+        return max_tokens
+
+    @staticmethod
+    def _image_block(encoded: str, media_type: str) -> Dict[str, Any]:
+        """
+        画像のコンテンツブロックを組み立てる
+
+        Args:
+            encoded: base64エンコード済みの画像データ
+            media_type: MIMEタイプ
+
+        Returns:
+            image コンテンツブロック
+        """
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": encoded,
+            },
+        }
+
+    @staticmethod
+    def _build_system(
+        system_prompt: Optional[str],
+        cache_system: bool,
+        shared_context: Optional[str] = None,
+    ) -> Any:
+        """
+        system パラメータを組み立てる
+
+        cache_system が True の場合、Anthropic のプロンプトキャッシュ
+        （cache_control: ephemeral）を付与したコンテンツブロック形式で返す。
+
+        shared_context を指定した場合は、それを先頭のキャッシュ対象ブロックとし、
+        ステップ固有のシステムプロンプトをその後ろに置く。プロンプトキャッシュは
+        先頭からの完全一致で再利用されるため、システムプロンプトが異なる
+        ステップ間でも shared_context 部分はキャッシュヒットする。
+
+        Args:
+            system_prompt: システムプロンプト
+            cache_system: システムプロンプトをキャッシュ対象にするか
+            shared_context: 複数ステップで共通の前置きテキスト
+
+        Returns:
+            messages.create の system に渡す値
+        """
+        if not shared_context and not cache_system:
+            return system_prompt
+
+        blocks: List[Dict[str, Any]] = []
+        if shared_context:
+            blocks.append({
+                "type": "text",
+                "text": shared_context,
+                "cache_control": {"type": "ephemeral"},
+            })
+        if system_prompt:
+            block: Dict[str, Any] = {"type": "text", "text": system_prompt}
+            if cache_system:
+                block["cache_control"] = {"type": "ephemeral"}
+            blocks.append(block)
+        return blocks
+
+    @staticmethod
+    def _build_conversation(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        会話の messages パラメータを組み立てる
+
+        最後のアシスタント応答にキャッシュの区切り（cache_control: ephemeral）を付け、
+        そこまでの会話をプロンプトキャッシュの対象にする。
+
+        Args:
+            messages: {"role", "content"} のリスト
+
+        Returns:
+            messages.create の messages に渡す値
+        """
+        built: List[Dict[str, Any]] = [dict(message) for message in messages]
+        for message in reversed(built):
+            if message["role"] == "assistant":
+                message["content"] = [{
+                    "type": "text",
+                    "text": message["content"],
+                    "cache_control": {"type": "ephemeral"},
+                }]
+                break
+        return built
+
+    @staticmethod
+    def _retry_wait(attempt: int, error: Optional[anthropic.APIStatusError] = None) -> float:
+        """
+        リトライまでの待ち時間を決める
+
+        1秒〜指数バックオフ（2, 4, 8...秒）の間でランダムに選ぶ（並列ワーカーが
+        同時にリトライして再びレート制限に当たらないようにする）。
+        レスポンスに retry-after ヘッダーがあれば、それより短くはしない。
+
+        Args:
+            attempt: 何回目の試行か（0始まり）
+            error: 発生したエラー（レスポンスのないタイムアウト時は省略）
+
+        Returns:
+            待ち時間（秒）
+        """
+        wait = min(MAX_RETRY_WAIT, random.uniform(1, 2 ** (attempt + 1)))
+
+        retry_after = error.response.headers.get("retry-after") if error is not None else None
+        if retry_after is not None:
+            try:
+                wait = max(wait, float(retry_after))
+            except ValueError:
+                pass
+        return wait
+
+    @staticmethod
+    def _log_usage(usage: Any) -> None:
+        """
+        トークン使用量をログに出す（batch_generate の実行中はバッチの合計に加算するだけ）
+
+        Args:
+            usage: APIレスポンスの usage
+        """
+        totals = getattr(_usage_local, "totals", None)
+        if totals is None:
+            logger.info(
+                "トークン使用量 - input: %d, output: %d",
+                usage.input_tokens,
+                usage.output_tokens,
+            )
+            return
+
+        counts, lock = totals
+        with lock:
+            counts[0] += usage.input_tokens
+            counts[1] += usage.output_tokens
+
     def _call_api(self, kwargs: Dict[str, Any]) -> Any:
         """
         API呼び出しのラッパー（リトライ付き）
 
         Args:
-            kwargs: messages.create に渡す引数
+            kwargs: messages.create に渡す引数（betas を含む場合は beta API で送信する）
 
         Returns:
             APIレスポンス
         """
+        create = self.client.beta.messages.create if "betas" in kwargs else self.client.messages.create
+        response = self._with_retry(lambda: create(**kwargs))
+        self._log_usage(response.usage)
+        return response
+
+    def _with_retry(self, request: Callable[[], T]) -> T:
+        """
+        一時的なエラー（レート制限・5xx・タイムアウト）の場合にリトライしてリクエストを送る
+
+        Args:
+            request: リクエストを送信する関数（リトライのたびに呼び出す）
+
+        Returns:
+            request の返り値
+        """
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(**kwargs)
-                usage = response.usage
-                logger.info(
-                    "トークン使用量 - input: %d, output: %d",
-                    usage.input_tokens,
-                    usage.output_tokens,
-                )
-                return response
-            except anthropic.RateLimitError:
+                return request()
+            except anthropic.RateLimitError as e:
                 if attempt < max_retries - 1:
-                    wait = 2 ** (attempt + 1)
-                    logger.warning("レート制限に到達。%d秒後にリトライします...", wait)
+                    wait = self._retry_wait(attempt, e)
+                    logger.warning("レート制限に到達。%.1f秒後にリトライします...", wait)
                     time.sleep(wait)
                 else:
                     logger.error("レート制限エラー: リトライ回数を超えました")
                     raise
+            except anthropic.APIStatusError as e:
+                # 5xx は一時的なことが多いためリトライする
+                # （SDK では 529 overloaded・503 は InternalServerError のサブクラスではないため、
+                #   ステータスコードで判定する）
+                if e.status_code < 500:
+                    logger.error("API エラー: %s", e)
+                    raise
+                if attempt < max_retries - 1:
+                    wait = self._retry_wait(attempt, e)
+                    logger.warning(
+                        "サーバーエラー (%d)。%.1f秒後にリトライします...", e.status_code, wait
+                    )
+                    time.sleep(wait)
+                else:
+                    logger.error("サーバーエラー: リトライ回数を超えました")
+                    raise
             except anthropic.APITimeoutError:
                 if attempt < max_retries - 1:
-                    wait = 2 ** (attempt + 1)
-                    logger.warning("タイムアウト。%d秒後にリトライします...", wait)
+                    wait = self._retry_wait(attempt)
+                    logger.warning("タイムアウト。%.1f秒後にリトライします...", wait)
                     time.sleep(wait)
                 else:
                     logger.error("タイムアウトエラー: リトライ回数を超えました")
@@ -2,14 +2,32 @@
 設定ファイルの読み込みと管理
 """
 
+import hashlib
+import logging
 import os
-import yaml
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from sns_automation.utils.json_io import read_json, write_json
+
+logger = logging.getLogger(__name__)
+
+# パース済み設定のJSONキャッシュの保存先（APIキーを含むため config.yaml の隣には置かない）
+CONFIG_CACHE_DIR = Path.home() / ".sns-automation" / "cache" / "config"
+
+# この環境変数が設定されていればJSONキャッシュを使わない（CLIの --no-config-cache）
+NO_CONFIG_CACHE_ENV = "SNS_AUTOMATION_NO_CONFIG_CACHE"
 
 # グローバル設定キャッシュ
 _config_cache: Optional[Dict[str, Any]] = None
 
+# キャッシュした設定の読み込み元（パス, 更新時刻ns）。ファイル以外から作った場合はNone
+_config_source: Optional[Tuple[Path, int]] = None
+
+# 上の2つをまとめて読み書きするためのロック（get_config から load_config を呼ぶため再入可能）
+_config_lock = threading.RLock()
+
 
 def find_config_file() -> Path:
     """
@@ -66,11 +84,40 @@ def load_config(config_path: Optional[Path] = None, force_reload: bool = False)
         FileNotFoundError: 設定ファイルが見つからない場合
         yaml.YAMLError: YAMLパースエラー
     """
-    global _config_cache
+    # 複数スレッドから同時に呼ばれても、読み込みは1回だけ行う
+    with _config_lock:
+        return _load_config_locked(config_path, force_reload)
+
+
+def _load_config_locked(config_path: Optional[Path], force_reload: bool) -> Dict[str, Any]:
+    """
+    設定ファイルを読み込む（_config_lock を取得した状態で呼ぶ）
 
-    # キャッシュがあれば返す
+    Args:
+        config_path: 設定ファイルパス（省略時は自動検索）
+        force_reload: キャッシュを無視して再読み込みするか
+
+    Returns:
+        設定辞書
+    """
+    global _config_cache, _config_source
+
+    # キャッシュがあり、読み込み元のファイルが更新されていなければ返す
     if _config_cache is not None and not force_reload:
-        return _config_cache
+        if _config_source is None:
+            return _config_cache
+
+        cached_path, cached_mtime_ns = _config_source
+        source_path = Path(config_path) if config_path is not None else cached_path
+        if source_path == cached_path:
+            try:
+                if source_path.stat().st_mtime_ns == cached_mtime_ns:
+                    return _config_cache
+            except OSError:
+                # 読み込み後にファイルが消えた場合は従来どおりキャッシュを使う
+                return _config_cache
+            # 更新されていれば同じファイルから読み直す
+            config_path = source_path
 
     # Streamlit環境でconfig.yamlが無い場合はデフォルト設定を返す
     try:
@@ -86,6 +133,7 @@ def load_config(config_path: Optional[Path] = None, force_reload: bool = False)
                 },
                 "paths": {}
             }
+            _config_source = None
             return _config_cache
     except ImportError:
         pass
@@ -93,20 +141,108 @@ def load_config(config_path: Optional[Path] = None, force_reload: bool = False)
     # 設定ファイルを検索
     if config_path is None:
         config_path = find_config_file()
+    config_path = Path(config_path)
 
-    # 読み込み
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+    # 読み込み（更新時刻は読み込み前に取得し、読み込み中の変更も次回検知できるようにする）
+    mtime_ns = config_path.stat().st_mtime_ns
+    use_sidecar = not os.environ.get(NO_CONFIG_CACHE_ENV)
+    config = _read_config_sidecar(config_path, mtime_ns) if use_sidecar else None
+
+    if config is None:
+        config = _parse_yaml(config_path)
+
+        # バリデーション
+        validate_config(config)
 
-    # バリデーション
-    validate_config(config)
+        if use_sidecar:
+            _write_config_sidecar(config_path, mtime_ns, config)
 
     # キャッシュに保存
     _config_cache = config
+    _config_source = (config_path, mtime_ns)
 
     return config
 
 
+def _parse_yaml(config_path: Path) -> Dict[str, Any]:
+    """
+    YAMLファイルをパースする
+
+    yaml はここで初めてインポートする（JSONキャッシュが使える起動では読み込まない）。
+    libyaml があればC実装のローダーを使う。
+
+    Args:
+        config_path: 設定ファイルパス
+
+    Returns:
+        設定辞書
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _config_sidecar_path(config_path: Path) -> Path:
+    """
+    設定ファイルに対応するJSONキャッシュのパスを取得
+
+    Args:
+        config_path: 設定ファイルパス
+
+    Returns:
+        JSONキャッシュのパス（設定ファイルの絶対パスのハッシュで区別）
+    """
+    digest = hashlib.sha256(str(config_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return CONFIG_CACHE_DIR / f"{digest}.json"
+
+
+def _read_config_sidecar(config_path: Path, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    JSONキャッシュから設定を読み込む
+
+    Args:
+        config_path: 設定ファイルパス
+        mtime_ns: 設定ファイルの更新時刻（ns）
+
+    Returns:
+        設定辞書（キャッシュが無い・古い・壊れている場合はNone）
+    """
+    sidecar_path = _config_sidecar_path(config_path)
+    if not sidecar_path.exists():
+        return None
+
+    try:
+        sidecar = read_json(sidecar_path)
+    except Exception as e:
+        logger.debug(f"設定のJSONキャッシュを読み込めませんでした: {e}")
+        return None
+
+    # YAMLが編集されていれば使わない（検証済みの内容のみ書き込んでいる）
+    if sidecar.get("source_mtime_ns") != mtime_ns:
+        return None
+    return sidecar.get("config")
+
+
+def _write_config_sidecar(config_path: Path, mtime_ns: int, config: Dict[str, Any]) -> None:
+    """
+    パース済みの設定をJSONキャッシュに書き込む（失敗しても続行）
+
+    Args:
+        config_path: 設定ファイルパス
+        mtime_ns: 設定ファイルの更新時刻（ns）
+        config: 設定辞書
+    """
+    sidecar_path = _config_sidecar_path(config_path)
+    try:
+        sidecar_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        write_json(sidecar_path, {"source_mtime_ns": mtime_ns, "config": config}, indent=False)
+        os.chmod(sidecar_path, 0o600)
+    except Exception as e:
+        logger.debug(f"設定のJSONキャッシュを書き込めませんでした: {e}")
+
+
 def validate_config(config: Dict[str, Any]) -> None:
     """
     設定ファイルのバリデーション
@@ -149,23 +285,27 @@ def get_config() -> Dict[str, Any]:
     """
     global _config_cache
 
-    if _config_cache is None:
-        # 自動的に読み込みを試みる
-        try:
-            load_config()
-        except FileNotFoundError:
-            # Streamlit環境でconfig.yamlが無い場合はデフォルト設定を返す
-            _config_cache = {
-                "api_keys": {},
-                "google_sheets": {
-                    "credentials_path": "",
-                    "default_spreadsheet_id": "",
-                    "sheets": {}
-                },
-                "paths": {}
-            }
+    if _config_cache is not None:
+        return _config_cache
 
-    return _config_cache
+    with _config_lock:
+        if _config_cache is None:
+            # 自動的に読み込みを試みる
+            try:
+                load_config()
+            except FileNotFoundError:
+                # Streamlit環境でconfig.yamlが無い場合はデフォルト設定を返す
+                _config_cache = {
+                    "api_keys": {},
+                    "google_sheets": {
+                        "credentials_path": "",
+                        "default_spreadsheet_id": "",
+                        "sheets": {}
+                    },
+                    "paths": {}
+                }
+
+        return _config_cache
 
 
 def get_api_key(service: str) -> str:
@@ -3,6 +3,10 @@ ElevenLabs API wrapper
 """
 
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -14,6 +18,29 @@ logger = logging.getLogger(__name__)
 # ElevenLabs APIのテキスト長制限（1リクエストあたり）
 MAX_TEXT_LENGTH = 5000
 
+# 音声ファイル書き込み時のバッファサイズ（小さなチャンクごとのwriteをまとめる）
+AUDIO_WRITE_BUFFER = 1 << 20
+
+# テキスト分割に使う区切り文字（文末・改行）
+_DELIMITER_RE = re.compile(r"[。！？!?\n]")
+
+# ElevenLabsへの同時リクエスト数のデフォルト（プランの同時実行上限に合わせて設定で変更する）
+DEFAULT_CONCURRENCY = 4
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> ElevenLabs:
+    """
+    API Keyごとの ElevenLabs クライアントを取得（初回のみ作成し、接続プールを使い回す）
+
+    Args:
+        api_key: ElevenLabs API Key
+
+    Returns:
+        ElevenLabs クライアント
+    """
+    return ElevenLabs(api_key=api_key)
+
 
 class ElevenLabsAPI:
     """ElevenLabs APIのラッパークラス"""
@@ -29,13 +56,16 @@ class ElevenLabsAPI:
         if not api_key:
             raise ValueError("ElevenLabs API Keyが設定されていません")
 
-        self.client = ElevenLabs(api_key=api_key)
+        self.client = _get_client(api_key)
 
         el_config = config.get("elevenlabs", {})
         self.default_voice_id: str = el_config.get("default_voice_id", "21m00Tcm4TlvDq8ikWAM")
         self.default_model: str = el_config.get("model", "eleven_multilingual_v2")
         self.stability: float = el_config.get("stability", 0.5)
         self.similarity_boost: float = el_config.get("similarity_boost", 0.75)
+        self.concurrency: int = el_config.get("concurrency", DEFAULT_CONCURRENCY)
+        # 呼び出し側のスレッド数に関わらず、同時リクエスト数をプランの上限以下に抑える
+        self._request_slots = threading.BoundedSemaphore(self.concurrency)
 
     def generate_audio(
         self,
@@ -83,19 +113,19 @@ class ElevenLabsAPI:
         model: str,
     ) -> None:
         """単一テキストから音声を生成してファイルに保存"""
-        audio_iterator = self.client.text_to_speech.convert(
-            voice_id=voice_id,
-            text=text,
-            model_id=model,
-            voice_settings={
-                "stability": self.stability,
-                "similarity_boost": self.similarity_boost,
-            },
-        )
-
-        with open(output_path, "wb") as f:
-            for chunk in audio_iterator:
-                f.write(chunk)
+        with self._request_slots:
+            audio_iterator = self.client.text_to_speech.convert(
+                voice_id=voice_id,
+                text=text,
+                model_id=model,
+                voice_settings={
+                    "stability": self.stability,
+                    "similarity_boost": self.similarity_boost,
+                },
+            )
+
+            with open(output_path, "wb", buffering=AUDIO_WRITE_BUFFER) as f:
+                f.writelines(audio_iterator)
 
     def _generate_concatenated(
         self,
@@ -105,9 +135,9 @@ class ElevenLabsAPI:
         model: str,
     ) -> None:
         """複数チャンクの音声を生成して結合"""
-        with open(output_path, "wb") as f:
-            for i, chunk in enumerate(chunks):
-                logger.debug("チャンク %d/%d を生成中...", i + 1, len(chunks))
+        def convert(index: int, chunk: str) -> bytes:
+            logger.debug("チャンク %d/%d を生成中...", index + 1, len(chunks))
+            with self._request_slots:
                 audio_iterator = self.client.text_to_speech.convert(
                     voice_id=voice_id,
                     text=chunk,
@@ -117,8 +147,14 @@ class ElevenLabsAPI:
                         "similarity_boost": self.similarity_boost,
                     },
                 )
-                for audio_chunk in audio_iterator:
-                    f.write(audio_chunk)
+                return b"".join(audio_iterator)
+
+        # チャンクごとの生成は独立しているため並列に行い、元の順に書き込む
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(chunks))) as executor:
+            audio_parts = list(executor.map(convert, range(len(chunks)), chunks))
+
+        with open(output_path, "wb", buffering=AUDIO_WRITE_BUFFER) as f:
+            f.writelines(audio_parts)
 
     def list_voices(self) -> List[Dict[str, Any]]:
         """
@@ -163,24 +199,28 @@ class ElevenLabsAPI:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        results: List[Path] = []
         total = len(texts)
+        if total == 0:
+            return []
 
-        for i, text in enumerate(texts):
+        def generate(i: int, text: str) -> Path:
             output_path = output_dir / f"audio_{i:03d}.mp3"
             logger.info("バッチ生成 %d/%d: %s", i + 1, total, output_path.name)
             try:
-                generated = self.generate_audio(
+                return self.generate_audio(
                     text=text,
                     voice_id=voice_id,
                     output_path=output_path,
                     model=model,
                 )
-                results.append(generated)
             except ApiError as e:
                 logger.error("音声生成に失敗 (item %d): %s", i + 1, e)
                 raise
 
+        # 各テキストは独立しているため並列に生成する（結果は texts と同じ順）
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, total)) as executor:
+            results: List[Path] = list(executor.map(generate, range(total), texts))
+
         logger.info("バッチ生成完了: %d/%d ファイル", len(results), total)
         return results
 
@@ -201,29 +241,35 @@ class ElevenLabsAPI:
         if len(text) <= max_length:
             return [text]
 
-        delimiters = ["。", "！", "？", "!", "?", "\n"]
+        # 区切り文字の直後の位置を1回の走査で求めておき、先頭から貪欲に詰める
+        # （残りのテキストを切り出し直さず、位置だけを進める）
+        delimiter_ends = [m.end() for m in _DELIMITER_RE.finditer(text)]
         chunks: List[str] = []
-        remaining = text
+        end = len(text.rstrip())
+        start = 0
+        j = 0
+
+        while start < end:
+            # 前のチャンクとの間の空白を読み飛ばす（先頭チャンクは元のテキストのまま）
+            while start > 0 and text[start].isspace():
+                start += 1
 
-        while remaining:
-            if len(remaining) <= max_length:
-                chunks.append(remaining)
+            if start > 0 and end - start <= max_length:
+                chunks.append(text[start:end])
                 break
 
             # max_length以内で最後の区切り文字を探す
-            split_pos = -1
-            for delimiter in delimiters:
-                pos = remaining.rfind(delimiter, 0, max_length)
-                if pos > split_pos:
-                    split_pos = pos
-
-            if split_pos == -1:
+            while j < len(delimiter_ends) and delimiter_ends[j] <= start + max_length:
+                j += 1
+            if j > 0 and delimiter_ends[j - 1] > start:
+                split_end = delimiter_ends[j - 1]
+            else:
                 # 区切り文字が見つからない場合はmax_lengthで強制分割
-                split_pos = max_length - 1
+                split_end = start + max_length
 
-            chunk = remaining[: split_pos + 1].strip()
+            chunk = text[start:split_end].strip()
             if chunk:
                 chunks.append(chunk)
-            remaining = remaining[split_pos + 1 :].strip()
+            start = split_end
 
         return chunks
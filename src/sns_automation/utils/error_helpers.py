@@ -61,22 +61,15 @@ def show_chapter_result_not_found_error(chapter: int):
 
 def show_file_not_found_error(file_path: str, suggestion: str = ""):
     """ファイルが見つからない場合のエラーメッセージ"""
-    message = (
-        f"[bold red]❌ エラー: ファイルが見つかりません[/bold red]\n\n"
-        f"[bold]ファイルパス:[/bold] {file_path}\n\n"
+    suggestion_block = suggestion or (
+        "1. ファイルパスが正しいか確認してください\n"
+        "2. ファイルが存在するか確認してください"
     )
 
-    if suggestion:
-        message += f"[bold yellow]💡 解決方法:[/bold yellow]\n{suggestion}"
-    else:
-        message += (
-            "[bold yellow]💡 解決方法:[/bold yellow]\n"
-            "1. ファイルパスが正しいか確認してください\n"
-            "2. ファイルが存在するか確認してください"
-        )
-
     console.print(Panel(
-        message,
+        f"[bold red]❌ エラー: ファイルが見つかりません[/bold red]\n\n"
+        f"[bold]ファイルパス:[/bold] {file_path}\n\n"
+        f"[bold yellow]💡 解決方法:[/bold yellow]\n{suggestion_block}",
         title="ファイルエラー",
         border_style="red",
     ))
@@ -84,21 +77,14 @@ def show_file_not_found_error(file_path: str, suggestion: str = ""):
 
 def show_invalid_input_error(expected: str, got: str = ""):
     """入力が不正な場合のエラーメッセージ"""
-    message = f"[bold red]❌ エラー: 入力が不正です[/bold red]\n\n"
-
-    if got:
-        message += f"[bold]期待される入力:[/bold] {expected}\n"
-        message += f"[bold]実際の入力:[/bold] {got}\n\n"
-    else:
-        message += f"[bold]期待される入力:[/bold] {expected}\n\n"
-
-    message += (
-        "[bold yellow]💡 解決方法:[/bold yellow]\n"
-        "正しい形式で入力し直してください"
-    )
+    got_line = f"[bold]実際の入力:[/bold] {got}\n" if got else ""
 
     console.print(Panel(
-        message,
+        "[bold red]❌ エラー: 入力が不正です[/bold red]\n\n"
+        f"[bold]期待される入力:[/bold] {expected}\n"
+        f"{got_line}\n"
+        "[bold yellow]💡 解決方法:[/bold yellow]\n"
+        "正しい形式で入力し直してください",
         title="入力エラー",
         border_style="red",
     ))
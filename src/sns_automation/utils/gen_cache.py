@@ -0,0 +1,159 @@
+"""
+生成結果キャッシュ
+
+同一テンプレート・同一プロンプトに対するClaude APIの応答をローカルに保存し、
+再実行時はAPIを呼ばずに応答を返す
+"""
+
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from sns_automation.utils.json_io import read_json, write_json
+
+logger = logging.getLogger(__name__)
+
+# キャッシュに保持する最大エントリ数（超えた場合は古いものから削除）
+DEFAULT_MAX_ENTRIES = 200
+
+# キャッシュファイルごとのロック（同じファイルを使う全インスタンスで共有する）
+_file_locks: Dict[Path, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _lock_for(cache_file: Path) -> threading.Lock:
+    """
+    キャッシュファイルに対応するロックを取得
+
+    Args:
+        cache_file: キャッシュファイルのパス
+
+    Returns:
+        同じファイルに対して常に同じロック
+    """
+    key = cache_file.resolve()
+    with _file_locks_guard:
+        lock = _file_locks.get(key)
+        if lock is None:
+            lock = _file_locks[key] = threading.Lock()
+        return lock
+
+
+class GenCache:
+    """プロンプト完全一致で応答を返す生成キャッシュ"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        初期化
+
+        Args:
+            cache_dir: キャッシュディレクトリ（省略時は ~/.sns-automation/cache）
+            max_entries: 保持する最大エントリ数
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / ".sns-automation" / "cache"
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_file = self.cache_dir / "gen_cache.json"
+        self.max_entries = max_entries
+        # 同じファイルを使う他のインスタンス・スレッドと set() が競合しないようにする
+        self._lock = _lock_for(self.cache_file)
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """キャッシュファイルを読み込む（壊れている場合は空で開始）"""
+        if not self.cache_file.exists():
+            return {}
+
+        try:
+            return read_json(self.cache_file)
+        except Exception as e:
+            logger.warning("生成キャッシュの読み込みに失敗（空のキャッシュで続行）: %s", e)
+            return {}
+
+    def _save(self) -> None:
+        """キャッシュファイルにアトミックに書き込む（失敗しても続行）"""
+        try:
+            write_json(self.cache_file, self._entries, indent=False)
+        except Exception as e:
+            logger.warning("生成キャッシュの保存に失敗: %s", e)
+
+    @staticmethod
+    def make_key(template_id: str, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        キャッシュキーを生成
+
+        Args:
+            template_id: テンプレートID（例: "chapter1/concept_generation"）
+            prompt: 変数展開済みのユーザープロンプト
+            system_prompt: システムプロンプト
+
+        Returns:
+            SHA-256ハッシュ文字列
+        """
+        payload = "\x00".join([template_id, system_prompt or "", prompt])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(
+        self, template_id: str, prompt: str, system_prompt: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        キャッシュされた応答を取得
+
+        Args:
+            template_id: テンプレートID
+            prompt: ユーザープロンプト
+            system_prompt: システムプロンプト
+
+        Returns:
+            応答テキスト（キャッシュにない場合はNone）
+        """
+        entry = self._entries.get(self.make_key(template_id, prompt, system_prompt))
+        if entry is None:
+            return None
+
+        logger.info("生成キャッシュにヒットしました: %s", template_id)
+        return entry["response"]
+
+    def set(
+        self,
+        template_id: str,
+        prompt: str,
+        response: str,
+        system_prompt: Optional[str] = None,
+    ) -> None:
+        """
+        応答をキャッシュに保存
+
+        Args:
+            template_id: テンプレートID
+            prompt: ユーザープロンプト
+            response: 応答テキスト
+            system_prompt: システムプロンプト
+        """
+        key = self.make_key(template_id, prompt, system_prompt)
+
+        with self._lock:
+            # 他のインスタンス（別チャプター・別プロセス）が保存したエントリを失わないよう、
+            # ファイルの最新内容に追加してから書き戻す
+            self._entries = self._load()
+
+            # 上書き時も最新として末尾に移動させる
+            self._entries.pop(key, None)
+            self._entries[key] = {"template_id": template_id, "response": response}
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                del self._entries[oldest_key]
+
+            self._save()
+
+    def clear(self) -> None:
+        """キャッシュを全削除"""
+        with self._lock:
+            self._entries = {}
+            if self.cache_file.exists():
+                self.cache_file.unlink()
@@ -4,12 +4,18 @@
 生成された企画の傾向を分析し、バランスをチェックする
 """
 
-from typing import List, Dict, Any
+import re
+from typing import Callable, List, Dict, Any, Sequence, Set, Tuple
 from collections import Counter
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 console = Console()
 
 
@@ -36,7 +42,23 @@ class IdeaAnalyzer:
         Returns:
             分析結果
         """
-        if not ideas:
+        return self.analyze_arrays(
+            [idea.get("title", "") for idea in ideas],
+            [idea.get("summary", "") for idea in ideas],
+        )
+
+    def analyze_arrays(self, titles: Sequence[str], summaries: Sequence[str]) -> Dict[str, Any]:
+        """
+        企画のタイトル・要約の並列リストを分析
+
+        Args:
+            titles: 企画タイトルのリスト
+            summaries: titles と同じ順の要約のリスト
+
+        Returns:
+            分析結果
+        """
+        if not titles:
             return {
                 "total_count": 0,
                 "appeal_distribution": {},
@@ -44,29 +66,26 @@ class IdeaAnalyzer:
                 "warnings": ["企画が生成されていません"],
             }
 
-        # 各企画の訴求タイプを分類
+        # 各企画の訴求タイプを分類し、分布も同時に数える
+        keyword_types, find_keywords = _get_appeal_index(self.APPEAL_KEYWORDS)
         appeal_types = []
-        for idea in ideas:
-            title = idea.get("title", "")
-            summary = idea.get("summary", "")
+        appeal_distribution: Counter = Counter()
+        for title, summary in zip(titles, summaries):
             combined_text = title + " " + summary
 
-            # 最も多くマッチしたキーワードの訴求タイプを採用
-            matches = {}
-            for appeal_type, keywords in self.APPEAL_KEYWORDS.items():
-                count = sum(1 for keyword in keywords if keyword in combined_text)
-                if count > 0:
-                    matches[appeal_type] = count
-
-            if matches:
-                # 最も多くマッチした訴求タイプ
-                primary_type = max(matches, key=matches.get)
-                appeal_types.append(primary_type)
-            else:
-                appeal_types.append("その他")
+            # 含まれるキーワードを1回の走査で検出し、訴求タイプごとに数える
+            # （同じキーワードが何度出ても1件として数える）
+            hits: Counter = Counter()
+            for keyword in find_keywords(combined_text):
+                hits.update(keyword_types[keyword])
 
-        # 訴求タイプの分布を計算
-        appeal_distribution = Counter(appeal_types)
+            if hits:
+                # 最も多くマッチした訴求タイプ（同数なら APPEAL_KEYWORDS の順で先のもの）
+                primary_type = max(self.APPEAL_KEYWORDS, key=hits.__getitem__)
+            else:
+                primary_type = "その他"
+            appeal_types.append(primary_type)
+            appeal_distribution[primary_type] += 1
 
         # バランスチェック
         warnings = []
@@ -74,7 +93,7 @@ class IdeaAnalyzer:
 
         # 1つの訴求タイプが50%以上の場合は警告
         for appeal_type, count in appeal_distribution.items():
-            percentage = (count / len(ideas)) * 100
+            percentage = (count / len(titles)) * 100
             if percentage > 50:
                 warnings.append(f"「{appeal_type}」が{percentage:.0f}%を占めています（バランスが偏っています）")
                 is_balanced = False
@@ -85,7 +104,7 @@ class IdeaAnalyzer:
             is_balanced = False
 
         return {
-            "total_count": len(ideas),
+            "total_count": len(titles),
             "appeal_distribution": dict(appeal_distribution),
             "appeal_types": appeal_types,
             "is_balanced": is_balanced,
@@ -158,3 +177,63 @@ class IdeaAnalyzer:
             return True
 
         return False
+
+
+# 訴求キーワード辞書ごとの (キーワード → 訴求タイプ, キーワード検出関数)
+_appeal_indexes: Dict[int, Tuple[Dict[str, Tuple[str, ...]], Callable[[str], Set[str]]]] = {}
+
+
+def _get_appeal_index(
+    appeal_keywords: Dict[str, List[str]],
+) -> Tuple[Dict[str, Tuple[str, ...]], Callable[[str], Set[str]]]:
+    """
+    訴求キーワードの逆引きインデックスと検出関数を取得（初回のみ構築）
+
+    検出には pyahocorasick があれば Aho-Corasick オートマトンを、
+    なければ全キーワードの正規表現を使い、いずれもテキストを1回だけ走査する。
+
+    Args:
+        appeal_keywords: {訴求タイプ: キーワードのリスト}
+
+    Returns:
+        ({キーワード: 訴求タイプのタプル}, テキストに含まれるキーワードの集合を返す関数)
+    """
+    index = _appeal_indexes.get(id(appeal_keywords))
+    if index is not None:
+        return index
+
+    # 同じキーワードが複数の訴求タイプにある場合はそれぞれに数える
+    keyword_lists: Dict[str, List[str]] = {}
+    for appeal_type, keywords in appeal_keywords.items():
+        for keyword in keywords:
+            keyword_lists.setdefault(keyword, []).append(appeal_type)
+    keyword_types = {keyword: tuple(types) for keyword, types in keyword_lists.items()}
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keyword_types:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+
+        def find_keywords(text: str) -> Set[str]:
+            return {keyword for _, keyword in automaton.iter(text)}
+    else:
+        # 先読みで各位置から始まる最長のキーワードを拾い、重なり合う出現も漏らさない。
+        # 同じ位置から始まる短いキーワード（前方一致するもの）は prefixes で補う
+        ordered = sorted(keyword_types, key=len, reverse=True)
+        pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+        prefixes = {
+            keyword: [other for other in ordered if keyword.startswith(other)]
+            for keyword in ordered
+        }
+
+        def find_keywords(text: str) -> Set[str]:
+            return {
+                prefix
+                for match in pattern.finditer(text)
+                for prefix in prefixes[match.group(1)]
+            }
+
+    index = (keyword_types, find_keywords)
+    _appeal_indexes[id(appeal_keywords)] = index
+    return index
@@ -2,31 +2,77 @@
 動画から静止画を抽出するユーティリティ（ffmpeg使用）
 """
 
+import io
 import logging
+import os
 import shutil
 import subprocess
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from pathlib import Path
 
+from PIL import Image
+
+try:
+    import av
+except ImportError:
+    av = None
+
 logger = logging.getLogger(__name__)
 
-SUPPORTED_VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".flv", ".wmv"}
+SUPPORTED_VIDEO_EXTENSIONS = frozenset({".mp4", ".mov", ".avi", ".mkv", ".webm", ".flv", ".wmv"})
+
+# 抽出するフレームの長辺の上限（px）。Vision API に送る画像サイズを抑える
+MAX_FRAME_SIZE = 1280
+
+# JPEGの画質。アップロード量と画像トークンを抑えつつ、テロップが読める程度に圧縮する
+# （ffmpeg の -q:v は 2〜31 で小さいほど高画質、Pillow の quality は 1〜95）
+JPEG_QSCALE = 3
+JPEG_QUALITY = 85
+
+# PyAV がインストールされていれば、ffmpeg を起動せずプロセス内でデコードする
+PYAV_AVAILABLE = av is not None
+
+# JPEGの開始（SOI）・終了（EOI）マーカー
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
 
 
-def _check_ffmpeg() -> None:
-    """ffmpegがインストールされているか確認する"""
-    if shutil.which("ffmpeg") is None:
+@lru_cache(maxsize=1)
+def _check_ffmpeg() -> str:
+    """
+    ffmpegがインストールされているか確認する
+
+    見つかった場合は結果をキャッシュする（返したパスで起動すれば、以降は PATH を探索しない）。
+
+    Returns:
+        ffmpeg の絶対パス
+    """
+    path = shutil.which("ffmpeg")
+    if path is None:
         raise RuntimeError(
             "ffmpegが見つかりません。インストールしてください: brew install ffmpeg"
         )
+    return path
 
 
-def _check_ffprobe() -> None:
-    """ffprobeがインストールされているか確認する"""
-    if shutil.which("ffprobe") is None:
+@lru_cache(maxsize=1)
+def _check_ffprobe() -> str:
+    """
+    ffprobeがインストールされているか確認する
+
+    見つかった場合は結果をキャッシュする（返したパスで起動すれば、以降は PATH を探索しない）。
+
+    Returns:
+        ffprobe の絶対パス
+    """
+    path = shutil.which("ffprobe")
+    if path is None:
         raise RuntimeError(
             "ffprobeが見つかりません。ffmpegと一緒にインストールしてください: brew install ffmpeg"
         )
+    return path
 
 
 def _validate_video_file(video_path: Path) -> None:
@@ -41,6 +87,30 @@ def _validate_video_file(video_path: Path) -> None:
         )
 
 
+def list_video_files(video_dir: Path) -> List[Path]:
+    """
+    ディレクトリ直下の動画ファイルをファイル名順に取得
+
+    os.scandir のエントリが持つ種別情報を使うため、
+    ファイルごとの stat 呼び出しが発生しない（シンボリックリンクを除く）。
+
+    Args:
+        video_dir: 動画ディレクトリ
+
+    Returns:
+        動画ファイルパスのリスト
+    """
+    with os.scandir(video_dir) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if entry.is_file()
+            and os.path.splitext(entry.name)[1].lower() in SUPPORTED_VIDEO_EXTENSIONS
+        )
+    video_dir = Path(video_dir)
+    return [video_dir / name for name in names]
+
+
 def get_video_duration(video_path: Path) -> float:
     """
     動画の長さを取得
@@ -51,12 +121,12 @@ def get_video_duration(video_path: Path) -> float:
     Returns:
         動画の長さ（秒）
     """
-    _check_ffprobe()
+    ffprobe = _check_ffprobe()
     _validate_video_file(video_path)
 
     result = subprocess.run(
         [
-            "ffprobe",
+            ffprobe,
             "-v", "error",
             "-show_entries", "format=duration",
             "-of", "default=noprint_wrappers=1:nokey=1",
@@ -80,6 +150,72 @@ def get_video_duration(video_path: Path) -> float:
         )
 
 
+def _frame_schedule(duration: float, num_frames: int) -> Tuple[float, float]:
+    """
+    等間隔抽出の時刻を計算
+
+    Args:
+        duration: 動画の長さ（秒）
+        num_frames: 抽出するフレーム数
+
+    Returns:
+        (1枚目の時刻, 2枚目以降の間隔) のタプル（秒）
+    """
+    interval = duration / (num_frames + 1)
+    first_time = duration / 2 if num_frames == 1 else interval
+    return first_time, interval
+
+
+def _frame_filter(first_time: float, interval: float) -> str:
+    """
+    フレーム選択・縮小用の ffmpeg フィルタ文字列を組み立てる
+
+    1枚目を first_time で選び、以降は interval 秒ごとに1枚選ぶ。
+    長辺が MAX_FRAME_SIZE を超える場合は縦横比を保って縮小する。
+
+    Args:
+        first_time: 1枚目の時刻（秒）
+        interval: 2枚目以降の間隔（秒）
+
+    Returns:
+        -vf に渡すフィルタ文字列
+    """
+    select_expr = (
+        f"gte(t\\,{first_time:.3f})"
+        f"*(isnan(prev_selected_t)+gte(t-prev_selected_t\\,{interval:.3f}))"
+    )
+    scale_expr = (
+        f"scale=w='min({MAX_FRAME_SIZE}\\,iw)':h='min({MAX_FRAME_SIZE}\\,ih)'"
+        ":force_original_aspect_ratio=decrease"
+    )
+    return f"select='{select_expr}',{scale_expr}"
+
+
+def _split_jpeg_stream(data: bytes) -> List[bytes]:
+    """
+    連結されたJPEGのバイト列を1枚ずつに分割
+
+    SOI（FF D8）から次の EOI（FF D9）までを1枚とみなす。
+    ffmpeg の mjpeg 出力はサムネイルを埋め込まないため、この区切りで分割できる。
+
+    Args:
+        data: ffmpeg の image2pipe 出力
+
+    Returns:
+        JPEGバイト列のリスト
+    """
+    frames: List[bytes] = []
+    start = data.find(JPEG_SOI)
+    while start != -1:
+        end = data.find(JPEG_EOI, start + len(JPEG_SOI))
+        if end == -1:
+            break
+        end += len(JPEG_EOI)
+        frames.append(data[start:end])
+        start = data.find(JPEG_SOI, end)
+    return frames
+
+
 def extract_frames(
     video_path: Path,
     output_dir: Path,
@@ -88,6 +224,8 @@ def extract_frames(
     """
     動画から等間隔で静止画を抽出
 
+    ffmpeg は1回だけ起動し、select フィルタで対象時刻のフレームをまとめて書き出す。
+
     Args:
         video_path: 動画ファイルパス
         output_dir: 出力ディレクトリ
@@ -96,7 +234,7 @@ def extract_frames(
     Returns:
         抽出された画像ファイルパスのリスト
     """
-    _check_ffmpeg()
+    ffmpeg = _check_ffmpeg()
     _validate_video_file(video_path)
 
     if num_frames < 1:
@@ -112,41 +250,44 @@ def extract_frames(
 
     video_name = video_path.stem
 
-    extracted_paths: List[Path] = []
+    first_time, interval = _frame_schedule(duration, num_frames)
 
-    for i in range(num_frames):
-        if num_frames == 1:
-            timestamp = duration / 2
-        else:
-            timestamp = (duration / (num_frames + 1)) * (i + 1)
-
-        output_path = output_dir / f"{video_name}_frame_{i:03d}.png"
-
-        result = subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-ss", str(timestamp),
-                "-i", str(video_path),
-                "-frames:v", "1",
-                "-q:v", "2",
-                str(output_path),
-            ],
-            capture_output=True,
-            text=True,
-        )
+    output_paths = [
+        output_dir / f"{video_name}_frame_{i:03d}.png" for i in range(num_frames)
+    ]
+    # 前回の抽出結果が残っていると成功扱いになるため、先に削除しておく
+    for output_path in output_paths:
+        output_path.unlink(missing_ok=True)
 
-        if result.returncode != 0:
-            logger.warning(
-                "フレーム %d の抽出に失敗しました (timestamp=%.2f): %s",
-                i, timestamp, result.stderr.strip(),
-            )
-            continue
+    # 1回の ffmpeg 起動・1回のデコードで全フレームを抽出する
+    result = subprocess.run(
+        [
+            ffmpeg,
+            "-y",
+            "-i", str(video_path),
+            "-vf", _frame_filter(first_time, interval),
+            "-vsync", "0",
+            "-frames:v", str(num_frames),
+            "-start_number", "0",
+            "-q:v", "2",
+            str(output_dir / f"{video_name}_frame_%03d.png"),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        logger.warning(
+            "フレームの抽出に失敗しました: %s: %s", video_path.name, result.stderr.strip()
+        )
 
+    extracted_paths: List[Path] = []
+    for i, output_path in enumerate(output_paths):
         if output_path.exists():
             extracted_paths.append(output_path)
             logger.info(
-                "フレーム抽出: %s (timestamp=%.2f秒)", output_path.name, timestamp
+                "フレーム抽出: %s (timestamp=%.2f秒)",
+                output_path.name, first_time + interval * i,
             )
 
     if not extracted_paths:
@@ -162,21 +303,244 @@ def extract_frames(
     return extracted_paths
 
 
+def extract_frames_pyav(video_path: Path, num_frames: int = 5) -> List[bytes]:
+    """
+    PyAV で動画から等間隔で静止画を抽出し、JPEGバイト列で返す
+
+    コンテナを1回だけ開き、各時刻の直前のキーフレームにシークしてから
+    目的の時刻までデコードする。サブプロセスを起動しない。
+
+    Args:
+        video_path: 動画ファイルパス
+        num_frames: 抽出するフレーム数
+
+    Returns:
+        JPEGバイト列のリスト
+
+    Raises:
+        RuntimeError: PyAV がインストールされていない場合
+    """
+    if av is None:
+        raise RuntimeError("PyAVがインストールされていません: pip install av")
+
+    _validate_video_file(video_path)
+
+    if num_frames < 1:
+        raise ValueError("num_framesは1以上である必要があります")
+
+    container = av.open(str(video_path))
+    try:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+
+        if stream.duration is not None:
+            duration = float(stream.duration * stream.time_base)
+        else:
+            duration = container.duration / av.time_base
+        if duration <= 0:
+            raise RuntimeError(f"動画の長さが不正です: {duration}秒")
+
+        first_time, interval = _frame_schedule(duration, num_frames)
+
+        frames: List[bytes] = []
+        for i in range(num_frames):
+            timestamp = first_time + interval * i
+            container.seek(int(timestamp / stream.time_base), stream=stream)
+            for frame in container.decode(stream):
+                if frame.time is not None and frame.time < timestamp:
+                    continue
+                image = frame.to_image()
+                image.thumbnail((MAX_FRAME_SIZE, MAX_FRAME_SIZE), Image.LANCZOS)
+                buffer = io.BytesIO()
+                image.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+                frames.append(buffer.getvalue())
+                break
+    finally:
+        container.close()
+
+    if not frames:
+        raise RuntimeError(
+            f"フレームを1つも抽出できませんでした: {video_path}"
+        )
+
+    logger.info(
+        "%s から %d/%d フレームを抽出しました (PyAV)",
+        Path(video_path).name, len(frames), num_frames,
+    )
+
+    return frames
+
+
+def extract_frames_bytes(video_path: Path, num_frames: int = 5) -> List[bytes]:
+    """
+    動画から等間隔で静止画を抽出し、ファイルに保存せずJPEGバイト列で返す
+
+    PyAV がインストールされていればプロセス内でデコードする。
+    それ以外は ffmpeg の標準出力（image2pipe）から直接読み取るため、
+    いずれもフレームごとのファイル書き込み・読み込みが発生しない。
+
+    Args:
+        video_path: 動画ファイルパス
+        num_frames: 抽出するフレーム数
+
+    Returns:
+        JPEGバイト列のリスト
+    """
+    if av is not None:
+        try:
+            return extract_frames_pyav(video_path, num_frames)
+        except Exception as e:
+            logger.warning("PyAVでの抽出に失敗したため、ffmpegで抽出します: %s", e)
+
+    ffmpeg = _check_ffmpeg()
+    _validate_video_file(video_path)
+
+    if num_frames < 1:
+        raise ValueError("num_framesは1以上である必要があります")
+
+    video_path = Path(video_path).resolve()
+
+    duration = get_video_duration(video_path)
+    if duration <= 0:
+        raise RuntimeError(f"動画の長さが不正です: {duration}秒")
+
+    first_time, interval = _frame_schedule(duration, num_frames)
+
+    result = subprocess.run(
+        [
+            ffmpeg,
+            "-i", str(video_path),
+            "-vf", _frame_filter(first_time, interval),
+            "-vsync", "0",
+            "-frames:v", str(num_frames),
+            "-f", "image2pipe",
+            "-vcodec", "mjpeg",
+            "-q:v", str(JPEG_QSCALE),
+            "-",
+        ],
+        capture_output=True,
+    )
+
+    if result.returncode != 0:
+        logger.warning(
+            "フレームの抽出に失敗しました: %s: %s",
+            video_path.name, result.stderr.decode("utf-8", errors="replace").strip(),
+        )
+
+    frames = _split_jpeg_stream(result.stdout)
+    if not frames:
+        raise RuntimeError(
+            f"フレームを1つも抽出できませんでした: {video_path}"
+        )
+
+    logger.info(
+        "%s から %d/%d フレームを抽出しました",
+        video_path.name, len(frames), num_frames,
+    )
+
+    return frames
+
+
+def extract_frames_multi(
+    video_paths: List[Path],
+    output_dirs: List[Path],
+    num_frames: int = 5,
+    image_format: str = "png",
+) -> List[List[Path]]:
+    """
+    複数の動画から等間隔で静止画を抽出（ffmpeg は全動画で1回だけ起動）
+
+    各動画を別々の入力として渡し、filter_complex で動画ごとに
+    フレームを選択して、それぞれの出力ディレクトリに書き出す。
+
+    Args:
+        video_paths: 動画ファイルパスのリスト
+        output_dirs: 動画ごとの出力ディレクトリのリスト
+        num_frames: 1動画あたりの抽出フレーム数
+        image_format: 出力画像の拡張子（"png" または "jpg"）
+
+    Returns:
+        動画ごとの画像ファイルパスのリスト（video_paths と同じ順序）
+
+    Raises:
+        RuntimeError: ffmpeg の実行に失敗した場合
+    """
+    ffmpeg = _check_ffmpeg()
+
+    if num_frames < 1:
+        raise ValueError("num_framesは1以上である必要があります")
+
+    inputs: List[str] = []
+    filters: List[str] = []
+    outputs: List[str] = []
+    all_paths: List[List[Path]] = []
+
+    for i, (video_path, output_dir) in enumerate(zip(video_paths, output_dirs)):
+        _validate_video_file(video_path)
+        video_path = Path(video_path).resolve()
+        output_dir = Path(output_dir).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        duration = get_video_duration(video_path)
+        if duration <= 0:
+            raise RuntimeError(f"動画の長さが不正です: {video_path.name} ({duration}秒)")
+
+        first_time, interval = _frame_schedule(duration, num_frames)
+
+        paths = [
+            output_dir / f"{video_path.stem}_frame_{j:03d}.{image_format}"
+            for j in range(num_frames)
+        ]
+        for path in paths:
+            path.unlink(missing_ok=True)
+        all_paths.append(paths)
+
+        inputs += ["-i", str(video_path)]
+        filters.append(f"[{i}:v]{_frame_filter(first_time, interval)}[v{i}]")
+        outputs += [
+            "-map", f"[v{i}]",
+            "-vsync", "0",
+            "-frames:v", str(num_frames),
+            "-start_number", "0",
+            "-q:v", str(JPEG_QSCALE),
+            str(output_dir / f"{video_path.stem}_frame_%03d.{image_format}"),
+        ]
+
+    result = subprocess.run(
+        [ffmpeg, "-y", *inputs, "-filter_complex", ";".join(filters), *outputs],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"フレームの一括抽出に失敗しました: {result.stderr.strip()}"
+        )
+
+    logger.info("%d 件の動画からフレームを一括抽出しました", len(all_paths))
+
+    return [[path for path in paths if path.exists()] for paths in all_paths]
+
+
 def batch_extract(
     video_dir: Path,
     output_dir: Path,
     num_frames: int = 5,
+    max_workers: Optional[int] = None,
 ) -> dict[str, List[Path]]:
     """
     ディレクトリ内の全動画から静止画を抽出
 
+    処理の大半は ffmpeg のサブプロセス待ちのため、複数の動画をスレッドで並列に抽出する。
+
     Args:
         video_dir: 動画ディレクトリ
         output_dir: 出力ディレクトリ
         num_frames: 抽出するフレーム数
+        max_workers: 同時に抽出する動画数（省略時はCPUコア数の半分。ffmpeg自体もマルチスレッドのため）
 
     Returns:
-        {動画名: 画像パスリスト} の辞書
+        {動画名: 画像パスリスト} の辞書（ファイル名順）
     """
     video_dir = Path(video_dir).resolve()
     output_dir = Path(output_dir).resolve()
@@ -187,10 +551,7 @@ def batch_extract(
     if not video_dir.is_dir():
         raise NotADirectoryError(f"ディレクトリではありません: {video_dir}")
 
-    video_files = sorted(
-        f for f in video_dir.iterdir()
-        if f.is_file() and f.suffix.lower() in SUPPORTED_VIDEO_EXTENSIONS
-    )
+    video_files = list_video_files(video_dir)
 
     if not video_files:
         logger.warning("動画ファイルが見つかりません: %s", video_dir)
@@ -198,16 +559,25 @@ def batch_extract(
 
     logger.info("%d 件の動画ファイルを処理します", len(video_files))
 
-    results: dict[str, List[Path]] = {}
-
-    for video_file in video_files:
-        video_output_dir = output_dir / video_file.stem
-        try:
-            frames = extract_frames(video_file, video_output_dir, num_frames)
-            results[video_file.name] = frames
-        except Exception:
-            logger.exception("動画の処理に失敗しました: %s", video_file.name)
-            results[video_file.name] = []
+    # 完了順に関わらずファイル名順で返すため、先にキーを並べておく
+    results: dict[str, List[Path]] = {video_file.name: [] for video_file in video_files}
+
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(video_files))) as executor:
+        futures = {
+            executor.submit(
+                extract_frames, video_file, output_dir / video_file.stem, num_frames
+            ): video_file
+            for video_file in video_files
+        }
+        for future in as_completed(futures):
+            video_file = futures[future]
+            try:
+                results[video_file.name] = future.result()
+            except Exception:
+                logger.exception("動画の処理に失敗しました: %s", video_file.name)
 
     logger.info(
         "バッチ処理完了: %d/%d 件成功",
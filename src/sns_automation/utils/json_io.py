@@ -0,0 +1,73 @@
+"""
+JSONファイルの読み書きユーティリティ
+
+orjson がインストールされていればそちらを使用し、なければ標準の json にフォールバックする
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(data: Any, indent: bool = True) -> bytes:
+    """
+    データをUTF-8のJSONバイト列に変換
+
+    Args:
+        data: 変換するデータ
+        indent: 2スペースでインデントするか
+
+    Returns:
+        JSONバイト列（日本語はエスケープしない）
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def read_json(path: Path) -> Any:
+    """
+    JSONファイルを読み込む
+
+    Args:
+        path: 入力ファイルパス
+
+    Returns:
+        読み込んだデータ
+    """
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: Path, data: Any, indent: bool = True) -> None:
+    """
+    データをJSONファイルにアトミックに書き込む
+
+    一時ファイルに書き込んでから os.replace で置き換えるため、
+    書き込み途中でプロセスが終了しても既存ファイルが壊れない。
+
+    Args:
+        path: 出力ファイルパス
+        data: 書き込むデータ
+        indent: 2スペースでインデントするか
+    """
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        tmp_path.write_bytes(dumps_json(data, indent=indent))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -5,40 +5,92 @@ SNSコンテンツ向けの品質基準をチェックします。
 """
 
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, NamedTuple, Tuple
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# AIっぽい表現パターン
+AI_PATTERNS = [
+    r"〜することで",
+    r"〜することができます",
+    r"〜してみましょう",
+    r"重要なポイント",
+    r"効果的な",
+    r"最適な",
+    r"ぜひ.*してみてください",
+    r"いかがでしたか",
+]
+
+# 各チェックで使う正規表現（ScriptLinter は呼び出しごとに作られるため、モジュール読み込み時に1回だけコンパイル）
+_AI_PATTERN_RES = [re.compile(pattern) for pattern in AI_PATTERNS]
+# いずれかのAIっぽい表現を含むかを1回の走査で判定する結合パターン
+_AI_ANY_RE = re.compile("|".join(f"(?:{pattern})" for pattern in AI_PATTERNS))
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+# 口調の判定（グループ1: です・ます調、グループ2: だ・である調）
+_TONE_RE = re.compile(r"(です[。、]|ます[。、])|(だ[。、]|である[。、])")
+
+# 禁止フレーズ
+FORBIDDEN_PHRASES = [
+    "AI",
+    "Claude",
+    "生成しました",
+    "自動生成",
+    "プロンプト",
+    "GPT",
+    "ChatGPT",
+]
+
+
+def _build_phrase_automaton(phrases: List[str]):
+    """
+    フレーズ一覧の Aho-Corasick オートマトンを構築
+
+    Args:
+        phrases: 検出するフレーズのリスト
+
+    Returns:
+        値がフレーズ自身のオートマトン（pyahocorasick 未インストール時はNone）
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+# 禁止フレーズを1回の走査で全て検出するオートマトン
+_FORBIDDEN_AUTOMATON = _build_phrase_automaton(FORBIDDEN_PHRASES)
+
+
+class Violation(NamedTuple):
+    """チェックで検出された1件のエラー・警告"""
+
+    type: str
+    context: str
+    message: str
+    suggestion: str
+
 
 class ScriptLinter:
     """台本の品質をチェックするLinter"""
 
     def __init__(self):
         """初期化"""
-        self.errors: List[Dict[str, str]] = []
-        self.warnings: List[Dict[str, str]] = []
-
-        # AIっぽい表現パターン
-        self.ai_patterns = [
-            r"〜することで",
-            r"〜することができます",
-            r"〜してみましょう",
-            r"重要なポイント",
-            r"効果的な",
-            r"最適な",
-            r"ぜひ.*してみてください",
-            r"いかがでしたか",
-        ]
+        self.errors: List[Violation] = []
+        self.warnings: List[Violation] = []
+
+        # AIっぽい表現パターン（コンパイル済み）
+        self.ai_patterns = _AI_PATTERN_RES
 
         # 禁止フレーズ
-        self.forbidden_phrases = [
-            "AI",
-            "Claude",
-            "生成しました",
-            "自動生成",
-            "プロンプト",
-            "GPT",
-            "ChatGPT",
-        ]
+        self.forbidden_phrases = FORBIDDEN_PHRASES
 
     def check_script(self, script_text: str, narration: str) -> Dict[str, any]:
         """
@@ -75,73 +127,86 @@ class ScriptLinter:
     def _check_bold_usage(self, text: str, context: str = "台本") -> None:
         """太字（**）の使用をチェック"""
         if "**" in text:
-            matches = re.finditer(r"\*\*(.*?)\*\*", text)
+            matches = _BOLD_RE.finditer(text)
             for match in matches:
-                self.errors.append({
-                    "type": "bold_usage",
-                    "context": context,
-                    "message": f"太字が使用されています: {match.group(1)}",
-                    "suggestion": "太字を削除してください（AIっぽさを避けるため）",
-                })
+                self.errors.append(Violation(
+                    type="bold_usage",
+                    context=context,
+                    message=f"太字が使用されています: {match.group(1)}",
+                    suggestion="太字を削除してください（AIっぽさを避けるため）",
+                ))
 
     def _check_ai_patterns(self, text: str, context: str = "台本") -> None:
         """AIっぽい表現をチェック"""
+        # 大半の台本はどのパターンも含まないため、まず1回の走査で有無だけ確認する
+        if not _AI_ANY_RE.search(text):
+            return
+
         for pattern in self.ai_patterns:
-            matches = re.finditer(pattern, text)
+            matches = pattern.finditer(text)
             for match in matches:
-                self.warnings.append({
-                    "type": "ai_pattern",
-                    "context": context,
-                    "message": f"AIっぽい表現が含まれています: {match.group(0)}",
-                    "suggestion": "より自然な口語表現に変更を検討してください",
-                })
+                self.warnings.append(Violation(
+                    type="ai_pattern",
+                    context=context,
+                    message=f"AIっぽい表現が含まれています: {match.group(0)}",
+                    suggestion="より自然な口語表現に変更を検討してください",
+                ))
 
     def _check_narration_length(self, narration: str) -> None:
         """ナレーションの文字数をチェック"""
         length = len(narration.strip())
 
         if length < 100:
-            self.warnings.append({
-                "type": "narration_length",
-                "context": "ナレーション",
-                "message": f"ナレーションが短すぎます（{length}文字）",
-                "suggestion": "最低100文字以上のナレーションを推奨します",
-            })
+            self.warnings.append(Violation(
+                type="narration_length",
+                context="ナレーション",
+                message=f"ナレーションが短すぎます（{length}文字）",
+                suggestion="最低100文字以上のナレーションを推奨します",
+            ))
         elif length > 2000:
-            self.warnings.append({
-                "type": "narration_length",
-                "context": "ナレーション",
-                "message": f"ナレーションが長すぎます（{length}文字）",
-                "suggestion": "2000文字以下に収めることを推奨します（音声時間の制約）",
-            })
+            self.warnings.append(Violation(
+                type="narration_length",
+                context="ナレーション",
+                message=f"ナレーションが長すぎます（{length}文字）",
+                suggestion="2000文字以下に収めることを推奨します（音声時間の制約）",
+            ))
 
     def _check_forbidden_phrases(self, text: str, context: str = "台本") -> None:
         """禁止フレーズをチェック"""
+        if _FORBIDDEN_AUTOMATON is not None:
+            # 全フレーズを1回の走査で検出する（報告はフレーズ一覧の順）
+            found = {phrase for _, phrase in _FORBIDDEN_AUTOMATON.iter(text)}
+        else:
+            found = {phrase for phrase in self.forbidden_phrases if phrase in text}
+
         for phrase in self.forbidden_phrases:
-            if phrase in text:
-                self.errors.append({
-                    "type": "forbidden_phrase",
-                    "context": context,
-                    "message": f"禁止フレーズが含まれています: {phrase}",
-                    "suggestion": "メタ表現（AI、生成等）は削除してください",
-                })
+            if phrase in found:
+                self.errors.append(Violation(
+                    type="forbidden_phrase",
+                    context=context,
+                    message=f"禁止フレーズが含まれています: {phrase}",
+                    suggestion="メタ表現（AI、生成等）は削除してください",
+                ))
 
     def _check_tone_consistency(self, narration: str) -> None:
         """口調の一貫性をチェック"""
-        # 「です・ます」調のカウント
-        desu_masu_count = len(re.findall(r"です[。、]|ます[。、]", narration))
-
-        # 「だ・である」調のカウント
-        da_dearu_count = len(re.findall(r"だ[。、]|である[。、]", narration))
+        # 「です・ます」調と「だ・である」調を1回の走査でカウント
+        desu_masu_count = 0
+        da_dearu_count = 0
+        for match in _TONE_RE.finditer(narration):
+            if match.group(1):
+                desu_masu_count += 1
+            else:
+                da_dearu_count += 1
 
         # 両方が混在している場合は警告
         if desu_masu_count > 0 and da_dearu_count > 0:
-            self.warnings.append({
-                "type": "tone_inconsistency",
-                "context": "ナレーション",
-                "message": f"「です・ます」調と「だ・である」調が混在しています（です・ます: {desu_masu_count}箇所、だ・である: {da_dearu_count}箇所）",
-                "suggestion": "統一された口調に修正してください",
-            })
+            self.warnings.append(Violation(
+                type="tone_inconsistency",
+                context="ナレーション",
+                message=f"「です・ます」調と「だ・である」調が混在しています（です・ます: {desu_masu_count}箇所、だ・である: {da_dearu_count}箇所）",
+                suggestion="統一された口調に修正してください",
+            ))
 
     def format_results(self, results: Dict[str, any]) -> str:
         """
@@ -164,8 +229,8 @@ class ScriptLinter:
             lines.append(f"❌ エラー: {results['error_count']}件")
             lines.append("")
             for i, error in enumerate(results["errors"], 1):
-                lines.append(f"{i}. [{error['context']}] {error['message']}")
-                lines.append(f"   💡 {error['suggestion']}")
+                lines.append(f"{i}. [{error.context}] {error.message}")
+                lines.append(f"   💡 {error.suggestion}")
                 lines.append("")
 
         # 警告
@@ -173,8 +238,8 @@ class ScriptLinter:
             lines.append(f"⚠️  警告: {results['warning_count']}件")
             lines.append("")
             for i, warning in enumerate(results["warnings"], 1):
-                lines.append(f"{i}. [{warning['context']}] {warning['message']}")
-                lines.append(f"   💡 {warning['suggestion']}")
+                lines.append(f"{i}. [{warning.context}] {warning.message}")
+                lines.append(f"   💡 {warning.suggestion}")
                 lines.append("")
 
         # 合格判定
@@ -3,11 +3,60 @@
 """
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from jinja2 import Environment, FileSystemLoader, Template
 
 
+@lru_cache(maxsize=64)
+def _compile_template(source: str) -> Template:
+    """
+    テンプレート文字列をコンパイル（同じ文字列は再パースしない）
+
+    テンプレート本文そのものをキーにするため、reload() で内容が変わった場合は
+    自動的に新しいテンプレートがコンパイルされる。
+
+    Args:
+        source: Jinja2テンプレート文字列
+
+    Returns:
+        コンパイル済みテンプレート
+    """
+    return Template(source)
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml(path: str, mtime_ns: int) -> Any:
+    """
+    YAMLファイルを読み込んでパース（同じ更新時刻のファイルは再パースしない）
+
+    更新時刻をキーに含めるため、ファイルが編集された場合のみ読み直される。
+
+    Args:
+        path: YAMLファイルのパス
+        mtime_ns: ファイルの更新時刻（ナノ秒）
+
+    Returns:
+        パース結果
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _load_yaml(path: Path) -> Any:
+    """
+    YAMLファイルをキャッシュ経由で読み込む
+
+    Args:
+        path: YAMLファイルのパス
+
+    Returns:
+        パース結果
+    """
+    return _parse_yaml(str(path), path.stat().st_mtime_ns)
+
+
 class PromptLoader:
     """プロンプトテンプレートを読み込み・管理するクラス"""
 
@@ -80,24 +129,16 @@ class PromptLoader:
 
         # 後方互換性：prompts.yamlが存在する場合はそちらを使用
         if prompts_file.exists():
-            with open(prompts_file, "r", encoding="utf-8") as f:
-                self.prompts = yaml.safe_load(f)
+            self.prompts = _load_yaml(prompts_file)
             return
 
         # 新形式：Chapter別に分割されたファイルを読み込み
+        # （変更のないファイルはパース済みの内容を再利用する）
         self.prompts = {}
-
-        # Chapter 1を読み込み
-        chapter1_file = self.templates_dir / "chapter1.yaml"
-        if chapter1_file.exists():
-            with open(chapter1_file, "r", encoding="utf-8") as f:
-                self.prompts["chapter1"] = yaml.safe_load(f)
-
-        # Chapter 3を読み込み
-        chapter3_file = self.templates_dir / "chapter3.yaml"
-        if chapter3_file.exists():
-            with open(chapter3_file, "r", encoding="utf-8") as f:
-                self.prompts["chapter3"] = yaml.safe_load(f)
+        for chapter in ("chapter1", "chapter2", "chapter3"):
+            chapter_file = self.templates_dir / f"{chapter}.yaml"
+            if chapter_file.exists():
+                self.prompts[chapter] = _load_yaml(chapter_file)
 
         # どちらも存在しない場合はエラー
         if not self.prompts:
@@ -147,12 +188,12 @@ class PromptLoader:
 
         # system プロンプトの処理
         if "system" in prompt_template:
-            system_template = Template(prompt_template["system"])
+            system_template = _compile_template(prompt_template["system"])
             result["system"] = system_template.render(**variables)
 
         # user プロンプトの処理
         if "user" in prompt_template:
-            user_template = Template(prompt_template["user"])
+            user_template = _compile_template(prompt_template["user"])
             result["user"] = user_template.render(**variables)
 
         # その他のパラメータをコピー
@@ -3,7 +3,9 @@ Google Sheets API wrapper
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build, Resource
@@ -13,6 +15,12 @@ logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
+# 認証済みサービスのキャッシュ（認証ファイルパス → Resource）
+# サービスが持つ httplib2 の接続はスレッドセーフではないため、スレッドごとに保持する。
+# 同じスレッド内の SheetsAPI インスタンス間では、ディスカバリ文書の解析と
+# TLS接続（keep-alive）を使い回す。
+_services = threading.local()
+
 
 class SheetsAPI:
     """Google Sheets APIのラッパークラス"""
@@ -30,6 +38,8 @@ class SheetsAPI:
             raise ValueError("google_sheets.credentials_path が設定されていません")
 
         self._service: Optional[Resource] = None
+        # begin_batch() 中に蓄積される書き込み（スプレッドシートID → 更新データ）
+        self._pending: Optional[Dict[str, List[Dict[str, Any]]]] = None
         self.authenticate(credentials_path)
 
     def authenticate(self, credentials_path: str) -> None:
@@ -43,11 +53,20 @@ class SheetsAPI:
             FileNotFoundError: 認証ファイルが存在しない場合
             ValueError: 認証に失敗した場合
         """
+        cache: Dict[str, Resource] = getattr(_services, "by_path", None)
+        if cache is None:
+            cache = _services.by_path = {}
+
+        if credentials_path in cache:
+            self._service = cache[credentials_path]
+            return
+
         try:
             credentials = Credentials.from_service_account_file(
                 credentials_path, scopes=SCOPES
             )
             self._service = build("sheets", "v4", credentials=credentials)
+            cache[credentials_path] = self._service
             logger.info("Google Sheets API認証に成功しました")
         except FileNotFoundError:
             raise FileNotFoundError(
@@ -63,6 +82,54 @@ class SheetsAPI:
             raise RuntimeError("認証が完了していません。authenticate()を実行してください")
         return self._service
 
+    @contextmanager
+    def begin_batch(self) -> Iterator[None]:
+        """
+        書き込みをまとめて1回のバッチ更新で送信するコンテキスト
+
+        with ブロック内の write_row / write_range は即座に送信されず、
+        ブロック終了時に commit_batch() でスプレッドシートごとに一括送信される。
+        ブロック内で例外が発生した場合、蓄積した書き込みは破棄される。
+        """
+        if self._pending is not None:
+            # 既にバッチ中の場合は外側のバッチに合流する
+            yield
+            return
+
+        self._pending = {}
+        try:
+            yield
+        except Exception:
+            self._pending = None
+            raise
+        self.commit_batch()
+
+    def commit_batch(self) -> None:
+        """begin_batch() 中に蓄積した書き込みを送信する"""
+        pending, self._pending = self._pending, None
+        if not pending:
+            return
+
+        for spreadsheet_id, data in pending.items():
+            self.batch_update(spreadsheet_id, data)
+
+    def _queue_write(
+        self, spreadsheet_id: str, range_notation: str, values: List[List[Any]]
+    ) -> bool:
+        """
+        バッチ中であれば書き込みを蓄積する
+
+        Returns:
+            蓄積した場合True（呼び出し元は送信不要）
+        """
+        if self._pending is None:
+            return False
+
+        self._pending.setdefault(spreadsheet_id, []).append(
+            {"range": range_notation, "values": values}
+        )
+        return True
+
     def get_sheet(self, spreadsheet_id: str, sheet_name: str) -> Any:
         """
         シートのメタデータを取得
@@ -110,6 +177,9 @@ class SheetsAPI:
             values: 値のリスト
         """
         range_notation = f"{sheet_name}!A{row_index}"
+        if self._queue_write(spreadsheet_id, range_notation, [values]):
+            return
+
         body = {"values": [values]}
 
         self.service.spreadsheets().values().update(
@@ -143,6 +213,9 @@ class SheetsAPI:
             values: 2次元配列の値
         """
         range_notation = f"{sheet_name}!{start_cell}"
+        if self._queue_write(spreadsheet_id, range_notation, values):
+            return
+
         body = {"values": values}
 
         self.service.spreadsheets().values().update(
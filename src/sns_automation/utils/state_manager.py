@@ -6,19 +6,51 @@
 
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from sns_automation.utils.json_io import write_json
+
 logger = logging.getLogger(__name__)
 
+# プロジェクト名ごとのグローバルインスタンス（Sheets認証を毎回やり直さないため）
+_state_managers: Dict[str, Any] = {}
+_state_managers_lock = threading.Lock()
+
 
 def get_state_manager(project_name: str = "default"):
     """
     環境に応じた StateManager を取得
 
     Streamlit Cloud環境ではSheetsStateManagerを使用し、
-    ローカル環境または初期化失敗時はStateManagerを使用する
+    ローカル環境または初期化失敗時はStateManagerを使用する。
+    同じプロジェクト名に対しては作成済みのインスタンスを返す。
+
+    Args:
+        project_name: プロジェクト名
+
+    Returns:
+        StateManager または SheetsStateManager のインスタンス
+    """
+    state_manager = _state_managers.get(project_name)
+    if state_manager is not None:
+        return state_manager
+
+    # Streamlit の複数セッションから同時に呼ばれても1つだけ作成する
+    with _state_managers_lock:
+        state_manager = _state_managers.get(project_name)
+        if state_manager is None:
+            state_manager = _create_state_manager(project_name)
+            _state_managers[project_name] = state_manager
+
+    return state_manager
+
+
+def _create_state_manager(project_name: str):
+    """
+    環境に応じた StateManager を作成
 
     Args:
         project_name: プロジェクト名
@@ -131,9 +163,8 @@ class StateManager:
             "updated_at": datetime.now().isoformat(),
         }
 
-        # ローカルファイルに保存
-        with open(self.state_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        # ローカルファイルに保存（途中で中断されても壊れないようアトミックに書き込む）
+        write_json(self.state_file, state)
 
         logger.info(f"状態をローカルに保存しました: {self.state_file}")
 
@@ -0,0 +1,79 @@
+"""
+ClaudeAPI のリトライのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import anthropic
+import httpx
+import pytest
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from sns_automation.utils import claude_api
+from sns_automation.utils.claude_api import ClaudeAPI
+
+# 529 は古い SDK では専用のクラスがない
+OverloadedError = getattr(anthropic, "OverloadedError", anthropic.APIStatusError)
+
+
+def _status_error(cls, status_code, headers=None):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return cls(f"status {status_code}", response=response, body=None)
+
+
+class FlakyRequest:
+    """指定したエラーを順に送出し、最後に "ok" を返すリクエスト"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """APIクライアントを初期化しない ClaudeAPI（待ち時間は記録のみ）"""
+    waits = []
+    monkeypatch.setattr(claude_api.time, "sleep", waits.append)
+    instance = ClaudeAPI.__new__(ClaudeAPI)
+    instance.waits = waits
+    return instance
+
+
+class TestWithRetry:
+    """_with_retry のテスト"""
+
+    def test_overloaded_is_retried_with_retry_after(self, api):
+        request = FlakyRequest([_status_error(OverloadedError, 529, {"retry-after": "7"})])
+        assert api._with_retry(request) == "ok"
+        assert request.calls == 2
+        # 初回のバックオフ（1〜2秒）より retry-after の方が長いため、それに従う
+        assert api.waits == [7.0]
+
+    def test_service_unavailable_is_retried(self, api):
+        cls = getattr(anthropic, "ServiceUnavailableError", anthropic.APIStatusError)
+        request = FlakyRequest([_status_error(cls, 503), _status_error(anthropic.InternalServerError, 500)])
+        assert api._with_retry(request) == "ok"
+        assert request.calls == 3
+
+    def test_gives_up_after_max_retries(self, api):
+        request = FlakyRequest([_status_error(OverloadedError, 529) for _ in range(3)])
+        with pytest.raises(anthropic.APIStatusError):
+            api._with_retry(request)
+        assert request.calls == 3
+
+    def test_client_error_is_not_retried(self, api):
+        request = FlakyRequest([_status_error(anthropic.BadRequestError, 400)])
+        with pytest.raises(anthropic.BadRequestError):
+            api._with_retry(request)
+        assert request.calls == 1
+        assert api.waits == []
@@ -0,0 +1,185 @@
+"""
+Chapter 3 のパース・台本生成のテスト
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from sns_automation.chapter3_content import ContentAutomation, IdeaSelection
+
+NARRATION = (
+    "転職で失敗する人には共通点があります。"
+    "それは、求人票の条件だけを見て応募してしまうことです。"
+    "面接の前に、その会社で働く人の一日を具体的に想像してみます。"
+    "朝は何時に出社して、誰と話し、何に時間を使うのか。"
+    "そこまで考えると、本当に合う会社が見えてきます。"
+)
+
+SCRIPT_TEXT = (
+    "## 台本表\n"
+    "| 時間 | ナレーション |\n"
+    "|---|---|\n"
+    "| 0-3秒 | 転職で失敗する人の共通点 |\n"
+    "\n"
+    "## ナレーション全文\n"
+    "```\n"
+    f"{NARRATION}\n"
+    "```\n"
+    "\n"
+    "## 補足\n"
+    "```\n"
+    "ここはナレーションではない\n"
+    "```\n"
+)
+
+
+@pytest.fixture
+def automation():
+    """APIクライアントを初期化しない ContentAutomation"""
+    return ContentAutomation.__new__(ContentAutomation)
+
+
+class TestIdeaSelection:
+    """IdeaSelection のテスト"""
+
+    def test_converts_to_zero_based_indices(self):
+        assert IdeaSelection(max_n=20).convert(" 1, 3 ,5 ", None, None) == [0, 2, 4]
+
+    def test_all(self):
+        assert IdeaSelection(max_n=3).convert(" ALL ", None, None) == [0, 1, 2]
+
+    def test_passes_through_converted_value(self):
+        assert IdeaSelection(max_n=3).convert([1], None, None) == [1]
+
+    @pytest.mark.parametrize("value", ["1,,3", "1 3", "x", ""])
+    def test_rejects_malformed(self, value):
+        with pytest.raises(click.BadParameter):
+            IdeaSelection(max_n=20).convert(value, None, None)
+
+    @pytest.mark.parametrize("value", ["0", "1,21"])
+    def test_rejects_out_of_range(self, value):
+        with pytest.raises(click.BadParameter, match="範囲外"):
+            IdeaSelection(max_n=20).convert(value, None, None)
+
+
+class TestParseIdeas:
+    """_parse_ideas のテスト"""
+
+    def test_table(self, automation):
+        response = (
+            "以下が企画です。\n"
+            "| No | 企画タイトル（フック） | 狙い・内容の要約 |\n"
+            "|---|---|---|\n"
+            "| 1 | （例：サンプル） | 例示 |\n"
+            "| 1 | 転職の落とし穴 | 求人票の読み方 |\n"
+            "| 2 | 面接の本音 | 人事の視点 |\n"
+            "| 3 | 途中で切れた行 | 要約\n"
+            "1. 表の後ろの番号付きリスト\n"
+        )
+        ideas = automation._parse_ideas(response, expected_count=None)
+        assert [(i["no"], i["title"], i["summary"]) for i in ideas] == [
+            ("1", "転職の落とし穴", "求人票の読み方"),
+            ("2", "面接の本音", "人事の視点"),
+        ]
+
+    def test_stops_at_expected_count(self, automation):
+        response = "\n".join(f"| {n} | 企画{n} | 要約{n} |" for n in range(1, 6))
+        ideas = automation._parse_ideas(response, expected_count=3)
+        assert [i["title"] for i in ideas] == ["企画1", "企画2", "企画3"]
+
+    def test_numbered_list_fallback(self, automation):
+        response = "1. 転職の落とし穴\n2) 面接の本音\n99. 範囲外の番号\n解説文"
+        ideas = automation._parse_ideas(response)
+        assert [(i["no"], i["title"]) for i in ideas] == [
+            ("1", "転職の落とし穴"),
+            ("2", "面接の本音"),
+        ]
+
+
+class TestExtractNarration:
+    """_extract_narration のテスト"""
+
+    def test_narration_section(self, automation):
+        assert automation._extract_narration(SCRIPT_TEXT) == NARRATION
+
+    def test_table_fallback(self, automation):
+        script_text = (
+            "| 時間 | ナレーション |\n"
+            "|---|---|\n"
+            "| 0-3秒 | 最初の一言 |\n"
+            "| 3-6秒 | 次の一言 |\n"
+        )
+        assert automation._extract_narration(script_text) == "最初の一言 次の一言"
+
+
+class FakeClaude:
+    """台本の応答を順に返す ClaudeAPI の代替"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def generate_text(self, **kwargs):
+        return self.responses.pop(0)
+
+    def generate_conversation(self, **kwargs):
+        return self.responses.pop(0)
+
+
+class FakeCache:
+    """set された値を記録する GenCache の代替"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, template_id, prompt, system=None):
+        return self.entries.get((template_id, prompt, system))
+
+    def set(self, template_id, prompt, value, system=None):
+        self.entries[(template_id, prompt, system)] = value
+
+
+@pytest.fixture
+def script_automation(automation, monkeypatch):
+    """プロンプト読み込みを差し替えた ContentAutomation"""
+    automation.gen_cache = FakeCache()
+    monkeypatch.setattr(
+        automation, "_script_prompt", lambda idea, strategy_data: {"user": "台本を作成", "system": "台本作家"}
+    )
+    monkeypatch.setattr(automation, "_persona_context", lambda strategy_data: "ペルソナ")
+    return automation
+
+
+class TestGenerateScript:
+    """generate_script のテスト"""
+
+    def test_result_is_json_serializable(self, script_automation):
+        # 品質チェック結果（Violation を含む）が台本辞書に混ざると JSON 保存に失敗する
+        script_automation.claude = FakeClaude(["**太字**\n" + SCRIPT_TEXT, SCRIPT_TEXT])
+        script = script_automation.generate_script({"title": "転職の落とし穴"}, {})
+
+        assert set(script) == {"idea_title", "full_script", "narration", "quality_score"}
+        assert script["quality_score"] == {"error_count": 0, "warning_count": 0, "attempts": 2}
+        json.dumps(script, ensure_ascii=False)
+
+    def test_caches_only_passing_script(self, script_automation):
+        script_automation.claude = FakeClaude(["**太字**\n" + SCRIPT_TEXT] * 3)
+        script, lint_result = script_automation._generate_script_with_lint(
+            {"title": "転職の落とし穴"}, {}
+        )
+
+        assert not lint_result["passed"]
+        assert script["quality_score"]["attempts"] == 3
+        assert script_automation.gen_cache.entries == {}
+
+        script_automation.claude = FakeClaude([SCRIPT_TEXT])
+        _, lint_result = script_automation._generate_script_with_lint({"title": "転職の落とし穴"}, {})
+
+        assert lint_result["passed"]
+        assert list(script_automation.gen_cache.entries.values()) == [SCRIPT_TEXT]
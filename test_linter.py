@@ -0,0 +1,132 @@
+"""
+台本品質チェッカーと鉄則パースのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from sns_automation.chapter2_analysis import _RULE_RE
+from sns_automation.utils import linter
+from sns_automation.utils.linter import ScriptLinter, Violation, lint_script
+
+# 100文字以上の、です・ます調で統一したナレーション
+CLEAN_NARRATION = (
+    "転職で失敗する人には共通点があります。"
+    "求人票の条件だけを見て応募してしまうことです。"
+    "面接の前に、その会社で働く一日を具体的に想像してみます。"
+    "朝は何時に出社して、誰と話し、何に時間を使うのかを考えます。"
+    "そこまで考えると、本当に合う会社が見えてきます。"
+)
+
+
+def _types(violations):
+    return [v.type for v in violations]
+
+
+class TestScriptLinter:
+    """ScriptLinter のテスト"""
+
+    def test_clean_script_passes(self):
+        result = lint_script("台本本文", CLEAN_NARRATION)
+        assert result["passed"]
+        assert result["error_count"] == 0
+        assert result["warning_count"] == 0
+
+    def test_bold_usage_is_error(self):
+        result = lint_script("**重要**と**注意**", CLEAN_NARRATION)
+        assert not result["passed"]
+        assert result["errors"] == [
+            Violation(
+                type="bold_usage",
+                context="台本",
+                message="太字が使用されています: 重要",
+                suggestion="太字を削除してください（AIっぽさを避けるため）",
+            ),
+            Violation(
+                type="bold_usage",
+                context="台本",
+                message="太字が使用されています: 注意",
+                suggestion="太字を削除してください（AIっぽさを避けるため）",
+            ),
+        ]
+
+    def test_violation_fields(self):
+        violation = lint_script("**太字**", CLEAN_NARRATION)["errors"][0]
+        assert violation.context == "台本"
+        assert violation._asdict().keys() == {"type", "context", "message", "suggestion"}
+
+    def test_ai_patterns_are_warnings(self):
+        result = lint_script("効果的な方法と最適な選択。いかがでしたか", CLEAN_NARRATION)
+        assert result["passed"]
+        assert _types(result["warnings"]) == ["ai_pattern"] * 3
+        assert [w.message for w in result["warnings"]] == [
+            "AIっぽい表現が含まれています: 効果的な",
+            "AIっぽい表現が含まれています: 最適な",
+            "AIっぽい表現が含まれています: いかがでしたか",
+        ]
+
+    def test_forbidden_phrases_in_list_order(self):
+        result = lint_script("ChatGPTで自動生成した", CLEAN_NARRATION)
+        # ChatGPT は GPT も含むため、フレーズ一覧の順に両方を報告する
+        assert [e.message for e in result["errors"]] == [
+            "禁止フレーズが含まれています: 自動生成",
+            "禁止フレーズが含まれています: GPT",
+            "禁止フレーズが含まれています: ChatGPT",
+        ]
+
+    def test_forbidden_phrases_without_automaton(self, monkeypatch):
+        monkeypatch.setattr(linter, "_FORBIDDEN_AUTOMATON", None)
+        result = lint_script("Claudeのプロンプト", CLEAN_NARRATION)
+        assert [e.message for e in result["errors"]] == [
+            "禁止フレーズが含まれています: Claude",
+            "禁止フレーズが含まれています: プロンプト",
+        ]
+
+    @pytest.mark.parametrize(
+        "narration, expected",
+        [("短い。", "短すぎます（3文字）"), ("あ" * 2001, "長すぎます（2001文字）")],
+    )
+    def test_narration_length(self, narration, expected):
+        warnings = lint_script("", narration)["warnings"]
+        assert expected in [w for w in warnings if w.type == "narration_length"][0].message
+
+    def test_tone_inconsistency_counts_both_tones(self):
+        narration = CLEAN_NARRATION + "それが大事だ。結論である。"
+        warnings = lint_script("", narration)["warnings"]
+        assert _types(warnings) == ["tone_inconsistency"]
+        assert "です・ます: 5箇所、だ・である: 2箇所" in warnings[0].message
+
+    def test_format_results(self):
+        linter_ = ScriptLinter()
+        text = linter_.format_results(linter_.check_script("**太字**", CLEAN_NARRATION))
+        assert "❌ エラー: 1件" in text
+        assert "1. [台本] 太字が使用されています: 太字" in text
+
+
+class TestRuleRegex:
+    """鉄則の行を抽出する _RULE_RE のテスト"""
+
+    @staticmethod
+    def _rules(text):
+        return [m.group(1) or m.group(2) for m in _RULE_RE.finditer(text)]
+
+    def test_table_rows(self):
+        text = (
+            "| No | 鉄則 | 根拠 |\n"
+            "|---|---|---|\n"
+            "| 1 | 冒頭3秒で結論を言う | 離脱率 |\n"
+            "  |2|数字を入れる|保存率|\n"
+        )
+        assert self._rules(text) == ["冒頭3秒で結論を言う", "数字を入れる"]
+
+    def test_numbered_lines(self):
+        text = "鉄則は以下です。\n1. 冒頭で結論を言う  \n 12.数字を入れる\n- 箇条書きは対象外\n"
+        assert self._rules(text) == ["冒頭で結論を言う", "数字を入れる"]
+
+    def test_no_rules(self):
+        assert self._rules("鉄則は見つかりませんでした") == []
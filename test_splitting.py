@@ -0,0 +1,95 @@
+"""
+テキスト分割・JPEGストリーム分割・ffmpeg 呼び出しのテスト
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from sns_automation.utils import image_processing
+from sns_automation.utils.elevenlabs_api import ElevenLabsAPI
+from sns_automation.utils.image_processing import JPEG_EOI, JPEG_SOI, _split_jpeg_stream
+
+split_text = ElevenLabsAPI._split_text
+
+
+class TestSplitText:
+    """ElevenLabsAPI._split_text のテスト"""
+
+    def test_short_text_is_unchanged(self):
+        assert split_text("  短い文。 ", max_length=20) == ["  短い文。 "]
+
+    def test_splits_at_last_delimiter(self):
+        text = "一文目です。二文目です！三文目です？四文目"
+        assert split_text(text, max_length=12) == ["一文目です。二文目です！", "三文目です？四文目"]
+
+    def test_strips_whitespace_between_chunks(self):
+        text = "一文目です。  二文目です。  三文目です。  "
+        assert split_text(text, max_length=8) == ["一文目です。", "二文目です。", "三文目です。"]
+
+    def test_forces_split_without_delimiter(self):
+        assert split_text("あいうえおかきくけこさ", max_length=4) == ["あいうえ", "おかきく", "けこさ"]
+
+    def test_chunks_respect_max_length(self):
+        text = "これはテストの文章です。" * 50 + "区切りのない長い文章" * 20
+        chunks = split_text(text, max_length=100)
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert "".join(chunks) == text
+
+
+class TestSplitJpegStream:
+    """_split_jpeg_stream のテスト"""
+
+    @staticmethod
+    def _jpeg(body: bytes) -> bytes:
+        return JPEG_SOI + body + JPEG_EOI
+
+    def test_splits_concatenated_frames(self):
+        frames = [self._jpeg(b"\x00first"), self._jpeg(b"\x01second"), self._jpeg(b"")]
+        assert _split_jpeg_stream(b"".join(frames)) == frames
+
+    def test_ignores_leading_garbage_and_truncated_tail(self):
+        first = self._jpeg(b"frame")
+        data = b"garbage" + first + JPEG_SOI + b"truncated"
+        assert _split_jpeg_stream(data) == [first]
+
+    def test_empty(self):
+        assert _split_jpeg_stream(b"") == []
+        assert _split_jpeg_stream(b"no jpeg here") == []
+
+
+class TestFfmpegPath:
+    """ffmpeg・ffprobe を解決済みのパスで起動するかのテスト"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        image_processing._check_ffmpeg.cache_clear()
+        image_processing._check_ffprobe.cache_clear()
+        yield
+        image_processing._check_ffmpeg.cache_clear()
+        image_processing._check_ffprobe.cache_clear()
+
+    def test_ffprobe_is_run_by_resolved_path(self, monkeypatch, tmp_path):
+        video_path = tmp_path / "video.mp4"
+        video_path.write_bytes(b"")
+        commands = []
+
+        def fake_run(args, **kwargs):
+            commands.append(args)
+            return subprocess.CompletedProcess(args, 0, stdout="12.5\n", stderr="")
+
+        monkeypatch.setattr(image_processing.shutil, "which", lambda name: f"/opt/ffmpeg/bin/{name}")
+        monkeypatch.setattr(image_processing.subprocess, "run", fake_run)
+
+        assert image_processing.get_video_duration(video_path) == 12.5
+        assert commands[0][0] == "/opt/ffmpeg/bin/ffprobe"
+
+    def test_missing_ffmpeg(self, monkeypatch):
+        monkeypatch.setattr(image_processing.shutil, "which", lambda name: None)
+        with pytest.raises(RuntimeError, match="ffmpegが見つかりません"):
+            image_processing._check_ffmpeg()
@@ -0,0 +1,93 @@
+"""
+Chapter 1 のパース・入力検証のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from sns_automation.chapter1_strategy import PainIndexList, StrategyAutomation
+
+
+class TestParseProfiles:
+    """_parse_profiles のテスト"""
+
+    def test_code_blocks_with_language_tag(self):
+        response = (
+            "案1です。\n"
+            "```text\n"
+            "転職3回のキャリアアドバイザー\n"
+            "毎日19時に発信中\n"
+            "```\n"
+            "案2です。\n"
+            "```\n"
+            "元人事が本音で語る転職のコツ\n"
+            "```\n"
+        )
+        assert StrategyAutomation._parse_profiles(response) == [
+            "転職3回のキャリアアドバイザー\n毎日19時に発信中",
+            "元人事が本音で語る転職のコツ",
+        ]
+
+    def test_empty_blocks_are_skipped(self):
+        response = "```\n\n```\n```\nプロフィール\n```"
+        assert StrategyAutomation._parse_profiles(response) == ["プロフィール"]
+
+    def test_single_line_block(self):
+        assert StrategyAutomation._parse_profiles("```プロフィール```") == ["プロフィール"]
+
+    def test_no_code_block_falls_back_to_whole_text(self):
+        assert StrategyAutomation._parse_profiles("  プロフィール全文  \n") == ["プロフィール全文"]
+
+
+class TestPainIndexList:
+    """PainIndexList のテスト"""
+
+    def test_converts_numbers(self):
+        assert PainIndexList(max_n=20).convert(" 1, 5 ,12 ", None, None) == [1, 5, 12]
+
+    def test_passes_through_converted_value(self):
+        assert PainIndexList(max_n=20).convert([2, 3, 4], None, None) == [2, 3, 4]
+
+    @pytest.mark.parametrize("value", ["1,2", "1,2,3,4", "1,,2", "a,b,c", "1;2;3", ""])
+    def test_rejects_malformed_or_wrong_count(self, value):
+        with pytest.raises(click.BadParameter):
+            PainIndexList(max_n=20).convert(value, None, None)
+
+    @pytest.mark.parametrize("value", ["0,1,2", "1,2,21"])
+    def test_rejects_out_of_range(self, value):
+        with pytest.raises(click.BadParameter):
+            PainIndexList(max_n=20).convert(value, None, None)
+
+
+class TestValidateBatchInputs:
+    """run_batch の入力検証のテスト"""
+
+    def test_accepts_valid_inputs(self):
+        StrategyAutomation._validate_batch_inputs([
+            {"target": "20代の転職希望者"},
+            {"target": "30代", "concept_index": 2, "pain_indices": [1, 4, 7], "profile_index": 1},
+        ])
+
+    def test_missing_target_names_the_field(self):
+        with pytest.raises(ValueError, match="2 件目.*target"):
+            StrategyAutomation._validate_batch_inputs([{"target": "a"}, {"role": "人事"}])
+
+    @pytest.mark.parametrize(
+        "item, field",
+        [
+            ({"target": "a", "concept_index": 0}, "concept_index"),
+            ({"target": "a", "profile_index": "1"}, "profile_index"),
+            ({"target": "a", "concept_index": True}, "concept_index"),
+            ({"target": "a", "pain_indices": [1, None]}, r"pain_indices\[1\]"),
+            ({"target": "a", "pain_indices": "1,2,3"}, "pain_indices"),
+        ],
+    )
+    def test_rejects_invalid_indices(self, item, field):
+        with pytest.raises(ValueError, match=field):
+            StrategyAutomation._validate_batch_inputs([item])